@@ -0,0 +1,109 @@
+/**
+ * Benchmark: scalar FSRS (lib/fsrs) vs batched struct-of-arrays kernels
+ * (lib/fsrsBatch) for 1k / 10k / 100k progress rows.
+ *
+ * Operations:
+ *   next review   calculateNextReview per row vs batchNextReview
+ *   due (all)     getDueQuestions vs batchSelectDue
+ *   due (top 20)  getDueQuestions().slice(0, 20) vs batchSelectDue(limit 20)
+ *   retention     calculateRetention vs batchRetention
+ *   priority      calculatePriority per row vs batchPriority
+ *
+ * Batch timings exclude createProgressBatch (packing is paid once per load
+ * and reported separately). Runs inline; the worker only moves this work
+ * off the main thread, it doesn't make it faster.
+ *
+ * Usage: node bench/fsrsBatch.bench.js
+ */
+
+import { performance } from 'node:perf_hooks';
+import {
+  calculateNextReview,
+  calculatePriority,
+  calculateRetention,
+  getDueQuestions
+} from '../src/lib/fsrs.js';
+import {
+  createProgressBatch,
+  batchNextReview,
+  batchSelectDue,
+  batchRetention,
+  batchPriority
+} from '../src/lib/fsrsBatch.js';
+
+const SIZES = [1_000, 10_000, 100_000];
+const TOP_K = 20;
+
+// Deterministic PRNG so runs are comparable
+let seed = 42;
+function rand() {
+  seed = (seed * 1664525 + 1013904223) >>> 0;
+  return seed / 2 ** 32;
+}
+
+function generateRows(count, nowMs) {
+  return Array.from({ length: count }, (_, i) => ({
+    question_id: i + 1,
+    times_seen: 1 + Math.floor(rand() * 20),
+    times_correct: Math.floor(rand() * 10),
+    stability: rand() * 60,
+    difficulty: rand() * 10,
+    scheduled_days: 1 + Math.floor(rand() * 60),
+    state: Math.floor(rand() * 4),
+    next_review: new Date(nowMs + (rand() - 0.5) * 60 * 86400000).toISOString()
+  }));
+}
+
+// Median of a few runs after one warm-up
+function time(fn, runs = 5) {
+  fn();
+  const samples = [];
+  for (let i = 0; i < runs; i++) {
+    const t0 = performance.now();
+    fn();
+    samples.push(performance.now() - t0);
+  }
+  samples.sort((a, b) => a - b);
+  return samples[Math.floor(runs / 2)];
+}
+
+function fmt(ms) {
+  return ms >= 1000 ? `${(ms / 1000).toFixed(2)}s` : `${ms.toFixed(2)}ms`;
+}
+
+for (const size of SIZES) {
+  const nowMs = Date.now();
+  const now = new Date(nowMs);
+  const rows = generateRows(size, nowMs);
+  const correct = Uint8Array.from(rows, () => (rand() < 0.7 ? 1 : 0));
+
+  const packMs = time(() => createProgressBatch(rows));
+  const batch = createProgressBatch(rows);
+
+  const results = [
+    ['next review',
+      time(() => rows.map((row, i) => calculateNextReview(row, !!correct[i], undefined, now))),
+      time(() => batchNextReview(batch, correct, undefined, nowMs))],
+    ['due (all)',
+      time(() => getDueQuestions(rows)),
+      time(() => batchSelectDue(batch, nowMs))],
+    [`due (top ${TOP_K})`,
+      time(() => getDueQuestions(rows).slice(0, TOP_K)),
+      time(() => batchSelectDue(batch, nowMs, TOP_K))],
+    ['retention',
+      time(() => calculateRetention(rows)),
+      time(() => batchRetention(batch))],
+    ['priority',
+      time(() => rows.map(row => calculatePriority(row))),
+      time(() => batchPriority(batch, nowMs))]
+  ];
+
+  console.log(`\n${size.toLocaleString('en')} rows (pack ${fmt(packMs)})`);
+  for (const [name, scalarMs, batchMs] of results) {
+    console.log(
+      `  ${name.padEnd(14)} scalar ${fmt(scalarMs).padStart(9)}`
+      + ` | batch ${fmt(batchMs).padStart(9)}`
+      + ` | ${(scalarMs / batchMs).toFixed(1)}x`
+    );
+  }
+}
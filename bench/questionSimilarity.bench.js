@@ -0,0 +1,109 @@
+/**
+ * Benchmark: duplicate detection for bulk question import
+ *
+ * Compares the previous approach (exact Jaccard of every incoming question
+ * against every bank question) with the MinHash-LSH index, for banks of
+ * 1k / 10k / 50k synthetic questions and a 500-question import where ~20%
+ * are near-duplicates of bank questions and ~5% repeat earlier items of the
+ * same import. Network cost is not modelled (the old code also re-downloaded
+ * 1000 rows per question).
+ *
+ * Usage: node bench/questionSimilarity.bench.js
+ */
+
+import { performance } from 'node:perf_hooks';
+import {
+  createSimilarityIndex,
+  jaccardSimilarity,
+  normalizeQuestionText,
+} from '../src/utils/questionSimilarity.js';
+
+const BANK_SIZES = [1_000, 10_000, 50_000];
+const IMPORT_SIZE = 500;
+// The brute-force baseline is extrapolated from this many incoming questions
+const BASELINE_SAMPLE = 25;
+
+// Deterministic PRNG so runs are comparable
+let seed = 42;
+function rand() {
+  seed = (seed * 1664525 + 1013904223) >>> 0;
+  return seed / 2 ** 32;
+}
+
+const VOCAB = Array.from({ length: 3000 }, (_, i) => `palabra${i.toString(36)}`);
+
+function randomText() {
+  const length = 12 + Math.floor(rand() * 14);
+  const words = [];
+  for (let i = 0; i < length; i++) words.push(VOCAB[Math.floor(rand() * VOCAB.length)]);
+  return words.join(' ');
+}
+
+// Change one word: Jaccard ~0.9+ for 20+ word texts
+function nearDuplicate(text) {
+  const words = text.split(' ');
+  words[Math.floor(rand() * words.length)] = 'cambio' + Math.floor(rand() * 1e6);
+  words.push(words[0]);
+  return words.join(' ');
+}
+
+function buildImport(bank) {
+  const incoming = [];
+  for (let i = 0; i < IMPORT_SIZE; i++) {
+    const r = rand();
+    if (r < 0.2) incoming.push(nearDuplicate(bank[Math.floor(rand() * bank.length)]));
+    else if (r < 0.25 && incoming.length > 0) incoming.push(incoming[Math.floor(rand() * incoming.length)]);
+    else incoming.push(randomText());
+  }
+  return incoming;
+}
+
+function bruteForce(bankWords, text) {
+  const words = new Set(normalizeQuestionText(text).split(' '));
+  return bankWords.some(w => jaccardSimilarity(words, w) > 0.9);
+}
+
+function fmt(ms) {
+  return ms >= 1000 ? `${(ms / 1000).toFixed(2)}s` : `${ms.toFixed(1)}ms`;
+}
+
+for (const size of BANK_SIZES) {
+  const bank = Array.from({ length: size }, randomText);
+  const incoming = buildImport(bank);
+
+  // --- Baseline: full scan per incoming question ---
+  const bankWords = bank.map(t => new Set(normalizeQuestionText(t).split(' ')));
+  let t0 = performance.now();
+  for (let i = 0; i < BASELINE_SAMPLE; i++) bruteForce(bankWords, incoming[i]);
+  const baselineMs = ((performance.now() - t0) / BASELINE_SAMPLE) * IMPORT_SIZE;
+
+  // --- Indexed ---
+  t0 = performance.now();
+  const index = createSimilarityIndex();
+  bank.forEach((text, i) => index.add(i, text));
+  const buildMs = performance.now() - t0;
+
+  t0 = performance.now();
+  let duplicates = 0;
+  incoming.forEach((text, i) => {
+    if (index.findDuplicate(text)) duplicates++;
+    else index.add(`import:${i}`, text);
+  });
+  const queryMs = performance.now() - t0;
+
+  // Recall check against brute force on the same import (bank + earlier items)
+  let missed = 0;
+  const seen = [...bankWords];
+  for (const text of incoming) {
+    const isDup = bruteForce(seen, text);
+    const found = index.findDuplicate(text) !== null;
+    if (isDup && !found) missed++;
+    if (!isDup) seen.push(new Set(normalizeQuestionText(text).split(' ')));
+  }
+
+  console.log(
+    `bank ${String(size).padStart(6)} | brute force ~${fmt(baselineMs).padStart(8)}`
+    + ` | index build ${fmt(buildMs).padStart(8)} + ${IMPORT_SIZE} lookups ${fmt(queryMs).padStart(8)}`
+    + ` | ${duplicates} duplicates, ${missed} missed vs brute force`
+  );
+}
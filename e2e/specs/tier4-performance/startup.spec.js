@@ -0,0 +1,176 @@
+/**
+ * Performance - Startup budget
+ *
+ * Measures, on the production build (see playwright.perf.config.js):
+ * 1. Initial bundle: JS + CSS referenced by dist/index.html (gzip bytes),
+ *    and that the admin / draft / lab-demo chunks are not part of it
+ * 2. Per route (landing, study): JS downloaded and time-to-interactive
+ *
+ * Each measurement must stay within its budget in startup-budget.json. The
+ * budgets are ceilings chosen by hand, not measurements of a previous
+ * build: they catch a feature chunk or a heavy dependency landing in the
+ * startup path, not small regressions. A measurement without a budget fails.
+ * Edit the file (and explain why in the commit) to change a budget.
+ *
+ * TTI follows the Lighthouse definition, simplified: the end of the last
+ * long task (>50ms) before a quiet window, and never earlier than FCP or
+ * the moment the route's main content is on screen. CPU is throttled 4x
+ * (mobile profile) to keep numbers comparable between machines.
+ */
+
+import { test, expect } from '@playwright/test';
+import fs from 'fs';
+import path from 'path';
+import zlib from 'zlib';
+import { fileURLToPath } from 'url';
+
+const HERE = path.dirname(fileURLToPath(import.meta.url));
+const ROOT = path.resolve(HERE, '../../..');
+const DIST = path.join(ROOT, 'dist');
+const BUDGET_FILE = path.join(HERE, 'startup-budget.json');
+const AUTH_STATE = path.join(ROOT, 'e2e/.auth/user.json');
+
+const CPU_SLOWDOWN = 4;
+const QUIET_WINDOW_MS = 2000;
+
+// Chunks that must only be fetched by the features that use them
+const LAZY_ONLY_CHUNKS = /^(admin|draft|lab-demo)-/;
+
+const ROUTES = [
+  {
+    name: 'landing',
+    path: '#/welcome',
+    ready: () => document.body.innerText.includes('Empezar'),
+  },
+  {
+    name: 'study',
+    path: '#/app/study',
+    ready: () => !!document.querySelector('h2'),
+    auth: true,
+  },
+];
+
+const BUDGETS = JSON.parse(fs.readFileSync(BUDGET_FILE, 'utf8'));
+
+/**
+ * Check a measurement against its budget
+ */
+function checkBudget(testInfo, key, value) {
+  const budget = BUDGETS[key];
+
+  testInfo.annotations.push({
+    type: 'perf',
+    description: `${key}: ${value}${budget != null ? ` (budget ${budget})` : ''}`,
+  });
+
+  expect(budget != null, `${key} has no budget in startup-budget.json`).toBe(true);
+  expect(value, `${key} over budget: ${value} > ${budget}`).toBeLessThanOrEqual(budget);
+}
+
+/**
+ * Files loaded by dist/index.html before any lazy import
+ */
+function initialAssets() {
+  const html = fs.readFileSync(path.join(DIST, 'index.html'), 'utf8');
+  const refs = [
+    ...html.matchAll(/<script[^>]+type="module"[^>]+src="([^"]+)"/g),
+    ...html.matchAll(/<link[^>]+rel="(?:modulepreload|stylesheet)"[^>]+href="([^"]+)"/g),
+  ].map(m => m[1]);
+
+  return [...new Set(refs)]
+    .filter(ref => /\/assets\//.test(ref))
+    .map(ref => path.join(DIST, 'assets', path.basename(ref)));
+}
+
+test.describe('Startup budget', () => {
+  // eslint-disable-next-line no-empty-pattern
+  test('initial bundle size', async ({}, testInfo) => {
+    expect(fs.existsSync(path.join(DIST, 'index.html')), 'dist/ missing: run npm run build').toBe(true);
+
+    const assets = initialAssets();
+    const sizes = assets.map(file => ({
+      name: path.basename(file),
+      gzip: zlib.gzipSync(fs.readFileSync(file)).length,
+    }));
+
+    for (const { name, gzip } of sizes) {
+      testInfo.annotations.push({ type: 'asset', description: `${name}: ${gzip} B gzip` });
+    }
+
+    // Feature chunks must stay out of the startup graph
+    const leaked = sizes.filter(({ name }) => LAZY_ONLY_CHUNKS.test(name)).map(({ name }) => name);
+    expect(leaked, 'feature chunks preloaded at startup').toEqual([]);
+
+    const jsGzip = sizes.filter(({ name }) => name.endsWith('.js')).reduce((sum, { gzip }) => sum + gzip, 0);
+    const cssGzip = sizes.filter(({ name }) => name.endsWith('.css')).reduce((sum, { gzip }) => sum + gzip, 0);
+
+    checkBudget(testInfo, 'initial.jsGzipBytes', jsGzip);
+    checkBudget(testInfo, 'initial.cssGzipBytes', cssGzip);
+  });
+
+  for (const route of ROUTES) {
+    test(`${route.name} route: JS and time-to-interactive`, async ({ browser }, testInfo) => {
+      test.skip(route.auth && !fs.existsSync(AUTH_STATE), 'needs e2e/.auth/user.json (run the setup project)');
+
+      const context = await browser.newContext({
+        ...testInfo.project.use,
+        storageState: route.auth ? AUTH_STATE : undefined,
+      });
+      const page = await context.newPage();
+
+      const cdp = await context.newCDPSession(page);
+      await cdp.send('Emulation.setCPUThrottlingRate', { rate: CPU_SLOWDOWN });
+
+      await page.addInitScript(() => {
+        window.__perf = { lastLongTaskEnd: 0, fcp: 0, readyAt: 0 };
+        new PerformanceObserver((list) => {
+          for (const entry of list.getEntries()) {
+            window.__perf.lastLongTaskEnd = Math.max(window.__perf.lastLongTaskEnd, entry.startTime + entry.duration);
+          }
+        }).observe({ type: 'longtask', buffered: true });
+        new PerformanceObserver((list) => {
+          for (const entry of list.getEntries()) {
+            if (entry.name === 'first-contentful-paint') window.__perf.fcp = entry.startTime;
+          }
+        }).observe({ type: 'paint', buffered: true });
+      });
+
+      let jsBytes = 0;
+      const chunks = [];
+      page.on('response', async (response) => {
+        if (response.request().resourceType() !== 'script') return;
+        const name = path.basename(new URL(response.url()).pathname);
+        chunks.push(name);
+        try {
+          jsBytes += (await response.body()).length;
+        } catch {
+          // Redirects / aborted requests have no body
+        }
+      });
+
+      await page.goto(route.path);
+
+      await page.waitForFunction(`(${route.ready})() && (window.__perf.readyAt ||= performance.now())`, null, {
+        polling: 'raf',
+      });
+      await page.waitForLoadState('networkidle');
+
+      // Wait for a quiet window with no long tasks
+      await expect.poll(
+        () => page.evaluate(() => performance.now() - Math.max(window.__perf.lastLongTaskEnd, window.__perf.readyAt)),
+        { timeout: 30000, intervals: [250] }
+      ).toBeGreaterThanOrEqual(QUIET_WINDOW_MS);
+
+      const { lastLongTaskEnd, fcp, readyAt } = await page.evaluate(() => window.__perf);
+      const tti = Math.round(Math.max(lastLongTaskEnd, fcp, readyAt));
+
+      await context.close();
+
+      const leaked = chunks.filter(name => LAZY_ONLY_CHUNKS.test(name));
+      expect(leaked, `${route.name} loaded feature chunks`).toEqual([]);
+
+      checkBudget(testInfo, `${route.name}.jsBytes`, jsBytes);
+      checkBudget(testInfo, `${route.name}.ttiMs`, tti);
+    });
+  }
+});
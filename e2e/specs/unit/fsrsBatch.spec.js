@@ -0,0 +1,162 @@
+/**
+ * Unit - Batched FSRS engine
+ *
+ * Property test: for randomly generated progress rows (including missing
+ * rows, null/undefined fields, legacy ease_factor/interval rows and
+ * timestamps around a DST change), every lib/fsrsBatch kernel must return
+ * exactly what the scalar lib/fsrs function returns. No browser needed.
+ */
+
+import { test, expect } from '@playwright/test';
+import {
+  calculateNextReview,
+  calculatePriority,
+  calculateRetention,
+  getDueQuestions,
+  stateToInt
+} from '../../../src/lib/fsrs.js';
+import {
+  createProgressBatch,
+  batchNextReview,
+  batchSelectDue,
+  batchRetention,
+  batchPriority
+} from '../../../src/lib/fsrsBatch.js';
+
+const RUNS = 200;
+const ROWS_PER_RUN = 250;
+
+function makeRandom(seed) {
+  let x = seed >>> 0 || 1;
+  return () => {
+    x ^= x << 13; x >>>= 0;
+    x ^= x >>> 17;
+    x ^= x << 5; x >>>= 0;
+    return x / 2 ** 32;
+  };
+}
+
+function generateRows(rand, count, nowMs) {
+  const pick = (values) => values[Math.floor(rand() * values.length)];
+  const maybe = (value) => pick([value, value, value, null, undefined]);
+  const rows = [];
+
+  for (let i = 0; i < count; i++) {
+    if (rand() < 0.1) {
+      rows.push(null);
+      continue;
+    }
+    const row = {
+      question_id: i + 1,
+      times_seen: maybe(pick([0, 1, 2, 3, 4, Math.floor(rand() * 50)])),
+      times_correct: maybe(Math.floor(rand() * 10)),
+      stability: maybe(pick([0, rand() * 0.5, rand() * 100])),
+      difficulty: maybe(pick([0, 10, rand() * 10])),
+      scheduled_days: maybe(pick([0, 1, 2, 3, 7, Math.floor(rand() * 365)])),
+      next_review: maybe(new Date(nowMs + (rand() - 0.5) * 60 * 86400000).toISOString())
+    };
+    // Legacy SM-2 rows
+    if (rand() < 0.3) row.ease_factor = maybe(1.3 + rand() * 1.7);
+    if (rand() < 0.3) row.interval = maybe(Math.floor(rand() * 10));
+    // Duplicate timestamps exercise the stable tie order
+    if (rand() < 0.05 && rows.length > 0 && rows[rows.length - 1]) {
+      row.next_review = rows[rows.length - 1].next_review;
+    }
+    rows.push(row);
+  }
+
+  return rows;
+}
+
+// Around the 2026-03-29 (EU) and 2026-11-01 (US) DST changes plus arbitrary days
+const NOW_VALUES = [
+  Date.UTC(2026, 2, 28, 23, 30),
+  Date.UTC(2026, 9, 31, 12, 0),
+  Date.UTC(2026, 5, 15, 8, 45),
+  Date.UTC(2025, 11, 31, 23, 59)
+];
+
+// calculatePriority and getDueQuestions read the clock themselves
+function withFrozenNow(nowMs, fn) {
+  const RealDate = Date;
+  globalThis.Date = class extends RealDate {
+    constructor(...args) {
+      super(...(args.length ? args : [nowMs]));
+    }
+  };
+  try {
+    return fn();
+  } finally {
+    globalThis.Date = RealDate;
+  }
+}
+
+test.describe('FSRS batch kernels match the scalar implementation', () => {
+  test('batchNextReview === calculateNextReview', () => {
+    for (let run = 0; run < RUNS; run++) {
+      const rand = makeRandom(run + 1);
+      const nowMs = NOW_VALUES[run % NOW_VALUES.length];
+      const rows = generateRows(rand, ROWS_PER_RUN, nowMs);
+      const correct = Uint8Array.from(rows, () => (rand() < 0.6 ? 1 : 0));
+
+      const out = batchNextReview(createProgressBatch(rows), correct, undefined, nowMs);
+
+      rows.forEach((row, i) => {
+        const expected = calculateNextReview(row, !!correct[i], undefined, new Date(nowMs));
+        expect({
+          nextReview: out.nextReview[i],
+          interval: out.interval[i],
+          ease: out.ease[i],
+          stability: out.stability[i],
+          difficulty: out.difficulty[i],
+          state: out.state[i]
+        }, `run ${run}, row ${i}: ${JSON.stringify(row)}`).toEqual({
+          nextReview: expected.nextReview.getTime(),
+          interval: expected.interval,
+          ease: expected.ease,
+          stability: expected.stability,
+          difficulty: expected.difficulty,
+          state: stateToInt(expected.state)
+        });
+      });
+    }
+  });
+
+  test('batchSelectDue === getDueQuestions (full and top-k)', () => {
+    for (let run = 0; run < RUNS; run++) {
+      const rand = makeRandom(1000 + run);
+      const nowMs = Date.now();
+      const rows = generateRows(rand, ROWS_PER_RUN, nowMs).filter(Boolean);
+      const batch = createProgressBatch(rows);
+
+      const expected = withFrozenNow(nowMs, () => getDueQuestions(rows)).map(row => rows.indexOf(row));
+      expect(Array.from(batchSelectDue(batch, nowMs))).toEqual(expected);
+
+      const k = Math.floor(rand() * 30);
+      expect(Array.from(batchSelectDue(batch, nowMs, k))).toEqual(expected.slice(0, k));
+    }
+  });
+
+  test('batchRetention === calculateRetention', () => {
+    for (let run = 0; run < RUNS; run++) {
+      const rand = makeRandom(2000 + run);
+      const rows = generateRows(rand, Math.floor(rand() * ROWS_PER_RUN), Date.now()).filter(Boolean);
+      expect(batchRetention(createProgressBatch(rows))).toBe(calculateRetention(rows));
+    }
+  });
+
+  test('batchPriority === calculatePriority', () => {
+    for (let run = 0; run < RUNS; run++) {
+      const rand = makeRandom(3000 + run);
+      const nowMs = Date.now();
+      const rows = generateRows(rand, ROWS_PER_RUN, nowMs);
+      const out = batchPriority(createProgressBatch(rows), nowMs);
+
+      withFrozenNow(nowMs, () => {
+        rows.forEach((row, i) => {
+          expect(out[i], `run ${run}, row ${i}`).toBe(calculatePriority(row));
+        });
+      });
+    }
+  });
+});
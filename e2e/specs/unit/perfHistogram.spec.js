@@ -0,0 +1,113 @@
+/**
+ * Unit - Latency histograms
+ *
+ * lib/perfHistogram bucketing, merging and percentile estimates. For
+ * random samples, the estimated percentile must fall inside the bucket
+ * holding the exact (nearest-rank) percentile of the sorted values, and a
+ * merged histogram must equal one built from all values. No browser needed.
+ */
+
+import { test, expect } from '@playwright/test';
+import {
+  BUCKET_BOUNDS,
+  createHistogram,
+  bucketIndex,
+  recordValue,
+  mergeHistogram,
+  histogramPercentile
+} from '../../../src/lib/perfHistogram.js';
+
+const RUNS = 200;
+
+function makeRandom(seed) {
+  let x = seed >>> 0 || 1;
+  return () => {
+    x ^= x << 13; x >>>= 0;
+    x ^= x >>> 17;
+    x ^= x << 5; x >>>= 0;
+    return x / 2 ** 32;
+  };
+}
+
+// Log-uniform latencies from ~0.5ms to ~60s, with some repeated values
+function generateValues(rand, count) {
+  const values = [];
+  for (let i = 0; i < count; i++) {
+    values.push(rand() < 0.1 && values.length > 0
+      ? values[Math.floor(rand() * values.length)]
+      : Math.exp(Math.log(0.5) + rand() * Math.log(120000)));
+  }
+  return values;
+}
+
+function buildHistogram(values) {
+  const histogram = createHistogram();
+  values.forEach(v => recordValue(histogram, v));
+  return histogram;
+}
+
+function nearestRank(sorted, p) {
+  return sorted[Math.max(0, Math.ceil(p * sorted.length) - 1)];
+}
+
+test.describe('Perf histogram', () => {
+  test('bucketIndex puts bounds in the bucket they close', () => {
+    expect(bucketIndex(0)).toBe(0);
+    BUCKET_BOUNDS.forEach((bound, i) => {
+      expect(bucketIndex(bound)).toBe(i);
+      expect(bucketIndex(bound + 0.001)).toBe(i + 1);
+    });
+    expect(bucketIndex(1e9)).toBe(BUCKET_BOUNDS.length);
+  });
+
+  test('empty histogram has no percentile', () => {
+    expect(histogramPercentile(createHistogram(), 0.5)).toBeNull();
+  });
+
+  test('single value is returned exactly', () => {
+    const histogram = buildHistogram([42]);
+    expect(histogramPercentile(histogram, 0.5)).toBe(42);
+    expect(histogramPercentile(histogram, 0.95)).toBe(42);
+  });
+
+  test('percentiles fall in the bucket of the exact value', () => {
+    const rand = makeRandom(0x5eed);
+
+    for (let run = 0; run < RUNS; run++) {
+      const values = generateValues(rand, 1 + Math.floor(rand() * 400));
+      const sorted = [...values].sort((a, b) => a - b);
+      const histogram = buildHistogram(values);
+
+      expect(histogram.count).toBe(values.length);
+      expect(histogram.buckets.reduce((a, b) => a + b, 0)).toBe(values.length);
+
+      for (const p of [0.5, 0.95, 0.99]) {
+        const estimate = histogramPercentile(histogram, p);
+        const i = bucketIndex(nearestRank(sorted, p));
+        const lower = Math.max(i === 0 ? 0 : BUCKET_BOUNDS[i - 1], sorted[0]);
+        const upper = Math.min(i < BUCKET_BOUNDS.length ? BUCKET_BOUNDS[i] : Infinity, sorted[sorted.length - 1]);
+
+        expect(estimate).toBeGreaterThanOrEqual(lower);
+        expect(estimate).toBeLessThanOrEqual(upper);
+      }
+    }
+  });
+
+  test('merging equals recording everything into one histogram', () => {
+    const rand = makeRandom(0xbeef);
+
+    for (let run = 0; run < RUNS; run++) {
+      const a = generateValues(rand, 1 + Math.floor(rand() * 100));
+      const b = generateValues(rand, 1 + Math.floor(rand() * 100));
+      const merged = mergeHistogram(buildHistogram(a), buildHistogram(b));
+      const expected = buildHistogram([...a, ...b]);
+
+      expect(merged.buckets).toEqual(expected.buckets);
+      expect(merged.count).toBe(expected.count);
+      expect(merged.min).toBe(expected.min);
+      expect(merged.max).toBe(expected.max);
+      expect(merged.sum).toBeCloseTo(expected.sum, 6);
+      expect(histogramPercentile(merged, 0.95)).toBeCloseTo(histogramPercentile(expected, 0.95), 9);
+    }
+  });
+});
@@ -0,0 +1,126 @@
+/**
+ * Unit - Question similarity index
+ *
+ * utils/questionSimilarity MinHash-LSH index used by the importer: a text
+ * is a duplicate when its word-level Jaccard similarity with an indexed
+ * text is above the threshold (0.9). Checks threshold behaviour on both
+ * sides, normalization, empty/short texts, and agreement with a brute-force
+ * Jaccard scan on random texts. No browser needed.
+ */
+
+import { test, expect } from '@playwright/test';
+import {
+  createSimilarityIndex,
+  jaccardSimilarity,
+  normalizeQuestionText,
+  DEFAULT_SIMILARITY_THRESHOLD
+} from '../../../src/utils/questionSimilarity.js';
+
+const RUNS = 50;
+
+function makeRandom(seed) {
+  let x = seed >>> 0 || 1;
+  return () => {
+    x ^= x << 13; x >>>= 0;
+    x ^= x >>> 17;
+    x ^= x << 5; x >>>= 0;
+    return x / 2 ** 32;
+  };
+}
+
+const VOCAB = Array.from({ length: 500 }, (_, i) => `palabra${i.toString(36)}`);
+
+// Distinct words, so Jaccard after edits is easy to reason about
+function randomWords(rand, count) {
+  const words = new Set();
+  while (words.size < count) words.add(VOCAB[Math.floor(rand() * VOCAB.length)]);
+  return [...words];
+}
+
+function replaceWords(words, count) {
+  return words.map((w, i) => (i < count ? `otra${i}` : w));
+}
+
+function words(text) {
+  return new Set(normalizeQuestionText(text).split(' '));
+}
+
+test.describe('Question similarity index', () => {
+  const base = randomWords(makeRandom(7), 30);
+  const text = base.join(' ');
+
+  test('exact text matches after normalization', () => {
+    const index = createSimilarityIndex();
+    index.add(1, text);
+    expect(index.findDuplicate(`  ${text.toUpperCase()}\n`)).toEqual({ id: 1, similarity: 1 });
+  });
+
+  test('near duplicate above the threshold is found', () => {
+    const index = createSimilarityIndex();
+    index.add(1, text);
+    // 1 of 30 words changed: Jaccard 29/31
+    const match = index.findDuplicate(replaceWords(base, 1).join(' '));
+    expect(match?.id).toBe(1);
+    expect(match.similarity).toBeGreaterThan(DEFAULT_SIMILARITY_THRESHOLD);
+  });
+
+  test('similar text below the threshold is not a duplicate', () => {
+    const index = createSimilarityIndex();
+    index.add(1, text);
+    // 3 of 30 words changed: Jaccard 27/33
+    expect(index.findDuplicate(replaceWords(base, 3).join(' '))).toBeNull();
+  });
+
+  test('unrelated text is not found', () => {
+    const index = createSimilarityIndex();
+    index.add(1, text);
+    const other = VOCAB.filter(w => !base.includes(w)).slice(0, 30).join(' ');
+    expect(index.findDuplicate(other)).toBeNull();
+  });
+
+  test('empty index and short texts', () => {
+    const index = createSimilarityIndex();
+    expect(index.findDuplicate('')).toBeNull();
+    expect(index.findDuplicate(text)).toBeNull();
+
+    index.add(1, '¿Qué es la Constitución?');
+    // One word of four differs: far below the threshold
+    expect(index.findDuplicate('¿Qué es la ley?')).toBeNull();
+    expect(index.findDuplicate('¿qué es la constitución?')?.id).toBe(1);
+    expect(index.size).toBe(1);
+  });
+
+  test('custom threshold', () => {
+    const index = createSimilarityIndex({ threshold: 0.8 });
+    index.add(1, text);
+    expect(index.findDuplicate(replaceWords(base, 3).join(' '))?.id).toBe(1);
+  });
+
+  test('matches a brute-force Jaccard scan', () => {
+    const rand = makeRandom(0x51a1);
+
+    for (let run = 0; run < RUNS; run++) {
+      const bank = Array.from({ length: 60 }, () => randomWords(rand, 10 + Math.floor(rand() * 20)));
+      const index = createSimilarityIndex();
+      bank.forEach((w, id) => index.add(id, w.join(' ')));
+
+      // Edited copies of bank texts (0-4 words changed) plus unrelated texts
+      const queries = Array.from({ length: 30 }, () => (rand() < 0.7
+        ? replaceWords(bank[Math.floor(rand() * bank.length)], Math.floor(rand() * 5)).join(' ')
+        : randomWords(rand, 15).join(' ')));
+
+      for (const query of queries) {
+        let best = null;
+        bank.forEach((w, id) => {
+          const similarity = jaccardSimilarity(words(query), new Set(w));
+          if (similarity > DEFAULT_SIMILARITY_THRESHOLD && (!best || similarity > best.similarity)) {
+            best = { id, similarity };
+          }
+        });
+
+        const match = index.findDuplicate(query);
+        expect(match?.similarity ?? null).toBe(best?.similarity ?? null);
+      }
+    }
+  });
+});
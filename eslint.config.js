@@ -33,7 +33,7 @@ export default defineConfig([
   },
   // Node.js environment for config files, scripts, and service worker
   {
-    files: ['vite.config.js', 'e2e/**/*.js', 'storage.js', 'public/sw.js'],
+    files: ['vite.config.js', 'e2e/**/*.js', 'bench/**/*.js', 'storage.js', 'public/sw.js'],
     languageOptions: {
       globals: {
         ...globals.node,
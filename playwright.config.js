@@ -31,11 +31,18 @@ export default defineConfig({
       testMatch: /tier1-smoke\/.*/,
       use: { viewport: { width: 390, height: 844 } },
     },
+    // Unit — pure module tests, no browser or auth needed
+    {
+      name: 'unit',
+      testMatch: /unit\/.*/,
+    },
+    // Startup budget (tier4-performance) runs on the production build:
+    // see playwright.perf.config.js
     // Mobile — authenticated tests (Chromium with mobile viewport)
     {
       name: 'mobile-chrome',
       testDir: './e2e/specs',
-      testIgnore: /tier1-smoke\//,
+      testIgnore: /(tier1-smoke|unit|tier4-performance)\//,
       use: {
         viewport: { width: 390, height: 844 },
         isMobile: true,
@@ -48,7 +55,7 @@ export default defineConfig({
     {
       name: 'desktop-chrome',
       testDir: './e2e/specs',
-      testIgnore: /tier1-smoke\//,
+      testIgnore: /(tier1-smoke|unit|tier4-performance)\//,
       use: {
         viewport: { width: 1280, height: 720 },
         storageState: 'e2e/.auth/user.json',
@@ -0,0 +1,40 @@
+import { defineConfig } from '@playwright/test';
+
+// Startup benchmark: runs against the production build (vite preview), not
+// the dev server, so bundle sizes and timings reflect what users download.
+const PORT = 4173;
+const BASE = process.env.VERCEL ? '/' : '/Oposiciones-App/';
+
+export default defineConfig({
+  testDir: './e2e/specs/tier4-performance',
+  outputDir: './e2e/results',
+  timeout: 90000,
+  retries: 0,
+  // Timing measurements must not compete for CPU
+  workers: 1,
+  fullyParallel: false,
+
+  reporter: [['list']],
+
+  use: {
+    baseURL: `http://localhost:${PORT}${BASE}`,
+  },
+
+  projects: [
+    {
+      name: 'perf',
+      use: {
+        viewport: { width: 390, height: 844 },
+        isMobile: true,
+        hasTouch: true,
+      },
+    },
+  ],
+
+  webServer: {
+    command: `npm run build && npm run preview -- --port ${PORT} --strictPort`,
+    url: `http://localhost:${PORT}${BASE}`,
+    reuseExistingServer: !process.env.CI,
+    timeout: 180000,
+  },
+});
@@ -207,7 +207,7 @@ function FsrsBreakdown({ stats }) {
 /**
  * ProgressTab - Statistics and history view
  */
-function ProgressTab({ data, fsrsStats, onSwipeLeft, onStartTest, formatRelativeDate }) {
+function ProgressTab({ data, fsrsStats, onSwipeLeft, onStartTest, formatRelativeDate, hasMoreSessions, loadingMoreSessions, onLoadMoreSessions }) {
   const formatDate = formatRelativeDate || ((date) => {
     const d = new Date(date);
     const now = new Date();
@@ -331,7 +331,7 @@ function ProgressTab({ data, fsrsStats, onSwipeLeft, onStartTest, formatRelative
         <div className="bg-white rounded-xl p-4 shadow-sm border border-gray-100">
           <h4 className="font-semibold text-gray-900 mb-3">Últimas sesiones</h4>
           <div className="space-y-2">
-            {data.sessionHistory.slice(0, 5).map((session, idx) => {
+            {data.sessionHistory.map((session, idx) => {
               const temaName = session.tema || (session.topic_id ? `Tema ${session.topic_id}` : 'General');
               const correct = session.correctas || 0;
               const total = session.total_preguntas || 0;
@@ -353,6 +353,15 @@ function ProgressTab({ data, fsrsStats, onSwipeLeft, onStartTest, formatRelative
               );
             })}
           </div>
+          {hasMoreSessions && onLoadMoreSessions && (
+            <button
+              onClick={onLoadMoreSessions}
+              disabled={loadingMoreSessions}
+              className="w-full mt-3 py-2 text-sm font-medium rounded-lg text-green-700 hover:bg-green-50 disabled:opacity-50 transition-colors"
+            >
+              {loadingMoreSessions ? 'Cargando...' : 'Cargar más'}
+            </button>
+          )}
         </div>
       )}
 
@@ -424,6 +433,9 @@ export default function ActividadPage({
   loading = false,
   onStartTest,
   formatRelativeDate,
+  hasMoreSessions = false,
+  loadingMoreSessions = false,
+  onLoadMoreSessions,
   devMode = false,
   premiumMode = false
 }) {
@@ -568,6 +580,9 @@ export default function ActividadPage({
               onSwipeLeft={() => setActiveTab(0)}
               onStartTest={() => setActiveTab(0)}
               formatRelativeDate={formatRelativeDate}
+              hasMoreSessions={!simulatedData && hasMoreSessions}
+              loadingMoreSessions={loadingMoreSessions}
+              onLoadMoreSessions={onLoadMoreSessions}
             />
           )}
           {activeTab === 2 && (
@@ -80,7 +80,7 @@ function buildRecentSessions(sessionHistory) {
     flashcards: 'Flashcards',
     lectura: 'Lectura guiada',
   };
-  return (sessionHistory || []).slice(0, 8).map((s) => {
+  return (sessionHistory || []).map((s) => {
     const total = s.totalQuestions || s.total_questions || 0;
     const correct = s.correctAnswers || s.correct_answers || 0;
     const modeLabel = modeLabels[s.sessionType || s.session_type] || 'Sesión';
@@ -98,6 +98,25 @@ function buildRecentSessions(sessionHistory) {
   });
 }
 
+// "Cargar más" under the session log (keyset pages from useActivityData)
+function LoadMoreSessions({ loadMore }) {
+  if (!loadMore?.hasMore) return null;
+  return (
+    <button
+      onClick={loadMore.onLoadMore}
+      disabled={loadMore.loading}
+      style={{
+        marginTop: 14, padding: '8px 0', background: 'none', border: 'none',
+        cursor: loadMore.loading ? 'default' : 'pointer',
+        fontFamily: OS.serif, fontSize: 14, fontStyle: 'italic',
+        color: loadMore.loading ? OS.muted : OS.ink,
+      }}
+    >
+      {loadMore.loading ? 'Cargando…' : 'Cargar más'}
+    </button>
+  );
+}
+
 function useMonthLabels(weeks) {
   return useMemo(() => {
     if (!weeks.length) return [];
@@ -120,7 +139,7 @@ function useMonthLabels(weeks) {
 
 // ------ MOBILE ------
 
-function ActividadMobile({ stats, recentSessions, heatmap, monthLabels }) {
+function ActividadMobile({ stats, recentSessions, heatmap, monthLabels, loadMore }) {
   const rev0 = useReveal(0);
   const rev1 = useReveal(200);
 
@@ -215,6 +234,7 @@ function ActividadMobile({ stats, recentSessions, heatmap, monthLabels }) {
                   }}>{s.duration}</div>
                 </div>
               ))}
+              <LoadMoreSessions loadMore={loadMore} />
             </div>
           )}
         </div>
@@ -225,7 +245,7 @@ function ActividadMobile({ stats, recentSessions, heatmap, monthLabels }) {
 
 // ------ DESKTOP ------
 
-function ActividadDesktop({ stats, recentSessions, heatmap, monthLabels, topicBars, observation }) {
+function ActividadDesktop({ stats, recentSessions, heatmap, monthLabels, topicBars, observation, loadMore }) {
   const rev0 = useReveal(0);
 
   return (
@@ -319,6 +339,7 @@ function ActividadDesktop({ stats, recentSessions, heatmap, monthLabels, topicBa
                     }}>{s.duration}</div>
                   </div>
                 ))}
+                <LoadMoreSessions loadMore={loadMore} />
               </div>
             )}
           </div>
@@ -377,6 +398,9 @@ export default function EditorialActividad({
   fsrsStats: _fsrsStats = null,
   simulacroAvg: _simulacroAvg = 0,
   weeklyData: _weeklyData = [],
+  hasMoreSessions = false,
+  loadingMoreSessions = false,
+  onLoadMoreSessions,
 }) {
   const isDesktop = useMediaQuery('(min-width: 1024px)');
   const weeksBack = isDesktop ? 26 : 12;
@@ -427,7 +451,13 @@ export default function EditorialActividad({
 
   const observation = null; // TODO: generate from real data once we have day-of-week stats
 
-  const props = { stats, recentSessions, heatmap, monthLabels, topicBars, observation };
+  const loadMore = {
+    hasMore: hasMoreSessions && !!onLoadMoreSessions,
+    loading: loadingMoreSessions,
+    onLoadMore: onLoadMoreSessions,
+  };
+
+  const props = { stats, recentSessions, heatmap, monthLabels, topicBars, observation, loadMore };
 
   return isDesktop ? <ActividadDesktop {...props} /> : <ActividadMobile {...props} />;
 }
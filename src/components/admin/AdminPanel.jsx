@@ -4,7 +4,7 @@ import {
   CheckCircle, XCircle, Clock, RefreshCw, Download,
   Upload, Eye, Edit, Trash2, BarChart3, LogOut,
   ChevronRight, AlertTriangle, Search, Filter,
-  BookOpen, List, TrendingUp, Plus, Lightbulb
+  BookOpen, List, TrendingUp, Plus, Lightbulb, Gauge
 } from 'lucide-react';
 import { useAdmin } from '../../contexts/AdminContext';
 import { supabase } from '../../lib/supabase';
@@ -14,6 +14,7 @@ import QuestionTierManager from './QuestionTierManager';
 import TemasTab from './TemasTab';
 import PreguntasTab from './PreguntasTab';
 import InsightsTab from './InsightsTab';
+import PerfTab from './PerfTab';
 import { ReviewContainer } from '../review';
 import { BottomTabBar } from '../navigation';
 
@@ -128,6 +129,7 @@ export default function AdminPanel({
     { id: 'import', label: 'Importar', icon: Upload },
     { id: 'export', label: 'Exportar', icon: Download },
     { id: 'tiers', label: 'Tiers', icon: Settings },
+    { id: 'perf', label: 'Rendimiento', icon: Gauge },
   ];
 
   return (
@@ -210,6 +212,9 @@ export default function AdminPanel({
         {activeTab === 'tiers' && (
           <QuestionTierManager />
         )}
+        {activeTab === 'perf' && (
+          <PerfTab />
+        )}
       </div>
 
       {/* Bottom Navigation */}
@@ -0,0 +1,137 @@
+import { useState, useEffect, useCallback } from 'react';
+import { Gauge, RefreshCw, AlertCircle } from 'lucide-react';
+import { supabase } from '../../lib/supabase';
+
+const RANGES = [
+  { hours: 24, label: 'Últimas 24 h' },
+  { hours: 168, label: 'Últimos 7 días' },
+  { hours: 720, label: 'Últimos 30 días' },
+];
+
+const KIND_LABELS = {
+  span: 'Llamada',
+  ux: 'UX',
+  vital: 'Web vital',
+  longtask: 'Tarea larga',
+};
+
+// CLS is stored in thousandths (unit 'mcls')
+const formatValue = (value, unit) => {
+  if (value === null || value === undefined) return '-';
+  if (unit === 'mcls') return (value / 1000).toFixed(3);
+  return value >= 1000 ? `${(value / 1000).toFixed(2)} s` : `${Math.round(value)} ms`;
+};
+
+/**
+ * Client latency per operation (perf_metrics histograms, p50/p95)
+ */
+export default function PerfTab() {
+  const [rows, setRows] = useState([]);
+  const [sinceHours, setSinceHours] = useState(168);
+  const [loading, setLoading] = useState(true);
+  const [error, setError] = useState(null);
+
+  const loadSummary = useCallback(async () => {
+    setLoading(true);
+    setError(null);
+    try {
+      const { data, error } = await supabase.rpc('get_perf_summary', { p_since_hours: sinceHours });
+      if (error) throw error;
+      setRows(data || []);
+    } catch (err) {
+      console.error('Error loading perf summary:', err);
+      setError(err.message);
+    } finally {
+      setLoading(false);
+    }
+  }, [sinceHours]);
+
+  useEffect(() => {
+    loadSummary();
+  }, [loadSummary]);
+
+  return (
+    <div className="space-y-6">
+      {/* Header */}
+      <div className="flex items-center justify-between">
+        <div className="flex items-center gap-2">
+          <Gauge className="w-5 h-5 text-green-700" />
+          <h2 className="text-lg font-semibold text-gray-900">Rendimiento del cliente</h2>
+        </div>
+        <div className="flex gap-2">
+          <select
+            value={sinceHours}
+            onChange={(e) => setSinceHours(Number(e.target.value))}
+            className="px-3 py-2 border border-gray-200 rounded-lg text-sm bg-white"
+          >
+            {RANGES.map(range => (
+              <option key={range.hours} value={range.hours}>{range.label}</option>
+            ))}
+          </select>
+          <button
+            onClick={loadSummary}
+            className="p-2 text-gray-500 hover:text-green-700 hover:bg-green-50 rounded-lg transition-colors"
+          >
+            <RefreshCw className={`w-4 h-4 ${loading ? 'animate-spin' : ''}`} />
+          </button>
+        </div>
+      </div>
+
+      {error && (
+        <div className="p-4 bg-red-50 border border-red-200 rounded-lg text-red-700 text-sm flex items-center gap-2">
+          <AlertCircle className="w-4 h-4" />
+          {error}
+        </div>
+      )}
+
+      {loading && rows.length === 0 ? (
+        <div className="flex items-center justify-center py-12">
+          <RefreshCw className="w-6 h-6 animate-spin text-green-700" />
+        </div>
+      ) : rows.length === 0 ? (
+        <div className="p-8 text-center text-gray-500 bg-white rounded-xl border border-gray-200">
+          No hay métricas en este periodo
+        </div>
+      ) : (
+        <div className="bg-white rounded-xl border border-gray-200 overflow-hidden">
+          <div className="overflow-x-auto">
+            <table className="w-full">
+              <thead>
+                <tr className="bg-gray-50 border-b border-gray-200">
+                  <th className="px-4 py-3 text-left text-xs font-medium text-gray-500 uppercase">Operación</th>
+                  <th className="px-4 py-3 text-left text-xs font-medium text-gray-500 uppercase">Tipo</th>
+                  <th className="px-4 py-3 text-right text-xs font-medium text-gray-500 uppercase">Muestras</th>
+                  <th className="px-4 py-3 text-right text-xs font-medium text-gray-500 uppercase">~Llamadas</th>
+                  <th className="px-4 py-3 text-right text-xs font-medium text-gray-500 uppercase">p50</th>
+                  <th className="px-4 py-3 text-right text-xs font-medium text-gray-500 uppercase">p95</th>
+                  <th className="px-4 py-3 text-right text-xs font-medium text-gray-500 uppercase">Máx</th>
+                  <th className="px-4 py-3 text-right text-xs font-medium text-gray-500 uppercase">Errores</th>
+                </tr>
+              </thead>
+              <tbody className="divide-y divide-gray-100">
+                {rows.map(row => (
+                  <tr key={`${row.metric_kind}|${row.operation}|${row.metric_unit}`} className="hover:bg-gray-50">
+                    <td className="px-4 py-3 font-mono text-sm text-gray-900">{row.operation}</td>
+                    <td className="px-4 py-3 text-sm text-gray-500">{KIND_LABELS[row.metric_kind] || row.metric_kind}</td>
+                    <td className="px-4 py-3 text-right text-sm text-gray-900">{row.samples}</td>
+                    <td className="px-4 py-3 text-right text-sm text-gray-500">{row.estimated_calls}</td>
+                    <td className="px-4 py-3 text-right text-sm text-gray-900">{formatValue(row.p50, row.metric_unit)}</td>
+                    <td className="px-4 py-3 text-right text-sm font-medium text-gray-900">{formatValue(row.p95, row.metric_unit)}</td>
+                    <td className="px-4 py-3 text-right text-sm text-gray-500">{formatValue(row.max_value, row.metric_unit)}</td>
+                    <td className="px-4 py-3 text-right text-sm">
+                      {row.error_rate > 0 ? (
+                        <span className="text-red-600">{(row.error_rate * 100).toFixed(1)}%</span>
+                      ) : (
+                        <span className="text-gray-400">-</span>
+                      )}
+                    </td>
+                  </tr>
+                ))}
+              </tbody>
+            </table>
+          </div>
+        </div>
+      )}
+    </div>
+  );
+}
@@ -1,6 +1,6 @@
-import React, { useState, useEffect } from 'react';
-import { Download, Filter, Loader2, RefreshCw, FileJson } from 'lucide-react';
-import { exportQuestions, getQuestionStats, downloadAsJSON } from '../../services/questionImportService';
+import React, { useState, useEffect, useRef } from 'react';
+import { Download, Filter, Loader2, RefreshCw, FileJson, X } from 'lucide-react';
+import { exportQuestions, exportQuestionsToBlob, getQuestionStats, downloadExport } from '../../services/questionImportService';
 
 export default function QuestionExporter() {
   const [filters, setFilters] = useState({
@@ -15,6 +15,9 @@ export default function QuestionExporter() {
   const [isExporting, setIsExporting] = useState(false);
   const [exportResult, setExportResult] = useState(null);
   const [previewQuestions, setPreviewQuestions] = useState([]);
+  const [format, setFormat] = useState('json');
+  const [progress, setProgress] = useState(null); // { exported, estimatedTotal }
+  const abortRef = useRef(null);
 
   // Load stats on mount
   useEffect(() => {
@@ -65,9 +68,12 @@ export default function QuestionExporter() {
     }
   };
 
-  // Export and download
+  // Export and download (streamed page by page into a Blob)
   const handleExport = async () => {
     setIsExporting(true);
+    setProgress({ exported: 0, estimatedTotal: null });
+    const controller = new AbortController();
+    abortRef.current = controller;
     try {
       const cleanFilters = Object.fromEntries(
         Object.entries(filters).filter(([, v]) => v !== '')
@@ -76,13 +82,17 @@ export default function QuestionExporter() {
       if (cleanFilters.tema) cleanFilters.tema = parseInt(cleanFilters.tema);
       if (cleanFilters.difficulty) cleanFilters.difficulty = parseInt(cleanFilters.difficulty);
 
-      const result = await exportQuestions(cleanFilters);
+      const result = await exportQuestionsToBlob(cleanFilters, {
+        format,
+        onProgress: setProgress,
+        signal: controller.signal
+      });
 
-      if (result.success && result.questions.length > 0) {
+      if (result.success && result.count > 0) {
         const filterLabel = Object.keys(cleanFilters).length > 0
           ? '_' + Object.entries(cleanFilters).map(([k, v]) => `${k}-${v}`).join('_')
           : '';
-        downloadAsJSON(result.questions, `preguntas${filterLabel}`);
+        downloadExport(result.blob, `preguntas${filterLabel}`, format);
         setExportResult({ ...result, downloaded: true });
       } else {
         setExportResult(result);
@@ -90,10 +100,17 @@ export default function QuestionExporter() {
     } catch (error) {
       setExportResult({ error: error.message });
     } finally {
+      abortRef.current = null;
+      setProgress(null);
       setIsExporting(false);
     }
   };
 
+  // Cancel a running export
+  const handleCancel = () => {
+    abortRef.current?.abort();
+  };
+
   // Clear filters
   const clearFilters = () => {
     setFilters({
@@ -122,7 +139,7 @@ export default function QuestionExporter() {
             Exportar Preguntas
           </h2>
           <p className="text-emerald-100 text-sm mt-1">
-            Descarga preguntas de Supabase en formato JSON
+            Descarga preguntas de Supabase en formato JSON o NDJSON
           </p>
         </div>
 
@@ -268,6 +285,16 @@ export default function QuestionExporter() {
               Vista previa
             </button>
 
+            <select
+              value={format}
+              onChange={(e) => setFormat(e.target.value)}
+              disabled={isExporting}
+              className="px-3 py-3 border border-gray-200 rounded-xl text-sm focus:border-emerald-500 focus:outline-none"
+            >
+              <option value="json">JSON</option>
+              <option value="ndjson">NDJSON</option>
+            </select>
+
             <button
               onClick={handleExport}
               disabled={isExporting}
@@ -278,19 +305,47 @@ export default function QuestionExporter() {
               ) : (
                 <FileJson className="w-5 h-5" />
               )}
-              Exportar a JSON
+              Exportar a {format === 'ndjson' ? 'NDJSON' : 'JSON'}
             </button>
           </div>
 
+          {/* Export Progress */}
+          {progress && (
+            <div className="bg-gray-50 rounded-xl p-4">
+              <div className="flex items-center justify-between mb-2">
+                <p className="text-sm text-gray-600">
+                  {progress.exported} {progress.estimatedTotal ? `de ~${progress.estimatedTotal}` : ''} preguntas exportadas
+                </p>
+                <button
+                  onClick={handleCancel}
+                  className="flex items-center gap-1 text-xs text-red-600 hover:text-red-700 hover:underline"
+                >
+                  <X className="w-3 h-3" />
+                  Cancelar
+                </button>
+              </div>
+              <div className="h-2 bg-gray-200 rounded-full overflow-hidden">
+                <div
+                  className="h-full bg-emerald-500 transition-all"
+                  style={{
+                    width: progress.estimatedTotal
+                      ? `${Math.min(100, Math.round((progress.exported / progress.estimatedTotal) * 100))}%`
+                      : '0%'
+                  }}
+                />
+              </div>
+            </div>
+          )}
+
           {/* Export Result */}
           {exportResult && (
-            <div className={`p-4 rounded-xl ${exportResult.error ? 'bg-red-50 border border-red-200' : 'bg-emerald-50 border border-emerald-200'}`}>
+            <div className={`p-4 rounded-xl ${exportResult.cancelled ? 'bg-gray-50 border border-gray-200' : exportResult.error ? 'bg-red-50 border border-red-200' : 'bg-emerald-50 border border-emerald-200'}`}>
               {exportResult.error ? (
-                <p className="text-red-700">{exportResult.error}</p>
+                <p className={exportResult.cancelled ? 'text-gray-700' : 'text-red-700'}>{exportResult.error}</p>
               ) : (
                 <div>
                   <p className="font-semibold text-emerald-800">
-                    {exportResult.downloaded ? '✓ Archivo descargado' : `${exportResult.count} preguntas encontradas`}
+                    {exportResult.downloaded ? `✓ Archivo descargado (${exportResult.count} preguntas)` : `${exportResult.count} preguntas encontradas`}
                   </p>
                   {exportResult.count === 0 && (
                     <p className="text-sm text-gray-600 mt-1">
@@ -9,6 +9,7 @@ export default function QuestionImporter({ onImportComplete }) {
   const [importResult, setImportResult] = useState(null);
   const [isValidating, setIsValidating] = useState(false);
   const [isImporting, setIsImporting] = useState(false);
+  const [importProgress, setImportProgress] = useState(null);
   const [showPreview, setShowPreview] = useState(false);
   const fileInputRef = useRef(null);
 
@@ -47,11 +48,13 @@ export default function QuestionImporter({ onImportComplete }) {
 
     setIsImporting(true);
     setImportResult(null);
+    setImportProgress(null);
 
     try {
       const result = await importQuestions(validationResult.data.questions, {
         skipDuplicates: true,
-        validateBeforeImport: false // Already validated
+        validateBeforeImport: false, // Already validated
+        onProgress: (imported, total, info) => setImportProgress({ imported, total, ...info })
       });
       setImportResult(result);
 
@@ -67,6 +70,7 @@ export default function QuestionImporter({ onImportComplete }) {
       });
     } finally {
       setIsImporting(false);
+      setImportProgress(null);
     }
   };
 
@@ -208,6 +212,15 @@ export default function QuestionImporter({ onImportComplete }) {
             </button>
           </div>
 
+          {/* Import Progress */}
+          {isImporting && importProgress && (
+            <p className="text-sm text-gray-600">
+              {importProgress.phase === 'indexing'
+                ? `Buscando duplicados: ${importProgress.processed} preguntas del banco indexadas...`
+                : `Procesadas ${importProgress.processed} de ${importProgress.total} (${importProgress.imported} importadas)`}
+            </p>
+          )}
+
           {/* Validation Result */}
           {validationResult && (
             <div className={`p-4 rounded-xl ${validationResult.valid ? 'bg-green-50 border border-green-200' : 'bg-red-50 border border-red-200'}`}>
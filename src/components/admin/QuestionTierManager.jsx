@@ -1,11 +1,9 @@
-import React, { useState, useEffect, useCallback } from 'react';
+import React, { useState, useEffect, useCallback, useRef } from 'react';
 import {
   Crown,
   Gift,
   RefreshCw,
   Search,
-  ChevronLeft,
-  ChevronRight,
   Loader2,
   Check,
   AlertTriangle,
@@ -17,27 +15,42 @@ import {
   updateQuestionTier,
   rotateFreeTier
 } from '../../services/questionsService';
+import { useVirtualRows } from '../../hooks/useVirtualRows';
+
+const PAGE_SIZE = 50;
+const ROW_HEIGHT = 64; // px, every row is clamped to this height
 
 export default function QuestionTierManager() {
   const [stats, setStats] = useState(null);
   const [questions, setQuestions] = useState([]);
   const [totalCount, setTotalCount] = useState(0);
+  const [nextCursor, setNextCursor] = useState(null);
   const [isLoading, setIsLoading] = useState(true);
+  const [isLoadingMore, setIsLoadingMore] = useState(false);
   const [isRotating, setIsRotating] = useState(false);
   const [rotateResult, setRotateResult] = useState(null);
 
-  // Filters and pagination
+  // Filters (pages are keyset cursors, see getQuestionsAdmin)
   const [filters, setFilters] = useState({
     tier: '',
     tema: '',
-    search: '',
-    page: 1,
-    perPage: 20
+    search: ''
   });
 
   // Selected questions for bulk actions
   const [selected, setSelected] = useState(new Set());
 
+  // Scroll container for row virtualization
+  const scrollRef = useRef(null);
+  // Bumped on every reload so a page from old filters is dropped
+  const requestRef = useRef(0);
+
+  const { start, end, paddingTop, paddingBottom, nearEnd } = useVirtualRows({
+    containerRef: scrollRef,
+    count: questions.length,
+    rowHeight: ROW_HEIGHT
+  });
+
   // Load stats
   const loadStats = useCallback(async () => {
     try {
@@ -48,30 +61,61 @@ export default function QuestionTierManager() {
     }
   }, []);
 
-  // Load questions
+  const queryOptions = useCallback((cursor) => ({
+    perPage: PAGE_SIZE,
+    cursor,
+    tier: filters.tier || null,
+    tema: filters.tema ? parseInt(filters.tema) : null,
+    search: filters.search || null
+  }), [filters]);
+
+  // Load first page
   const loadQuestions = useCallback(async () => {
+    const requestId = ++requestRef.current;
     setIsLoading(true);
     try {
-      const { data, count, error } = await getQuestionsAdmin({
-        page: filters.page,
-        perPage: filters.perPage,
-        tier: filters.tier || null,
-        tema: filters.tema ? parseInt(filters.tema) : null,
-        search: filters.search || null
-      });
+      const { data, count, nextCursor: cursor, error } = await getQuestionsAdmin(queryOptions(null));
+      if (requestId !== requestRef.current) return;
 
       if (error) {
         console.error('Error loading questions:', error);
       } else {
         setQuestions(data || []);
         setTotalCount(count || 0);
+        setNextCursor(cursor);
+        if (scrollRef.current) scrollRef.current.scrollTop = 0;
       }
     } catch (err) {
       console.error('Error loading questions:', err);
     } finally {
-      setIsLoading(false);
+      if (requestId === requestRef.current) setIsLoading(false);
     }
-  }, [filters]);
+  }, [queryOptions]);
+
+  // Append the next page
+  const loadMore = useCallback(async () => {
+    if (!nextCursor || isLoadingMore) return;
+    const requestId = requestRef.current;
+    setIsLoadingMore(true);
+    try {
+      const { data, nextCursor: cursor, error } = await getQuestionsAdmin(queryOptions(nextCursor));
+      if (requestId !== requestRef.current) return;
+
+      if (error) {
+        // Stop infinite scroll from retrying in a loop
+        console.error('Error loading questions:', error);
+        setNextCursor(null);
+      } else {
+        setQuestions(prev => [...prev, ...(data || [])]);
+        setNextCursor(cursor);
+      }
+    } catch (err) {
+      console.error('Error loading questions:', err);
+      setNextCursor(null);
+    } finally {
+      setIsLoadingMore(false);
+    }
+  }, [nextCursor, isLoadingMore, queryOptions]);
 
   // Initial load
   useEffect(() => {
@@ -82,6 +126,11 @@ export default function QuestionTierManager() {
     loadQuestions();
   }, [loadQuestions]);
 
+  // Infinite scroll: fetch the next page when the last rows are visible
+  useEffect(() => {
+    if (nearEnd && nextCursor && !isLoading) loadMore();
+  }, [nearEnd, nextCursor, isLoading, loadMore]);
+
   // Handle tier change for single question
   const handleTierChange = async (questionId, newTier) => {
     const success = await updateQuestionTier(questionId, newTier);
@@ -135,8 +184,8 @@ export default function QuestionTierManager() {
     }
   };
 
-  // Pagination
-  const totalPages = Math.ceil(totalCount / filters.perPage);
+  // Estimated count can lag behind what is already loaded
+  const shownTotal = Math.max(totalCount, questions.length);
 
   // Available temas from stats
   const availableTemas = stats?.byTema ? Object.keys(stats.byTema).sort((a, b) => Number(a) - Number(b)) : [];
@@ -240,14 +289,14 @@ export default function QuestionTierManager() {
                 type="text"
                 placeholder="Buscar pregunta..."
                 value={filters.search}
-                onChange={(e) => setFilters(prev => ({ ...prev, search: e.target.value, page: 1 }))}
+                onChange={(e) => setFilters(prev => ({ ...prev, search: e.target.value }))}
                 className="w-full pl-10 pr-4 py-2 border border-gray-200 rounded-lg text-sm focus:border-orange-500 focus:outline-none"
               />
             </div>
 
             <select
               value={filters.tier}
-              onChange={(e) => setFilters(prev => ({ ...prev, tier: e.target.value, page: 1 }))}
+              onChange={(e) => setFilters(prev => ({ ...prev, tier: e.target.value }))}
               className="px-3 py-2 border border-gray-200 rounded-lg text-sm focus:border-orange-500 focus:outline-none"
             >
               <option value="">Todos los tiers</option>
@@ -257,7 +306,7 @@ export default function QuestionTierManager() {
 
             <select
               value={filters.tema}
-              onChange={(e) => setFilters(prev => ({ ...prev, tema: e.target.value, page: 1 }))}
+              onChange={(e) => setFilters(prev => ({ ...prev, tema: e.target.value }))}
               className="px-3 py-2 border border-gray-200 rounded-lg text-sm focus:border-orange-500 focus:outline-none"
             >
               <option value="">Todos los temas</option>
@@ -268,7 +317,7 @@ export default function QuestionTierManager() {
 
             <button
               onClick={() => {
-                setFilters({ tier: '', tema: '', search: '', page: 1, perPage: 20 });
+                setFilters({ tier: '', tema: '', search: '' });
                 setSelected(new Set());
               }}
               className="px-3 py-2 text-gray-500 hover:text-gray-700 text-sm"
@@ -277,11 +326,11 @@ export default function QuestionTierManager() {
             </button>
           </div>
 
-          {/* Questions Table */}
+          {/* Questions Table (virtualized: only visible rows are rendered) */}
           <div className="border rounded-xl overflow-hidden">
-            <div className="overflow-x-auto">
+            <div ref={scrollRef} className="overflow-auto max-h-[640px]">
               <table className="w-full">
-                <thead className="bg-gray-50 border-b">
+                <thead className="bg-gray-50 border-b sticky top-0 z-10">
                   <tr>
                     <th className="px-4 py-3 text-left">
                       <input
@@ -319,87 +368,86 @@ export default function QuestionTierManager() {
                       </td>
                     </tr>
                   ) : (
-                    questions.map((q) => (
-                      <tr key={q.id} className="hover:bg-gray-50">
-                        <td className="px-4 py-3">
-                          <input
-                            type="checkbox"
-                            checked={selected.has(q.id)}
-                            onChange={() => toggleSelect(q.id)}
-                            className="rounded"
-                          />
-                        </td>
-                        <td className="px-4 py-3">
-                          <p className="text-sm text-gray-800 line-clamp-2">
-                            {q.question_text}
-                          </p>
-                        </td>
-                        <td className="px-4 py-3 text-center">
-                          <span className="text-xs px-2 py-1 bg-green-100 text-green-800 rounded">
-                            {q.tema}
-                          </span>
-                        </td>
-                        <td className="px-4 py-3 text-center">
-                          <span className="text-sm text-gray-600">
-                            {q.times_shown || 0}
-                          </span>
-                        </td>
-                        <td className="px-4 py-3">
-                          <div className="flex justify-center gap-1">
-                            <button
-                              onClick={() => handleTierChange(q.id, 'free')}
-                              className={`px-3 py-1 rounded text-xs font-medium transition ${
-                                q.tier === 'free'
-                                  ? 'bg-green-500 text-white'
-                                  : 'bg-gray-100 text-gray-600 hover:bg-green-100 hover:text-green-700'
-                              }`}
-                            >
-                              Free
-                            </button>
-                            <button
-                              onClick={() => handleTierChange(q.id, 'premium')}
-                              className={`px-3 py-1 rounded text-xs font-medium transition ${
-                                q.tier === 'premium'
-                                  ? 'bg-amber-500 text-white'
-                                  : 'bg-gray-100 text-gray-600 hover:bg-amber-100 hover:text-amber-700'
-                              }`}
-                            >
-                              Premium
-                            </button>
-                          </div>
-                        </td>
-                      </tr>
-                    ))
+                    <>
+                      {paddingTop > 0 && (
+                        <tr aria-hidden="true" style={{ height: paddingTop }}><td colSpan="5" /></tr>
+                      )}
+                      {questions.slice(start, end).map((q) => (
+                        <tr key={q.id} className="hover:bg-gray-50" style={{ height: ROW_HEIGHT }}>
+                          <td className="px-4 py-2">
+                            <input
+                              type="checkbox"
+                              checked={selected.has(q.id)}
+                              onChange={() => toggleSelect(q.id)}
+                              className="rounded"
+                            />
+                          </td>
+                          <td className="px-4 py-2">
+                            <p className="text-sm text-gray-800 line-clamp-2">
+                              {q.question_text}
+                            </p>
+                          </td>
+                          <td className="px-4 py-2 text-center">
+                            <span className="text-xs px-2 py-1 bg-green-100 text-green-800 rounded">
+                              {q.tema}
+                            </span>
+                          </td>
+                          <td className="px-4 py-2 text-center">
+                            <span className="text-sm text-gray-600">
+                              {q.times_shown || 0}
+                            </span>
+                          </td>
+                          <td className="px-4 py-2">
+                            <div className="flex justify-center gap-1">
+                              <button
+                                onClick={() => handleTierChange(q.id, 'free')}
+                                className={`px-3 py-1 rounded text-xs font-medium transition ${
+                                  q.tier === 'free'
+                                    ? 'bg-green-500 text-white'
+                                    : 'bg-gray-100 text-gray-600 hover:bg-green-100 hover:text-green-700'
+                                }`}
+                              >
+                                Free
+                              </button>
+                              <button
+                                onClick={() => handleTierChange(q.id, 'premium')}
+                                className={`px-3 py-1 rounded text-xs font-medium transition ${
+                                  q.tier === 'premium'
+                                    ? 'bg-amber-500 text-white'
+                                    : 'bg-gray-100 text-gray-600 hover:bg-amber-100 hover:text-amber-700'
+                                }`}
+                              >
+                                Premium
+                              </button>
+                            </div>
+                          </td>
+                        </tr>
+                      ))}
+                      {paddingBottom > 0 && (
+                        <tr aria-hidden="true" style={{ height: paddingBottom }}><td colSpan="5" /></tr>
+                      )}
+                    </>
                   )}
                 </tbody>
               </table>
             </div>
 
-            {/* Pagination */}
-            {totalPages > 1 && (
+            {/* Footer */}
+            {!isLoading && questions.length > 0 && (
               <div className="bg-gray-50 px-4 py-3 border-t flex items-center justify-between">
                 <p className="text-sm text-gray-600">
-                  Mostrando {((filters.page - 1) * filters.perPage) + 1} - {Math.min(filters.page * filters.perPage, totalCount)} de {totalCount}
+                  Mostrando {questions.length} de {nextCursor ? `~${shownTotal}` : questions.length}
                 </p>
-                <div className="flex gap-2">
+                {nextCursor && (
                   <button
-                    onClick={() => setFilters(prev => ({ ...prev, page: prev.page - 1 }))}
-                    disabled={filters.page === 1}
-                    className="p-2 rounded-lg border hover:bg-gray-100 disabled:opacity-50 disabled:cursor-not-allowed"
+                    onClick={loadMore}
+                    disabled={isLoadingMore}
+                    className="flex items-center gap-2 px-3 py-2 rounded-lg border text-sm text-gray-600 hover:bg-gray-100 disabled:opacity-50 disabled:cursor-not-allowed"
                   >
-                    <ChevronLeft className="w-4 h-4" />
+                    {isLoadingMore && <Loader2 className="w-4 h-4 animate-spin" />}
+                    Cargar más
                   </button>
-                  <span className="px-3 py-2 text-sm text-gray-600">
-                    {filters.page} / {totalPages}
-                  </span>
-                  <button
-                    onClick={() => setFilters(prev => ({ ...prev, page: prev.page + 1 }))}
-                    disabled={filters.page === totalPages}
-                    className="p-2 rounded-lg border hover:bg-gray-100 disabled:opacity-50 disabled:cursor-not-allowed"
-                  >
-                    <ChevronRight className="w-4 h-4" />
-                  </button>
-                </div>
+                )}
               </div>
             )}
           </div>
@@ -13,7 +13,7 @@ import {
   RefreshCw, Clock, BookOpen
 } from 'lucide-react';
 import { useAuth } from '../../contexts/AuthContext';
-import { generateHybridSession, updateProgress, recordDailyStudy, recordTestSession } from '../../services/spacedRepetitionService';
+import { generateHybridSession, queueProgressUpdate, recordDailyStudy, recordTestSession } from '../../services/spacedRepetitionService';
 import EmptyState from '../common/EmptyState/EmptyState';
 
 // Spring animation configs
@@ -135,9 +135,9 @@ export default function FlashcardSession({ config = {}, onClose, onComplete }) {
       setResults(prev => ({ ...prev, review: [...prev.review, currentCard] }));
     }
 
-    // Update progress in database
+    // Queue progress update (flushed in bulk, at the latest by recordTestSession)
     try {
-      await updateProgress(user.id, currentCard.id, wasCorrect);
+      await queueProgressUpdate(user.id, currentCard.id, wasCorrect);
     } catch (err) {
       console.error('Error updating progress:', err);
     }
@@ -12,6 +12,7 @@ import SessionHeader from './SessionHeader';
 import EditorialSessionHeader from './EditorialSessionHeader';
 import QuestionCardLegacy from './QuestionCard';
 import EditorialQuestionCard from './EditorialQuestionCard';
+import { startSpan } from '../../lib/perfTelemetry';
 
 // Editorial redesign feature flag (shared with Home).
 // Set localStorage 'home-design' = 'legacy' to see the previous UI.
@@ -63,11 +64,31 @@ export default function HybridSession({ config = {}, onClose, onComplete, onNext
   const MAX_RETRIES = 3;
   const LOADING_TIMEOUT_MS = 15000;
 
+  // UX timings: mount/retry -> first card, answer tap -> next card painted
+  const sessionSpanRef = useRef(null);
+  const answerSpanRef = useRef(null);
+
   // Load session on mount
   useEffect(() => {
+    sessionSpanRef.current = startSpan('ux.session_start', { kind: 'ux', sampleRate: 1 });
     loadSession(config);
   }, []);
 
+  useEffect(() => {
+    if (isLoading || !currentQuestion || !sessionSpanRef.current) return;
+    sessionSpanRef.current();
+    sessionSpanRef.current = null;
+  }, [isLoading, currentQuestion]);
+
+  useEffect(() => {
+    const end = answerSpanRef.current;
+    if (!end) return;
+    answerSpanRef.current = null;
+    // Next frame: the new card has been committed and painted
+    const frame = requestAnimationFrame(() => end());
+    return () => cancelAnimationFrame(frame);
+  }, [currentIndex]);
+
   // Loading timeout
   useEffect(() => {
     if (!isLoading) return;
@@ -84,6 +105,7 @@ export default function HybridSession({ config = {}, onClose, onComplete, onNext
     answersHistoryRef.current = [];
     setTriggeredInsights([]);
     setInsightsProcessed(false);
+    sessionSpanRef.current = startSpan('ux.session_start', { kind: 'ux', sampleRate: 1 });
     loadSession(config);
   };
 
@@ -116,6 +138,7 @@ export default function HybridSession({ config = {}, onClose, onComplete, onNext
     });
 
     // Record the answer and advance
+    answerSpanRef.current = startSpan('ux.answer_to_next_card', { kind: 'ux' });
     answerQuestion(isCorrect);
     // selectedAnswer will be cleared by QuestionCard auto-advance via onNext
   };
@@ -13,7 +13,7 @@ import {
   Flag, ListOrdered, BarChart3, RefreshCw, BookOpen
 } from 'lucide-react';
 import { useAuth } from '../../contexts/AuthContext';
-import { generateHybridSession, updateProgress, recordDailyStudy, recordTestSession } from '../../services/spacedRepetitionService';
+import { generateHybridSession, queueProgressUpdate, recordDailyStudy, recordTestSession } from '../../services/spacedRepetitionService';
 import EmptyState from '../common/EmptyState/EmptyState';
 import ExamTimer from './ExamTimer';
 import SessionSummary from './SessionSummary';
@@ -333,14 +333,15 @@ export default function SimulacroSession({ config = {}, onClose, onComplete }) {
 
     if (!user?.id) return;
 
-    // Save progress for each answered question
+    // Queue progress for each answered question; recordTestSession flushes
+    // them in one bulk upsert before writing the session row
     try {
       for (const [questionId, answer] of Object.entries(answers)) {
         const question = questions.find(q => q.id === questionId);
         if (question) {
           const correctAns = getCorrectAnswer(question);
           const wasCorrect = answer === correctAns;
-          await updateProgress(user.id, questionId, wasCorrect);
+          await queueProgressUpdate(user.id, questionId, wasCorrect);
         }
       }
 
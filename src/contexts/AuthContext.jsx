@@ -1,5 +1,7 @@
 import React, { createContext, useContext, useState, useEffect, useRef } from 'react';
 import { supabase } from '../lib/supabase';
+import { clearQueryCache } from '../lib/queryCache';
+import { flushProgressOutbox } from '../lib/progressOutbox';
 
 const AuthContext = createContext({});
 
@@ -86,9 +88,16 @@ export function AuthProvider({ children }) {
           setUserRole(null);
         }
 
+        // Cached reads are per-user; never show them to the next account
+        if (event === 'SIGNED_OUT') {
+          clearQueryCache();
+        }
+
         // Create profile when user signs up (background, don't block)
         if (event === 'SIGNED_IN' && session?.user) {
           ensureUserProfile(session.user).catch(console.error);
+          // Write answers this user left queued in an earlier session
+          flushProgressOutbox();
         }
       }
     );
@@ -233,6 +242,10 @@ export function AuthProvider({ children }) {
     setLoading(true);
 
     try {
+      // Write queued answers while the session is still valid; on failure
+      // they stay in the outbox until this user signs in again
+      await flushProgressOutbox();
+
       const { error } = await supabase.auth.signOut();
       if (error) throw error;
 
@@ -1,13 +1,56 @@
 /**
  * Activity Data Hook
- * Fetches and processes activity data for the Activity tab
- * Uses test_sessions table from Supabase
+ * Fetches activity data for the Activity tab
+ * Figures come precomputed from get_activity_dashboard (daily activity
+ * rollup); session history is paginated with get_session_history_page
  */
 
-import { useState, useCallback, useMemo } from 'react';
+import { useState, useCallback, useMemo, useRef } from 'react';
 import { supabase } from '../lib/supabase';
+import { cachedFrom, cachedQuery, cachedRpc, queryKey } from '../lib/queryCache';
 import { useAuth } from './useAuth';
 
+const SESSIONS_TTL_MS = 60_000; // 1 minute
+const DASHBOARD_TTL_MS = 60_000; // 1 minute
+const DASHBOARD_RANGE_DAYS = 30;
+const HISTORY_PAGE_SIZE = 10;
+const TOTALS_TTL_MS = 10 * 60 * 1000; // 10 minutes
+const TOPIC_PROGRESS_TTL_MS = 2 * 60 * 1000; // 2 minutes
+
+const SESSION_COLUMNS = 'id, user_id, topic_id, correct_count, total_questions, started_at, completed_at, time_seconds, percentage, test_type';
+
+/**
+ * Normalize a test_sessions row for component compatibility
+ */
+function normalizeSession(s) {
+  return {
+    ...s,
+    // Normalized names for component compatibility
+    correctas: s.correct_count,
+    correct_answers: s.correct_count,
+    total_preguntas: s.total_questions,
+    created_at: s.completed_at || s.started_at,
+    tema: s.topic_id != null ? `Tema ${s.topic_id}` : 'General',
+    tema_filter: s.topic_id != null ? [s.topic_id] : [],
+    porcentaje_acierto: s.total_questions > 0
+      ? Math.round((s.correct_count / s.total_questions) * 100)
+      : (s.percentage || 0)
+  };
+}
+
+/**
+ * Fetch one page of completed sessions, newest first (keyset on started_at, id)
+ * @param {Object|null} after - Last row of the previous page
+ * @returns {Promise<Object>} { data, error }
+ */
+function fetchSessionPage(after, limit = HISTORY_PAGE_SIZE) {
+  return supabase.rpc('get_session_history_page', {
+    p_limit: limit,
+    p_before_started_at: after?.started_at ?? null,
+    p_before_id: after?.id ?? null
+  });
+}
+
 /**
  * Hook for fetching activity data from Supabase
  * @returns {Object} Activity data and fetch functions
@@ -38,6 +81,10 @@ export function useActivityData() {
   const [weeklyImprovement, setWeeklyImprovement] = useState(0);
   const [leastPracticedTema, setLeastPracticedTema] = useState(null);
   const [simulacroAvg, setSimulacroAvg] = useState(0);
+  const [activityDays, setActivityDays] = useState([]); // [{ date, sessions, questions, correct }]
+  const [hasMoreSessions, setHasMoreSessions] = useState(false);
+  const [loadingMoreSessions, setLoadingMoreSessions] = useState(false);
+  const lastSessionRef = useRef(null);
 
   // FSRS states breakdown
   const [fsrsStats, setFsrsStats] = useState({
@@ -77,15 +124,20 @@ export function useActivityData() {
 
     try {
       // Total active questions (public aggregate RPC, no question content)
-      const { data: totalQuestionsData } = await supabase
-        .rpc('get_active_questions_total');
+      const { data: totalQuestionsData } = await cachedRpc(
+        'get_active_questions_total',
+        undefined,
+        { ttl: TOTALS_TTL_MS, tables: ['questions'] }
+      );
       const totalQuestions = Number(totalQuestionsData) || 0;
 
-      // Get per-topic progress from user_topic_progress
-      const { data: topicData } = await supabase
-        .from('user_topic_progress')
-        .select('questions_seen, questions_correct, overall_accuracy_percent')
-        .eq('user_id', user.id);
+      // Get per-topic progress from user_topic_progress (same cache entry as useTopics)
+      const { data: topicData } = await cachedFrom(
+        'user_topic_progress',
+        { select: '*', user_id: user.id },
+        (query) => query.select('*').eq('user_id', user.id),
+        { ttl: TOPIC_PROGRESS_TTL_MS }
+      );
 
       const topics = topicData || [];
       const totalSeen = topics.reduce((sum, t) => sum + (t.questions_seen || 0), 0);
@@ -113,241 +165,305 @@ export function useActivityData() {
   }, [user]);
 
   /**
-   * Fetch all activity data from test_sessions table
+   * Derive every activity metric from the user's completed sessions
+   * (fallback when get_activity_dashboard is unavailable)
    */
-  const fetchActivityData = useCallback(async () => {
-    if (!user?.id) {
-      return;
+  const processSessions = useCallback((allSessions) => {
+    const weekStart = getWeekStart();
+    const monthStart = getMonthStart();
+
+    // Process weekly data (correct answers per day)
+    const weeklyCorrect = [0, 0, 0, 0, 0, 0, 0]; // L, M, X, J, V, S, D
+    const thisWeekSessions = allSessions.filter(s => {
+      const sessionDate = new Date(s.started_at);
+      return sessionDate >= weekStart;
+    });
+
+    thisWeekSessions.forEach(session => {
+      const sessionDate = new Date(session.started_at);
+      let dayIndex = sessionDate.getDay() - 1; // Monday = 0
+      if (dayIndex === -1) dayIndex = 6; // Sunday = 6
+      weeklyCorrect[dayIndex] += session.correct_count || 0;
+    });
+
+    setWeeklyData(weeklyCorrect);
+
+    // Session history (last 10; no paging without get_session_history_page)
+    setSessionHistory(allSessions.slice(0, HISTORY_PAGE_SIZE).map(normalizeSession));
+    lastSessionRef.current = null;
+    setHasMoreSessions(false);
+
+    // Calendar data (days practiced this month)
+    const monthDays = new Set();
+    allSessions.forEach(session => {
+      const sessionDate = new Date(session.started_at);
+      if (sessionDate >= monthStart) {
+        monthDays.add(sessionDate.getDate());
+      }
+    });
+    setCalendarData(Array.from(monthDays));
+
+    // Calculate total stats
+    const totalTests = allSessions.length;
+    const totalCorrect = allSessions.reduce((sum, s) => sum + (s.correct_count || 0), 0);
+    const totalQuestions = allSessions.reduce((sum, s) => sum + (s.total_questions || 0), 0);
+    const avgAccuracy = totalQuestions > 0
+      ? Math.round((totalCorrect / totalQuestions) * 100)
+      : 0;
+
+    // Calculate days studied (unique days with sessions)
+    const studyDays = new Set();
+    allSessions.forEach(session => {
+      const d = new Date(session.started_at);
+      studyDays.add(`${d.getFullYear()}-${d.getMonth()}-${d.getDate()}`);
+    });
+
+    setTotalStats({
+      testsCompleted: totalTests,
+      questionsCorrect: totalCorrect,
+      totalQuestions: totalQuestions,
+      accuracyRate: avgAccuracy,
+      daysStudied: studyDays.size
+    });
+
+    // Calculate today's stats
+    const todayStart = new Date();
+    todayStart.setHours(0, 0, 0, 0);
+    const todaySessions = allSessions.filter(s => new Date(s.started_at) >= todayStart);
+    const todayCorrect = todaySessions.reduce((sum, s) => sum + (s.correct_count || 0), 0);
+    const todayTotal = todaySessions.reduce((sum, s) => sum + (s.total_questions || 0), 0);
+    setTodayStats({
+      questionsAnswered: todayTotal,
+      questionsCorrect: todayCorrect,
+      testsCompleted: todaySessions.length,
+      accuracyRate: todayTotal > 0 ? Math.round((todayCorrect / todayTotal) * 100) : 0
+    });
+
+    // Calculate streak (consecutive days)
+    const sortedDays = Array.from(studyDays)
+      .map(d => {
+        const [y, m, day] = d.split('-').map(Number);
+        return new Date(y, m, day);
+      })
+      .sort((a, b) => b - a); // Most recent first
+
+    let currentStreak = 0;
+    let longestStreak = 0;
+    const today = new Date();
+    today.setHours(0, 0, 0, 0);
+    const yesterday = new Date(today);
+    yesterday.setDate(yesterday.getDate() - 1);
+
+    // Calculate longest streak from all study days
+    if (sortedDays.length > 0) {
+      // Sort ascending for longest streak calculation
+      const ascending = [...sortedDays].sort((a, b) => a - b);
+      let tempStreak = 1;
+      for (let i = 1; i < ascending.length; i++) {
+        const prev = new Date(ascending[i - 1]);
+        const curr = new Date(ascending[i]);
+        prev.setHours(0, 0, 0, 0);
+        curr.setHours(0, 0, 0, 0);
+        const diffDays = Math.round((curr - prev) / (1000 * 60 * 60 * 24));
+        if (diffDays === 1) {
+          tempStreak++;
+        } else if (diffDays > 1) {
+          longestStreak = Math.max(longestStreak, tempStreak);
+          tempStreak = 1;
+        }
+      }
+      longestStreak = Math.max(longestStreak, tempStreak);
+
+      // Calculate current streak (must include today or yesterday)
+      const lastStudyDay = new Date(sortedDays[0]);
+      lastStudyDay.setHours(0, 0, 0, 0);
+
+      if (lastStudyDay.getTime() === today.getTime() ||
+          lastStudyDay.getTime() === yesterday.getTime()) {
+        currentStreak = 1;
+        let checkDate = new Date(lastStudyDay);
+
+        for (let i = 1; i < sortedDays.length; i++) {
+          checkDate.setDate(checkDate.getDate() - 1);
+          const prevDay = new Date(sortedDays[i]);
+          prevDay.setHours(0, 0, 0, 0);
+
+          if (prevDay.getTime() === checkDate.getTime()) {
+            currentStreak++;
+          } else {
+            break;
+          }
+        }
+      }
+    }
+    setStreak({ current: currentStreak, longest: longestStreak });
+
+    // Calculate weekly improvement (compare this week vs last week)
+    const lastWeekStart = new Date(weekStart);
+    lastWeekStart.setDate(lastWeekStart.getDate() - 7);
+
+    const lastWeekSessions = allSessions.filter(s => {
+      const d = new Date(s.started_at);
+      return d >= lastWeekStart && d < weekStart;
+    });
+
+    // Calculate accuracy for this week
+    const thisWeekCorrect = thisWeekSessions.reduce((sum, s) => sum + (s.correct_count || 0), 0);
+    const thisWeekTotal = thisWeekSessions.reduce((sum, s) => sum + (s.total_questions || 0), 0);
+    const thisWeekAvg = thisWeekTotal > 0 ? (thisWeekCorrect / thisWeekTotal) * 100 : 0;
+
+    // Calculate accuracy for last week
+    const lastWeekCorrect = lastWeekSessions.reduce((sum, s) => sum + (s.correct_count || 0), 0);
+    const lastWeekTotal = lastWeekSessions.reduce((sum, s) => sum + (s.total_questions || 0), 0);
+    const lastWeekAvg = lastWeekTotal > 0 ? (lastWeekCorrect / lastWeekTotal) * 100 : 0;
+
+    const improvement = lastWeekAvg > 0
+      ? Math.round(thisWeekAvg - lastWeekAvg)
+      : 0;
+    setWeeklyImprovement(improvement);
+
+    // Find least practiced tema
+    const temaLastPracticed = {};
+    allSessions.forEach(session => {
+      const topicId = session.topic_id; // INTEGER (single topic, not array)
+      if (topicId != null) {
+        const existing = temaLastPracticed[topicId];
+        const sessionDate = new Date(session.started_at);
+        if (!existing || sessionDate > existing) {
+          temaLastPracticed[topicId] = sessionDate;
+        }
+      }
+    });
+
+    // Find tema with oldest last practice date
+    let oldestTema = null;
+    let oldestDate = null;
+    Object.entries(temaLastPracticed).forEach(([tema, date]) => {
+      if (!oldestDate || date < oldestDate) {
+        oldestDate = date;
+        oldestTema = parseInt(tema);
+      }
+    });
+
+    // Only suggest if not practiced in last 7 days
+    if (oldestDate) {
+      const daysSince = Math.floor((new Date() - oldestDate) / (1000 * 60 * 60 * 24));
+      if (daysSince >= 7) {
+        setLeastPracticedTema({ tema: oldestTema, daysSince });
+      } else {
+        setLeastPracticedTema(null);
+      }
     }
 
-    setLoading(true);
-    setError(null);
+    // Compute simulacro average score (test_type='simulacro' or >=80 questions as fallback)
+    const simulacroSessions = allSessions.filter(
+      s => s.test_type === 'simulacro' || s.total_questions >= 80
+    );
+    const avgSimulacro = simulacroSessions.length > 0
+      ? Math.round(simulacroSessions.reduce((sum, s) => sum + (s.percentage || 0), 0) / simulacroSessions.length)
+      : 0;
+    setSimulacroAvg(avgSimulacro);
+  }, []);
 
-    try {
-      const weekStart = getWeekStart();
-      const monthStart = getMonthStart();
-
-      // Fetch all sessions for this user from test_sessions table
-      // ACTUAL columns: topic_id, correct_count, total_questions, time_seconds, percentage, status
-      const { data: sessions, error: sessionsError } = await supabase
-        .from('test_sessions')
-        .select('id, user_id, topic_id, correct_count, total_questions, started_at, completed_at, time_seconds, percentage, test_type')
+  /**
+   * Apply the precomputed figures from get_activity_dashboard
+   */
+  const applyDashboard = useCallback((dashboard) => {
+    if (!dashboard) return;
+    setWeeklyData(dashboard.weekly || [0, 0, 0, 0, 0, 0, 0]);
+    setCalendarData(dashboard.calendar || []);
+    setTotalStats(dashboard.totals);
+    setTodayStats(dashboard.today);
+    setStreak(dashboard.streak);
+    setWeeklyImprovement(dashboard.weeklyImprovement || 0);
+    setLeastPracticedTema(dashboard.leastPracticedTema || null);
+    setSimulacroAvg(dashboard.simulacroAvg || 0);
+    setActivityDays(dashboard.days || []);
+  }, []);
+
+  /**
+   * Apply the first page of session history
+   */
+  const applyFirstPage = useCallback((rows) => {
+    const page = rows || [];
+    setSessionHistory(page.map(normalizeSession));
+    lastSessionRef.current = page[page.length - 1] || null;
+    setHasMoreSessions(page.length === HISTORY_PAGE_SIZE);
+  }, []);
+
+  /**
+   * Legacy path: every completed session, processed on the client
+   */
+  const fetchAllSessions = useCallback(async () => {
+    // ACTUAL columns: topic_id, correct_count, total_questions, time_seconds, percentage, status
+    const { data: sessions, error: sessionsError } = await cachedFrom(
+      'test_sessions',
+      { select: SESSION_COLUMNS, user_id: user.id, status: 'completed' },
+      (query) => query
+        .select(SESSION_COLUMNS)
         .eq('user_id', user.id)
         .eq('status', 'completed')
-        .order('started_at', { ascending: false });
+        .order('started_at', { ascending: false }),
+      { ttl: SESSIONS_TTL_MS, onRevalidate: ({ data }) => processSessions(data || []) }
+    );
 
-      if (sessionsError) {
-        console.error('Error fetching test_sessions:', sessionsError);
-        setError(sessionsError.message);
-        setLoading(false);
-        return;
-      }
+    if (sessionsError) return sessionsError;
 
-      const allSessions = sessions || [];
+    processSessions(sessions || []);
+    return null;
+  }, [user, processSessions]);
 
-      // Process weekly data (correct answers per day)
-      const weeklyCorrect = [0, 0, 0, 0, 0, 0, 0]; // L, M, X, J, V, S, D
-      const thisWeekSessions = allSessions.filter(s => {
-        const sessionDate = new Date(s.started_at);
-        return sessionDate >= weekStart;
-      });
+  /**
+   * Fetch activity data: precomputed dashboard figures + first history page
+   * (both bounded, from the daily activity rollup and a keyset page)
+   */
+  const fetchActivityData = useCallback(async () => {
+    if (!user?.id) {
+      return;
+    }
 
-      thisWeekSessions.forEach(session => {
-        const sessionDate = new Date(session.started_at);
-        let dayIndex = sessionDate.getDay() - 1; // Monday = 0
-        if (dayIndex === -1) dayIndex = 6; // Sunday = 6
-        weeklyCorrect[dayIndex] += session.correct_count || 0;
-      });
-
-      setWeeklyData(weeklyCorrect);
-
-      // Session history (last 10) - normalize column names for component compatibility
-      const normalizedSessions = allSessions.slice(0, 10).map(s => ({
-        ...s,
-        // Normalized names for component compatibility
-        correctas: s.correct_count,
-        correct_answers: s.correct_count,
-        total_preguntas: s.total_questions,
-        created_at: s.completed_at || s.started_at,
-        tema: s.topic_id != null ? `Tema ${s.topic_id}` : 'General',
-        tema_filter: s.topic_id != null ? [s.topic_id] : [],
-        porcentaje_acierto: s.total_questions > 0
-          ? Math.round((s.correct_count / s.total_questions) * 100)
-          : (s.percentage || 0)
-      }));
-      setSessionHistory(normalizedSessions);
-
-      // Calendar data (days practiced this month)
-      const monthDays = new Set();
-      allSessions.forEach(session => {
-        const sessionDate = new Date(session.started_at);
-        if (sessionDate >= monthStart) {
-          monthDays.add(sessionDate.getDate());
-        }
-      });
-      setCalendarData(Array.from(monthDays));
-
-      // Calculate total stats
-      const totalTests = allSessions.length;
-      const totalCorrect = allSessions.reduce((sum, s) => sum + (s.correct_count || 0), 0);
-      const totalQuestions = allSessions.reduce((sum, s) => sum + (s.total_questions || 0), 0);
-      const avgAccuracy = totalQuestions > 0
-        ? Math.round((totalCorrect / totalQuestions) * 100)
-        : 0;
-
-      // Calculate days studied (unique days with sessions)
-      const studyDays = new Set();
-      allSessions.forEach(session => {
-        const d = new Date(session.started_at);
-        studyDays.add(`${d.getFullYear()}-${d.getMonth()}-${d.getDate()}`);
-      });
-
-      setTotalStats({
-        testsCompleted: totalTests,
-        questionsCorrect: totalCorrect,
-        totalQuestions: totalQuestions,
-        accuracyRate: avgAccuracy,
-        daysStudied: studyDays.size
-      });
-
-      // Calculate today's stats
-      const todayStart = new Date();
-      todayStart.setHours(0, 0, 0, 0);
-      const todaySessions = allSessions.filter(s => new Date(s.started_at) >= todayStart);
-      const todayCorrect = todaySessions.reduce((sum, s) => sum + (s.correct_count || 0), 0);
-      const todayTotal = todaySessions.reduce((sum, s) => sum + (s.total_questions || 0), 0);
-      setTodayStats({
-        questionsAnswered: todayTotal,
-        questionsCorrect: todayCorrect,
-        testsCompleted: todaySessions.length,
-        accuracyRate: todayTotal > 0 ? Math.round((todayCorrect / todayTotal) * 100) : 0
-      });
-
-      // Calculate streak (consecutive days)
-      const sortedDays = Array.from(studyDays)
-        .map(d => {
-          const [y, m, day] = d.split('-').map(Number);
-          return new Date(y, m, day);
-        })
-        .sort((a, b) => b - a); // Most recent first
-
-      let currentStreak = 0;
-      let longestStreak = 0;
-      const today = new Date();
-      today.setHours(0, 0, 0, 0);
-      const yesterday = new Date(today);
-      yesterday.setDate(yesterday.getDate() - 1);
-
-      // Calculate longest streak from all study days
-      if (sortedDays.length > 0) {
-        // Sort ascending for longest streak calculation
-        const ascending = [...sortedDays].sort((a, b) => a - b);
-        let tempStreak = 1;
-        for (let i = 1; i < ascending.length; i++) {
-          const prev = new Date(ascending[i - 1]);
-          const curr = new Date(ascending[i]);
-          prev.setHours(0, 0, 0, 0);
-          curr.setHours(0, 0, 0, 0);
-          const diffDays = Math.round((curr - prev) / (1000 * 60 * 60 * 24));
-          if (diffDays === 1) {
-            tempStreak++;
-          } else if (diffDays > 1) {
-            longestStreak = Math.max(longestStreak, tempStreak);
-            tempStreak = 1;
-          }
-        }
-        longestStreak = Math.max(longestStreak, tempStreak);
-
-        // Calculate current streak (must include today or yesterday)
-        const lastStudyDay = new Date(sortedDays[0]);
-        lastStudyDay.setHours(0, 0, 0, 0);
-
-        if (lastStudyDay.getTime() === today.getTime() ||
-            lastStudyDay.getTime() === yesterday.getTime()) {
-          currentStreak = 1;
-          let checkDate = new Date(lastStudyDay);
-
-          for (let i = 1; i < sortedDays.length; i++) {
-            checkDate.setDate(checkDate.getDate() - 1);
-            const prevDay = new Date(sortedDays[i]);
-            prevDay.setHours(0, 0, 0, 0);
-
-            if (prevDay.getTime() === checkDate.getTime()) {
-              currentStreak++;
-            } else {
-              break;
-            }
-          }
-        }
-      }
-      setStreak({ current: currentStreak, longest: longestStreak });
-
-      // Calculate weekly improvement (compare this week vs last week)
-      const lastWeekStart = new Date(weekStart);
-      lastWeekStart.setDate(lastWeekStart.getDate() - 7);
-
-      const lastWeekSessions = allSessions.filter(s => {
-        const d = new Date(s.started_at);
-        return d >= lastWeekStart && d < weekStart;
-      });
-
-      // Calculate accuracy for this week
-      const thisWeekCorrect = thisWeekSessions.reduce((sum, s) => sum + (s.correct_count || 0), 0);
-      const thisWeekTotal = thisWeekSessions.reduce((sum, s) => sum + (s.total_questions || 0), 0);
-      const thisWeekAvg = thisWeekTotal > 0 ? (thisWeekCorrect / thisWeekTotal) * 100 : 0;
-
-      // Calculate accuracy for last week
-      const lastWeekCorrect = lastWeekSessions.reduce((sum, s) => sum + (s.correct_count || 0), 0);
-      const lastWeekTotal = lastWeekSessions.reduce((sum, s) => sum + (s.total_questions || 0), 0);
-      const lastWeekAvg = lastWeekTotal > 0 ? (lastWeekCorrect / lastWeekTotal) * 100 : 0;
-
-      const improvement = lastWeekAvg > 0
-        ? Math.round(thisWeekAvg - lastWeekAvg)
-        : 0;
-      setWeeklyImprovement(improvement);
-
-      // Find least practiced tema
-      const temaLastPracticed = {};
-      allSessions.forEach(session => {
-        const topicId = session.topic_id; // INTEGER (single topic, not array)
-        if (topicId != null) {
-          const existing = temaLastPracticed[topicId];
-          const sessionDate = new Date(session.started_at);
-          if (!existing || sessionDate > existing) {
-            temaLastPracticed[topicId] = sessionDate;
+    setLoading(true);
+    setError(null);
+
+    try {
+      const historyParams = { user_id: user.id, limit: HISTORY_PAGE_SIZE };
+      const [dashboardResult, historyResult] = await Promise.all([
+        cachedRpc(
+          'get_activity_dashboard',
+          { p_user_id: user.id, p_range_days: DASHBOARD_RANGE_DAYS },
+          {
+            ttl: DASHBOARD_TTL_MS,
+            tables: ['test_sessions'],
+            onRevalidate: ({ data }) => applyDashboard(data)
           }
+        ),
+        cachedQuery(
+          queryKey('session_history_page', historyParams),
+          async () => {
+            const { data, error: pageError } = await fetchSessionPage(null);
+            if (pageError) throw pageError;
+            return data || [];
+          },
+          { ttl: DASHBOARD_TTL_MS, tables: ['test_sessions'], onRevalidate: applyFirstPage }
+        ).then(data => ({ data, error: null }), error => ({ data: null, error }))
+      ]);
+
+      if (dashboardResult.error || historyResult.error) {
+        // Migration 017 not applied yet: fall back to the full scan
+        console.warn('Activity dashboard RPC unavailable, using fallback:',
+          (dashboardResult.error || historyResult.error).message);
+        const sessionsError = await fetchAllSessions();
+        if (sessionsError) {
+          console.error('Error fetching test_sessions:', sessionsError);
+          setError(sessionsError.message);
+          setLoading(false);
+          return;
         }
-      });
-
-      // Find tema with oldest last practice date
-      let oldestTema = null;
-      let oldestDate = null;
-      Object.entries(temaLastPracticed).forEach(([tema, date]) => {
-        if (!oldestDate || date < oldestDate) {
-          oldestDate = date;
-          oldestTema = parseInt(tema);
-        }
-      });
-
-      // Only suggest if not practiced in last 7 days
-      if (oldestDate) {
-        const daysSince = Math.floor((new Date() - oldestDate) / (1000 * 60 * 60 * 24));
-        if (daysSince >= 7) {
-          setLeastPracticedTema({ tema: oldestTema, daysSince });
-        } else {
-          setLeastPracticedTema(null);
-        }
+      } else {
+        applyDashboard(dashboardResult.data);
+        applyFirstPage(historyResult.data);
       }
 
-      // Compute simulacro average score (test_type='simulacro' or >=80 questions as fallback)
-      const simulacroSessions = allSessions.filter(
-        s => s.test_type === 'simulacro' || s.total_questions >= 80
-      );
-      const avgSimulacro = simulacroSessions.length > 0
-        ? Math.round(simulacroSessions.reduce((sum, s) => sum + (s.percentage || 0), 0) / simulacroSessions.length)
-        : 0;
-      setSimulacroAvg(avgSimulacro);
-
       setLoading(false);
 
       // Fetch FSRS stats in parallel
@@ -358,7 +474,31 @@ export function useActivityData() {
       setError(err.message);
       setLoading(false);
     }
-  }, [user, fetchFsrsStats]);
+  }, [user, fetchFsrsStats, fetchAllSessions, applyDashboard, applyFirstPage]);
+
+  /**
+   * Append the next page of session history
+   */
+  const loadMoreSessions = useCallback(async () => {
+    if (!user?.id || !lastSessionRef.current || loadingMoreSessions) return;
+
+    setLoadingMoreSessions(true);
+    try {
+      const { data, error: pageError } = await fetchSessionPage(lastSessionRef.current);
+      if (pageError) throw pageError;
+
+      const page = data || [];
+      if (page.length > 0) {
+        lastSessionRef.current = page[page.length - 1];
+        setSessionHistory(prev => [...prev, ...page.map(normalizeSession)]);
+      }
+      setHasMoreSessions(page.length === HISTORY_PAGE_SIZE);
+    } catch (err) {
+      console.error('Error loading more sessions:', err);
+    } finally {
+      setLoadingMoreSessions(false);
+    }
+  }, [user, loadingMoreSessions]);
 
   /**
    * Generate motivational message based on data
@@ -471,9 +611,13 @@ export function useActivityData() {
     motivationalMessage,
     fsrsStats,
     simulacroAvg,
+    activityDays,
+    hasMoreSessions,
+    loadingMoreSessions,
 
     // Functions
     fetchActivityData,
+    loadMoreSessions,
     fetchFsrsStats,
     formatRelativeDate
   };
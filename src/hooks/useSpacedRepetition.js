@@ -6,15 +6,20 @@
 import { useState, useEffect, useCallback, useRef } from 'react';
 import {
   generateHybridSession,
-  updateProgress,
+  queueProgressUpdate,
   getStudyStats,
-  getDueReviews,
+  getDueReviewCount,
   recordDailyStudy,
   recordTestSession,
   getWeeklyProgress
 } from '../services/spacedRepetitionService';
+import { PROGRESS_TABLES } from '../lib/progressOutbox';
+import { cachedQuery, queryKey } from '../lib/queryCache';
 import { useAuth } from '../contexts/AuthContext';
 
+const STATS_TTL_MS = 60_000; // 1 minute
+const DUE_COUNT_TTL_MS = 5 * 60 * 1000; // 5 minutes
+
 /**
  * Hook for managing a study session
  */
@@ -83,9 +88,9 @@ export function useStudySession(config = {}) {
     }));
     setCurrentIndex(prev => prev + 1);
 
-    // Update progress in database (fire-and-forget, don't block session)
+    // Queue progress update (write-behind outbox, flushed in bulk)
     try {
-      await updateProgress(user.id, currentQuestion.id, wasCorrect);
+      await queueProgressUpdate(user.id, currentQuestion.id, wasCorrect);
     } catch (err) {
       console.error('Error updating progress:', err);
     }
@@ -166,8 +171,16 @@ export function useStudyStats() {
 
     try {
       const [statsData, weeklyData] = await Promise.all([
-        getStudyStats(user.id),
-        getWeeklyProgress(user.id)
+        cachedQuery(queryKey('study_stats', { userId: user.id }), () => getStudyStats(user.id), {
+          ttl: STATS_TTL_MS,
+          tables: [...PROGRESS_TABLES, 'study_history'],
+          onRevalidate: setStats
+        }),
+        cachedQuery(queryKey('weekly_progress', { userId: user.id }), () => getWeeklyProgress(user.id), {
+          ttl: STATS_TTL_MS,
+          tables: ['study_history'],
+          onRevalidate: setWeeklyProgress
+        })
       ]);
 
       setStats(statsData);
@@ -206,8 +219,13 @@ export function useDueReviews() {
       }
 
       try {
-        const dueReviews = await getDueReviews(user.id, { limit: 100 });
-        setDueCount(dueReviews.length);
+        // Served from the shared cache; progress writes invalidate it
+        const count = await cachedQuery(
+          queryKey('due_review_count', { userId: user.id }),
+          () => getDueReviewCount(user.id),
+          { ttl: DUE_COUNT_TTL_MS, tables: ['user_question_progress'], onRevalidate: setDueCount }
+        );
+        setDueCount(count);
       } catch (err) {
         console.error('Error fetching due reviews:', err);
       }
@@ -1,6 +1,7 @@
 /**
  * useTemarioProgress — Adapts useTopics data for the Temario graph visualizations.
  * Returns userProgress + questionCounts in the shape that temarioData.js expects.
+ * Reads go through useTopics, so they share its query cache entries.
  */
 
 import { useMemo } from 'react';
@@ -1,7 +1,20 @@
 import { useState, useEffect, useCallback } from 'react';
 import { supabase } from '../lib/supabase';
+import { cachedFrom, cachedRpc } from '../lib/queryCache';
 import { useAuth } from './useAuth';
 
+// Topic catalog and counts change rarely; per-user progress after each session
+const TOPICS_TTL_MS = 60 * 60 * 1000; // 1 hour
+const COUNTS_TTL_MS = 10 * 60 * 1000; // 10 minutes
+const PROGRESS_TTL_MS = 2 * 60 * 1000; // 2 minutes
+
+const TOPICS_SELECT = `
+  id, code, name, number, is_available,
+  blocks!left (
+    id, code, number, name, short_name
+  )
+`;
+
 export function useTopics() {
   const { user, loading: authLoading } = useAuth();
   const [loading, setLoading] = useState(true);
@@ -16,30 +29,30 @@ export function useTopics() {
 
     async function fetchTopics() {
       try {
-        // Timeout wrapper required - queries hang without it
-        const timeoutPromise = new Promise((_, reject) =>
-          setTimeout(() => reject(new Error('Query timeout after 10s')), 10000)
-        );
-
-        const queryPromise = supabase
-          .from('topics')
-          .select(`
-            id, code, name, number, is_available,
-            blocks!left (
-              id, code, number, name, short_name
+        // Cached and shared with every other useTopics instance; a stale
+        // hit re-runs this with the revalidated data
+        const { data, error: fetchError } = await cachedFrom(
+          'topics',
+          { select: TOPICS_SELECT, is_active: true },
+          (query) => Promise.race([
+            query.select(TOPICS_SELECT).eq('is_active', true).order('number'),
+            // Timeout wrapper required - queries hang without it
+            new Promise((_, reject) =>
+              setTimeout(() => reject(new Error('Query timeout after 10s')), 10000)
             )
-          `)
-          .eq('is_active', true)
-          .order('number');
-
-        const { data, error: fetchError } = await Promise.race([queryPromise, timeoutPromise]);
+          ]),
+          { ttl: TOPICS_TTL_MS, onRevalidate: fetchTopics }
+        );
 
         if (fetchError) throw fetchError;
 
         // Fetch question counts per topic via the public count RPC.
         // Direct SELECT on `questions` is restricted — use the aggregated RPC instead.
-        const { data: countRows, error: countError } = await supabase
-          .rpc('get_topic_question_counts');
+        const { data: countRows, error: countError } = await cachedRpc(
+          'get_topic_question_counts',
+          undefined,
+          { ttl: COUNTS_TTL_MS, tables: ['questions'], onRevalidate: fetchTopics }
+        );
 
         if (countError) throw countError;
 
@@ -98,15 +111,7 @@ export function useTopics() {
       return;
     }
 
-    try {
-      // Read from user_topic_progress (aggregated per topic by RPC)
-      const { data, error } = await supabase
-        .from('user_topic_progress')
-        .select('*')
-        .eq('user_id', user.id);
-
-      if (error) throw error;
-
+    const applyProgress = ({ data }) => {
       const progress = {};
       (data || []).forEach(p => {
         progress[p.topic_number] = {
@@ -125,6 +130,20 @@ export function useTopics() {
       });
 
       setUserProgress(progress);
+    };
+
+    try {
+      // Read from user_topic_progress (aggregated per topic by RPC)
+      const result = await cachedFrom(
+        'user_topic_progress',
+        { select: '*', user_id: user.id },
+        (query) => query.select('*').eq('user_id', user.id),
+        { ttl: PROGRESS_TTL_MS, onRevalidate: applyProgress }
+      );
+
+      if (result.error) throw result.error;
+
+      applyProgress(result);
     } catch (err) {
       console.error('Error fetching user progress:', err);
     }
@@ -5,6 +5,7 @@
 
 import { useState, useCallback } from 'react';
 import { supabase } from '../lib/supabase';
+import { cachedFrom, invalidateQueries } from '../lib/queryCache';
 import { useAuth } from './useAuth';
 import {
   detectTriggeredInsights,
@@ -12,6 +13,9 @@ import {
   groupQuestionsByTema
 } from '../services/insightDetector';
 
+const INSIGHTS_TTL_MS = 60_000; // 1 minute
+const SESSION_STATS_TTL_MS = 2 * 60 * 1000; // 2 minutes
+
 /**
  * Hook for managing user insights and session statistics
  * @returns {Object} Insight management functions and state
@@ -78,6 +82,8 @@ export function useUserInsights() {
         supabase
       );
 
+      invalidateQueries(['session_stats', 'user_triggered_insights']);
+
       setLoading(false);
 
       return {
@@ -113,33 +119,38 @@ export function useUserInsights() {
     setError(null);
 
     try {
-      let query = supabase
-        .from('user_triggered_insights')
-        .select(`
-          id,
-          insight_template_id,
-          preguntas_falladas,
-          visto,
-          visto_at,
-          created_at,
-          insight_templates (
-            id,
-            titulo,
-            descripcion,
-            tipo,
-            emoji,
-            min_fallos_para_activar
-          )
-        `)
-        .eq('user_id', user.id)
-        .order('created_at', { ascending: false })
-        .limit(limit);
-
-      if (onlyUnseen) {
-        query = query.eq('visto', false);
-      }
-
-      const { data, error: fetchError } = await query;
+      const { data, error: fetchError } = await cachedFrom(
+        'user_triggered_insights',
+        { select: 'recent', user_id: user.id, limit, onlyUnseen },
+        (query) => {
+          query = query
+            .select(`
+              id,
+              insight_template_id,
+              preguntas_falladas,
+              visto,
+              visto_at,
+              created_at,
+              insight_templates (
+                id,
+                titulo,
+                descripcion,
+                tipo,
+                emoji,
+                min_fallos_para_activar
+              )
+            `)
+            .eq('user_id', user.id)
+            .order('created_at', { ascending: false })
+            .limit(limit);
+
+          if (onlyUnseen) {
+            query = query.eq('visto', false);
+          }
+          return query;
+        },
+        { ttl: INSIGHTS_TTL_MS }
+      );
 
       if (fetchError) {
         console.error('Error fetching recent insights:', fetchError);
@@ -185,13 +196,17 @@ export function useUserInsights() {
     setError(null);
 
     try {
-      const { data, error: fetchError } = await supabase
-        .from('session_stats')
-        .select('*')
-        .eq('user_id', user.id)
-        .order('created_at', { ascending: false })
-        .limit(1)
-        .single();
+      const { data, error: fetchError } = await cachedFrom(
+        'session_stats',
+        { select: '*', user_id: user.id, last: true },
+        (query) => query
+          .select('*')
+          .eq('user_id', user.id)
+          .order('created_at', { ascending: false })
+          .limit(1)
+          .single(),
+        { ttl: SESSION_STATS_TTL_MS }
+      );
 
       if (fetchError) {
         // PGRST116 = no rows returned, which is not really an error
@@ -228,12 +243,16 @@ export function useUserInsights() {
     setError(null);
 
     try {
-      const { data, error: fetchError } = await supabase
-        .from('session_stats')
-        .select('*')
-        .eq('user_id', user.id)
-        .order('created_at', { ascending: false })
-        .limit(limit);
+      const { data, error: fetchError } = await cachedFrom(
+        'session_stats',
+        { select: '*', user_id: user.id, limit },
+        (query) => query
+          .select('*')
+          .eq('user_id', user.id)
+          .order('created_at', { ascending: false })
+          .limit(limit),
+        { ttl: SESSION_STATS_TTL_MS }
+      );
 
       if (fetchError) {
         console.error('Error fetching session history:', fetchError);
@@ -278,6 +297,7 @@ export function useUserInsights() {
         return false;
       }
 
+      invalidateQueries('user_triggered_insights');
       return true;
 
     } catch (err) {
@@ -311,6 +331,7 @@ export function useUserInsights() {
         return 0;
       }
 
+      invalidateQueries('user_triggered_insights');
       return data?.length || 0;
 
     } catch (err) {
@@ -329,11 +350,15 @@ export function useUserInsights() {
     }
 
     try {
-      const { count, error: countError } = await supabase
-        .from('user_triggered_insights')
-        .select('id', { count: 'exact', head: true })
-        .eq('user_id', user.id)
-        .eq('visto', false);
+      const { count, error: countError } = await cachedFrom(
+        'user_triggered_insights',
+        { count: 'unseen', user_id: user.id },
+        (query) => query
+          .select('id', { count: 'exact', head: true })
+          .eq('user_id', user.id)
+          .eq('visto', false),
+        { ttl: INSIGHTS_TTL_MS }
+      );
 
       if (countError) {
         console.error('Error getting unseen count:', countError);
@@ -0,0 +1,56 @@
+import { useState, useEffect } from 'react';
+
+/**
+ * Windowed rendering for long lists of fixed-height rows.
+ * Only the rows inside the scroll container's viewport (plus `overscan`
+ * on each side) are rendered; the padding values stand in for the rest so
+ * the scrollbar keeps its real size.
+ *
+ * @param {Object} options
+ * @param {Object} options.containerRef - Ref to the scrolling element
+ * @param {number} options.count - Total rows
+ * @param {number} options.rowHeight - Row height in px
+ * @param {number} [options.overscan=8] - Extra rows rendered above/below
+ * @returns {Object} { start, end, paddingTop, paddingBottom, nearEnd }
+ */
+export function useVirtualRows({ containerRef, count, rowHeight, overscan = 8 }) {
+  const [viewport, setViewport] = useState({ scrollTop: 0, height: 0 });
+
+  useEffect(() => {
+    const el = containerRef.current;
+    if (!el) return;
+
+    let frame = 0;
+    const update = () => {
+      frame = 0;
+      setViewport({ scrollTop: el.scrollTop, height: el.clientHeight });
+    };
+    // At most one update per animation frame while scrolling
+    const schedule = () => {
+      if (!frame) frame = requestAnimationFrame(update);
+    };
+
+    update();
+    el.addEventListener('scroll', schedule, { passive: true });
+    const resizeObserver = typeof ResizeObserver !== 'undefined' ? new ResizeObserver(schedule) : null;
+    resizeObserver?.observe(el);
+
+    return () => {
+      el.removeEventListener('scroll', schedule);
+      resizeObserver?.disconnect();
+      if (frame) cancelAnimationFrame(frame);
+    };
+  }, [containerRef]);
+
+  const end = Math.min(count, Math.ceil((viewport.scrollTop + viewport.height) / rowHeight) + overscan);
+  const start = Math.min(end, Math.max(0, Math.floor(viewport.scrollTop / rowHeight) - overscan));
+
+  return {
+    start,
+    end,
+    paddingTop: start * rowHeight,
+    paddingBottom: (count - end) * rowHeight,
+    // Last rows are on screen: time to fetch the next page
+    nearEnd: end >= count - overscan
+  };
+}
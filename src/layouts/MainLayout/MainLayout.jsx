@@ -7,7 +7,7 @@
  * Uses React Router's Outlet to render child routes.
  */
 
-import { useState, useEffect } from 'react';
+import { useState, useEffect, lazy, Suspense } from 'react';
 import { Outlet, useLocation, useNavigate, useSearchParams } from 'react-router-dom';
 import { AnimatePresence } from 'framer-motion';
 import { Settings } from 'lucide-react';
@@ -16,7 +16,6 @@ import DesktopSidebar from './DesktopSidebar';
 import SettingsModal from './SettingsModal';
 import ProgressModal from './ProgressModal';
 import DevPanel from '../../components/dev/DevPanel';
-import DraftFeatures from '../../components/dev/DraftFeatures';
 import { useAuth } from '../../contexts/AuthContext';
 import { useAdmin } from '../../contexts/AdminContext';
 import { useUserStore } from '../../stores/useUserStore';
@@ -25,6 +24,10 @@ import { useDarkMode } from '../../hooks/useDarkMode';
 import { useIsMobile } from '../../hooks/useIsMobile';
 import { ROUTES } from '../../router/paths';
 import { ROUTE_TO_TAB, TAB_TO_ROUTE, TAB_TITLES } from '../../config/navigation';
+import PageSkeleton from '../../components/common/Skeleton';
+
+// Dev-only overlay (draft chunk): loaded on demand, kept out of the learner bundle
+const DraftFeatures = lazy(() => import('../../components/dev/DraftFeatures'));
 
 export default function MainLayout() {
   const location = useLocation();
@@ -238,15 +241,17 @@ export default function MainLayout() {
       {/* DraftFeatures overlay */}
       {showDraftFeatures && (
         <div className="fixed inset-0 z-50 bg-white dark:bg-gray-950 overflow-y-auto">
-          <DraftFeatures
-            onClose={() => setShowDraftFeatures(false)}
-            onStartTopicStudy={(topic) => {
-              setShowDraftFeatures(false);
-              navigate(ROUTES.STUDY, {
-                state: { mode: 'practica-tema', topic, temaId: topic.id }
-              });
-            }}
-          />
+          <Suspense fallback={<PageSkeleton />}>
+            <DraftFeatures
+              onClose={() => setShowDraftFeatures(false)}
+              onStartTopicStudy={(topic) => {
+                setShowDraftFeatures(false);
+                navigate(ROUTES.STUDY, {
+                  state: { mode: 'practica-tema', topic, temaId: topic.id }
+                });
+              }}
+            />
+          </Suspense>
         </div>
       )}
     </div>
@@ -3,49 +3,153 @@
  *
  * Captures unhandled errors and promise rejections,
  * logs them to console and optionally to Supabase error_logs table.
+ *
+ * The batched queue is shared: other telemetry (lib/perfTelemetry) queues
+ * rows for its own table with queueRecord() and drains its aggregates into
+ * the queue right before each flush via onBeforeFlush().
+ *
+ * Each table's queue is capped (oldest rows dropped first). A batch that
+ * fails on the network is put back for the next flush; a batch the database
+ * refuses (missing table, RLS, bad row) is dropped. After
+ * MAX_TABLE_FAILURES refusals in a row the table is disabled for the rest
+ * of the page load and its rows are no longer queued.
  */
 
 import { supabase } from './supabase';
 
-const MAX_QUEUE_SIZE = 20;
+const MAX_QUEUE_SIZE = 20; // Rows per insert (and queue length that triggers a flush)
+const MAX_QUEUED_ROWS = 200; // Per table; older rows are dropped past this
+const MAX_TABLE_FAILURES = 3; // Refused inserts in a row before a table is disabled
 const FLUSH_INTERVAL_MS = 30_000; // 30 seconds
 
-let errorQueue = [];
+// table -> rows waiting to be inserted
+const queues = new Map();
+// table -> refused inserts in a row
+const tableFailures = new Map();
+const disabledTables = new Set();
+// Size-triggered flushes wait until then after a network failure
+let retryAfter = 0;
+const beforeFlushCallbacks = [];
 let flushTimer = null;
+let flushPromise = null;
+let collecting = false;
 let initialized = false;
 
 /**
- * Flush queued errors to Supabase error_logs table
+ * Flush queued rows (errors and other telemetry) to Supabase
+ * One flush at a time: callers during a flush share it
  */
-async function flushErrors() {
-  if (errorQueue.length === 0) return;
+function flushQueues() {
+  if (!flushPromise) {
+    flushPromise = drainQueues().finally(() => {
+      flushPromise = null;
+    });
+  }
+  return flushPromise;
+}
+
+async function drainQueues() {
+  collecting = true;
+  for (const callback of beforeFlushCallbacks) {
+    try {
+      callback();
+    } catch {
+      // A broken collector must not block the flush
+    }
+  }
+  collecting = false;
+
+  for (const [table, queue] of queues) {
+    // Batches of MAX_QUEUE_SIZE; stop the table at the first failure
+    while (queue.length > 0) {
+      const batch = queue.splice(0, MAX_QUEUE_SIZE);
+      let error;
+
+      try {
+        ({ error } = await supabase
+          .from(table)
+          .insert(batch));
+      } catch (err) {
+        error = err;
+      }
+
+      if (!error) {
+        tableFailures.delete(table);
+        continue;
+      }
+
+      if (!error.code) {
+        // Network failure: keep the batch for the next periodic flush
+        queue.unshift(...batch);
+        trimQueue(queue);
+        retryAfter = Date.now() + FLUSH_INTERVAL_MS;
+      } else {
+        // Refused by the database: retrying would fail the same way
+        console.warn(`[ErrorTracking] Failed to persist ${table}:`, error.message);
+        recordTableFailure(table);
+      }
+      break;
+    }
+  }
+}
 
-  const batch = errorQueue.splice(0, MAX_QUEUE_SIZE);
+/**
+ * Drop the oldest rows past MAX_QUEUED_ROWS
+ */
+function trimQueue(queue) {
+  if (queue.length > MAX_QUEUED_ROWS) {
+    queue.splice(0, queue.length - MAX_QUEUED_ROWS);
+  }
+}
 
-  try {
-    const { error } = await supabase
-      .from('error_logs')
-      .insert(batch);
+function recordTableFailure(table) {
+  const failures = (tableFailures.get(table) || 0) + 1;
+  tableFailures.set(table, failures);
 
-    if (error) {
-      // If table doesn't exist or insert fails, just log to console
-      console.warn('[ErrorTracking] Failed to persist errors:', error.message);
-    }
-  } catch {
-    // Silently fail - don't let error tracking break the app
+  if (failures >= MAX_TABLE_FAILURES) {
+    console.warn(`[ErrorTracking] Disabling ${table} after ${failures} failed inserts`);
+    disabledTables.add(table);
+    queues.delete(table);
   }
 }
 
 /**
- * Queue an error for persistence
+ * Queue a row for batched insertion into `table`
+ * @param {string} table - e.g. 'error_logs', 'perf_metrics'
+ * @param {Object} row
  */
-function queueError(entry) {
-  errorQueue.push(entry);
+export function queueRecord(table, row) {
+  if (disabledTables.has(table)) return;
 
-  // Flush immediately if queue is full
-  if (errorQueue.length >= MAX_QUEUE_SIZE) {
-    flushErrors();
+  let queue = queues.get(table);
+  if (!queue) {
+    queue = [];
+    queues.set(table, queue);
   }
+  queue.push(row);
+  trimQueue(queue);
+
+  // Flush immediately if queue is full (not while collectors run: the
+  // flush already in progress will send it, nor right after a network
+  // failure: the periodic flush retries)
+  if (queue.length >= MAX_QUEUE_SIZE && !collecting && Date.now() >= retryAfter) {
+    flushQueues();
+  }
+}
+
+/**
+ * Run `callback` right before every flush (to drain aggregated data)
+ * @param {Function} callback
+ */
+export function onBeforeFlush(callback) {
+  beforeFlushCallbacks.push(callback);
+}
+
+/**
+ * Queue an error for persistence
+ */
+function queueError(entry) {
+  queueRecord('error_logs', entry);
 }
 
 /**
@@ -115,11 +219,16 @@ export function initErrorTracking() {
   });
 
   // Periodic flush
-  flushTimer = setInterval(flushErrors, FLUSH_INTERVAL_MS);
+  flushTimer = setInterval(flushQueues, FLUSH_INTERVAL_MS);
+
+  // Flush when the tab is hidden (mobile browsers may never fire unload)
+  document.addEventListener('visibilitychange', () => {
+    if (document.visibilityState === 'hidden') flushQueues();
+  });
 
   // Flush on page unload
   window.addEventListener('beforeunload', () => {
     if (flushTimer) clearInterval(flushTimer);
-    flushErrors();
+    flushQueues();
   });
 }
@@ -14,7 +14,7 @@
  */
 
 // FSRS-4.5 default parameters
-const FSRS_PARAMS = {
+export const FSRS_PARAMS = {
   // Desired retention rate (0-1)
   desired_retention: 0.9,
 
@@ -126,7 +126,7 @@ function easeToDifficulty(ease) {
 /**
  * Convert FSRS difficulty (0-10) back to ease_factor (1.3-3.0) for backward compatibility
  */
-function difficultyToEase(difficulty) {
+export function difficultyToEase(difficulty) {
   return Math.max(1.3, Math.min(3.0, (11.75 - difficulty) / 2.5));
 }
 
@@ -188,39 +188,45 @@ function nextDifficulty(difficulty, wasCorrect) {
 }
 
 /**
- * Calculate next review date and interval after answering (FSRS-4.5)
+ * FSRS-4.5 scheduling core on primitive inputs
  *
- * Backward compatible: reads ease_factor from progress and converts to difficulty/stability.
- * Returns { nextReview, interval, ease, state } matching the old API.
+ * Shared by calculateNextReview (row objects) and lib/fsrsBatch (typed
+ * arrays) so both produce bit-identical results. Raw values keep the
+ * semantics of the row fields: missing values are undefined/null/NaN.
  *
- * @param {Object} progress - Current progress data
- * @param {boolean} wasCorrect - Whether the answer was correct
- * @param {Object} params - Optional FSRS parameters
- * @returns {Object} { nextReview: Date, interval: number, ease: number, state: string }
+ * @param {boolean} hasProgress - false when there is no progress row
+ * @param {number} rawTimesSeen - times_seen
+ * @param {number} rawStability - stability
+ * @param {number} rawDifficulty - difficulty
+ * @param {number} currentInterval - scheduled_days ?? interval ?? 0
+ * @param {number} rawEase - legacy ease_factor
+ * @param {boolean} wasCorrect
+ * @param {Object} params - FSRS parameters
+ * @param {Object} [out] - Optional object to write the result into
+ * @returns {Object} { interval, stability, difficulty, timesSeen }
  */
-export function calculateNextReview(progress, wasCorrect, params = FSRS_PARAMS) {
-  const now = new Date();
-  const timesSeen = (progress?.times_seen || 0) + 1;
+export function scheduleReview(
+  hasProgress, rawTimesSeen, rawStability, rawDifficulty, currentInterval, rawEase,
+  wasCorrect, params = FSRS_PARAMS, out = {}
+) {
+  const timesSeen = ((hasProgress && rawTimesSeen) || 0) + 1;
   const desiredRetention = params.desired_retention || 0.9;
 
   // Extract or derive FSRS parameters from existing progress
-  let stability = progress?.stability || null;
-  let difficulty = progress?.difficulty || null;
-
-  // Read interval from DB column (scheduled_days) or legacy field (interval)
-  const currentInterval = progress?.scheduled_days ?? progress?.interval ?? 0;
+  let stability = (hasProgress && rawStability) || null;
+  let difficulty = (hasProgress && rawDifficulty) || null;
 
   // Backward compatibility: convert from legacy ease_factor if no FSRS params
   if (stability === null && currentInterval > 0) {
     stability = intervalToStability(currentInterval, desiredRetention);
   }
-  if (difficulty === null && progress?.ease_factor) {
-    difficulty = easeToDifficulty(progress.ease_factor);
+  if (difficulty === null && hasProgress && rawEase) {
+    difficulty = easeToDifficulty(rawEase);
   }
 
   let interval;
 
-  if (!progress || progress.times_seen === 0 || stability === null) {
+  if (!hasProgress || rawTimesSeen === 0 || stability === null) {
     // NEW card: use initial stability based on correctness
     if (wasCorrect) {
       stability = params.initial_stability?.[2] || 2.4; // Good rating
@@ -268,6 +274,40 @@ export function calculateNextReview(progress, wasCorrect, params = FSRS_PARAMS)
   // Clamp interval
   interval = Math.max(params.minInterval || 1, Math.min(interval, params.maxInterval || 365));
 
+  out.interval = interval;
+  out.stability = stability;
+  out.difficulty = difficulty;
+  out.timesSeen = timesSeen;
+  return out;
+}
+
+/**
+ * Calculate next review date and interval after answering (FSRS-4.5)
+ *
+ * Backward compatible: reads ease_factor from progress and converts to difficulty/stability.
+ * Returns { nextReview, interval, ease, state } matching the old API.
+ *
+ * @param {Object} progress - Current progress data
+ * @param {boolean} wasCorrect - Whether the answer was correct
+ * @param {Object} params - Optional FSRS parameters
+ * @param {Date} now - Review time (defaults to the current time)
+ * @returns {Object} { nextReview: Date, interval: number, ease: number, state: string }
+ */
+export function calculateNextReview(progress, wasCorrect, params = FSRS_PARAMS, now = new Date()) {
+  // Read interval from DB column (scheduled_days) or legacy field (interval)
+  const currentInterval = progress?.scheduled_days ?? progress?.interval ?? 0;
+
+  const { interval, stability, difficulty, timesSeen } = scheduleReview(
+    !!progress,
+    progress?.times_seen,
+    progress?.stability,
+    progress?.difficulty,
+    currentInterval,
+    progress?.ease_factor,
+    wasCorrect,
+    params
+  );
+
   // Convert difficulty back to ease_factor for backward compatibility with DB
   const ease = difficultyToEase(difficulty);
 
@@ -288,7 +328,7 @@ export function calculateNextReview(progress, wasCorrect, params = FSRS_PARAMS)
 /**
  * Determine state from interval and times seen
  */
-function calculateStateFromInterval(interval, timesSeen) {
+export function calculateStateFromInterval(interval, timesSeen) {
   if (timesSeen <= 2 && interval <= 3) {
     return QuestionState.LEARNING;
   }
@@ -423,6 +463,7 @@ export default {
   stateToString,
   calculateState,
   isDue,
+  scheduleReview,
   calculateNextReview,
   getDueQuestions,
   calculateStreak,
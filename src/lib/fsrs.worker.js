@@ -0,0 +1,20 @@
+/**
+ * FSRS batch worker
+ * Runs lib/fsrsBatch kernels off the main thread (see runFsrsBatch)
+ */
+
+import { runFsrsKernel, typedArrayBuffers } from './fsrsBatch.js';
+
+self.onmessage = ({ data }) => {
+  const { id, op, batch, args, returnBatch } = data;
+  // A transferred batch is handed back so the caller keeps its arrays
+  const returned = returnBatch ? batch : undefined;
+  const inputBuffers = returnBatch ? typedArrayBuffers(batch) : [];
+  try {
+    const result = runFsrsKernel(op, batch, args);
+    const buffers = new Set([...inputBuffers, ...typedArrayBuffers(result)]);
+    self.postMessage({ id, result, batch: returned }, [...buffers]);
+  } catch (err) {
+    self.postMessage({ id, error: err.message, batch: returned }, inputBuffers);
+  }
+};
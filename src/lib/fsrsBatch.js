@@ -0,0 +1,413 @@
+/**
+ * Batched FSRS engine (struct-of-arrays)
+ *
+ * Progress rows are packed once into typed arrays (one array per field) and
+ * the kernels below run tight loops over them instead of allocating a Date
+ * and an object per row. Every kernel reproduces its scalar counterpart in
+ * lib/fsrs exactly:
+ *   batchNextReview  -> calculateNextReview (shares scheduleReview)
+ *   batchSelectDue   -> getDueQuestions (optionally only the first k)
+ *   batchRetention   -> calculateRetention
+ *   batchPriority    -> calculatePriority
+ *
+ * runFsrsBatch() runs a kernel in a Web Worker (lib/fsrs.worker.js) for large
+ * batches so the main thread stays responsive, and inline otherwise.
+ *
+ * No app path ranks progress rows on the client today (due reviews are
+ * selected and counted in SQL), so nothing in src/ calls this yet; the
+ * kernels are covered by e2e/specs/unit and the bench.
+ *
+ * Encoding: missing numbers (null/undefined) are NaN, which every scalar
+ * check (`x || null`, `x > 0`, `x ?? y`) already treats as missing. The
+ * legacy `interval` field is the exception: null is stored as 0 because
+ * `null <= 3` and `null ?? 0` both behave like 0 in the scalar code.
+ * Unparseable next_review values are treated as missing.
+ */
+
+import {
+  FSRS_PARAMS,
+  scheduleReview,
+  difficultyToEase,
+  calculateStateFromInterval,
+  stateToInt
+} from './fsrs.js';
+
+// Below this many rows, posting to the worker costs more than it saves
+const WORKER_MIN_ROWS = 2000;
+
+const DAY_MS = 1000 * 60 * 60 * 24;
+
+function toNumber(value) {
+  return value == null ? NaN : Number(value);
+}
+
+function toEpoch(value) {
+  return value ? new Date(value).getTime() : NaN;
+}
+
+/**
+ * Pack progress rows into typed arrays
+ * @param {Array<Object|null>} rows - user_question_progress rows (null = no progress yet)
+ * @returns {Object} Batch with `length` and one typed array per field
+ */
+export function createProgressBatch(rows) {
+  const length = rows.length;
+  const batch = {
+    length,
+    present: new Uint8Array(length),
+    questionId: new Float64Array(length),
+    timesSeen: new Float64Array(length),
+    timesCorrect: new Float64Array(length),
+    stability: new Float64Array(length),
+    difficulty: new Float64Array(length),
+    scheduledDays: new Float64Array(length),
+    interval: new Float64Array(length),
+    easeFactor: new Float64Array(length),
+    nextReview: new Float64Array(length)
+  };
+
+  for (let i = 0; i < length; i++) {
+    const p = rows[i];
+    if (!p) {
+      batch.questionId[i] = NaN;
+      batch.timesSeen[i] = NaN;
+      batch.timesCorrect[i] = NaN;
+      batch.stability[i] = NaN;
+      batch.difficulty[i] = NaN;
+      batch.scheduledDays[i] = NaN;
+      batch.interval[i] = NaN;
+      batch.easeFactor[i] = NaN;
+      batch.nextReview[i] = NaN;
+      continue;
+    }
+
+    batch.present[i] = 1;
+    batch.questionId[i] = toNumber(p.question_id);
+    batch.timesSeen[i] = toNumber(p.times_seen);
+    batch.timesCorrect[i] = toNumber(p.times_correct);
+    batch.stability[i] = toNumber(p.stability);
+    batch.difficulty[i] = toNumber(p.difficulty);
+    batch.scheduledDays[i] = toNumber(p.scheduled_days);
+    batch.interval[i] = p.interval === null ? 0 : toNumber(p.interval);
+    batch.easeFactor[i] = toNumber(p.ease_factor);
+    batch.nextReview[i] = toEpoch(p.next_review);
+  }
+
+  return batch;
+}
+
+/**
+ * Schedule the next review for every row (calculateNextReview over a batch)
+ * @param {Object} batch - From createProgressBatch
+ * @param {Uint8Array|Array<boolean>} correct - Answer per row
+ * @param {Object} [params] - FSRS parameters
+ * @param {number} [nowMs] - Review time (epoch ms)
+ * @returns {Object} { nextReview, interval, ease, stability, difficulty, state } typed arrays
+ */
+export function batchNextReview(batch, correct, params = FSRS_PARAMS, nowMs = Date.now()) {
+  const n = batch.length;
+  const out = {
+    nextReview: new Float64Array(n),
+    interval: new Float64Array(n),
+    ease: new Float64Array(n),
+    stability: new Float64Array(n),
+    difficulty: new Float64Array(n),
+    state: new Int8Array(n)
+  };
+
+  // Intervals are few distinct integers; resolve each to a local-calendar
+  // date once (setDate keeps DST behaviour identical to the scalar path)
+  const dueByInterval = new Map();
+  const result = {};
+
+  for (let i = 0; i < n; i++) {
+    const scheduled = batch.scheduledDays[i];
+    const legacy = batch.interval[i];
+    const currentInterval = scheduled === scheduled ? scheduled : (legacy === legacy ? legacy : 0);
+
+    scheduleReview(
+      batch.present[i] === 1,
+      batch.timesSeen[i],
+      batch.stability[i],
+      batch.difficulty[i],
+      currentInterval,
+      batch.easeFactor[i],
+      !!correct[i],
+      params,
+      result
+    );
+
+    let due = dueByInterval.get(result.interval);
+    if (due === undefined) {
+      const date = new Date(nowMs);
+      date.setDate(date.getDate() + result.interval);
+      due = date.getTime();
+      dueByInterval.set(result.interval, due);
+    }
+
+    out.nextReview[i] = due;
+    out.interval[i] = result.interval;
+    out.ease[i] = difficultyToEase(result.difficulty);
+    out.stability[i] = result.stability;
+    out.difficulty[i] = result.difficulty;
+    out.state[i] = stateToInt(calculateStateFromInterval(result.interval, result.timesSeen));
+  }
+
+  return out;
+}
+
+// Max-heap on (nextReview, index) so the root is the worst of the kept k
+function heapAbove(nextReview, a, b) {
+  return nextReview[a] > nextReview[b] || (nextReview[a] === nextReview[b] && a > b);
+}
+
+function siftDown(heap, size, nextReview, pos) {
+  for (;;) {
+    const left = 2 * pos + 1;
+    if (left >= size) return;
+    const right = left + 1;
+    const child = right < size && heapAbove(nextReview, heap[right], heap[left]) ? right : left;
+    if (!heapAbove(nextReview, heap[child], heap[pos])) return;
+    const tmp = heap[pos];
+    heap[pos] = heap[child];
+    heap[child] = tmp;
+    pos = child;
+  }
+}
+
+function siftUp(heap, nextReview, pos) {
+  while (pos > 0) {
+    const parent = (pos - 1) >> 1;
+    if (!heapAbove(nextReview, heap[pos], heap[parent])) return;
+    const tmp = heap[pos];
+    heap[pos] = heap[parent];
+    heap[parent] = tmp;
+    pos = parent;
+  }
+}
+
+/**
+ * Indexes of due rows, most overdue first (getDueQuestions over a batch)
+ *
+ * Ties keep row order, like the stable sort in getDueQuestions. With a
+ * limit, only the first `limit` are selected (heap, O(n log k)).
+ *
+ * @param {Object} batch - From createProgressBatch
+ * @param {number} [nowMs] - Reference time (epoch ms)
+ * @param {number} [limit] - Max indexes to return
+ * @returns {Uint32Array} Row indexes
+ */
+export function batchSelectDue(batch, nowMs = Date.now(), limit = Infinity) {
+  const nextReview = batch.nextReview;
+  const n = batch.length;
+  const k = Math.max(0, Math.min(limit, n));
+  const heap = new Uint32Array(k);
+  let size = 0;
+
+  for (let i = 0; i < n; i++) {
+    // NaN (missing) fails the comparison, matching `!p.next_review`
+    if (!(nextReview[i] <= nowMs)) continue;
+
+    if (size < k) {
+      heap[size] = i;
+      siftUp(heap, nextReview, size++);
+    } else if (k > 0 && heapAbove(nextReview, heap[0], i)) {
+      heap[0] = i;
+      siftDown(heap, size, nextReview, 0);
+    }
+  }
+
+  const selected = heap.subarray(0, size);
+  selected.sort((a, b) => (nextReview[a] - nextReview[b]) || (a - b));
+  return selected;
+}
+
+/**
+ * Retention rate 0-100 (calculateRetention over a batch)
+ * @param {Object} batch - From createProgressBatch
+ * @returns {number}
+ */
+export function batchRetention(batch) {
+  let totalCorrect = 0;
+  let totalSeen = 0;
+  let reviewed = 0;
+
+  for (let i = 0; i < batch.length; i++) {
+    const seen = batch.timesSeen[i];
+    if (!(seen > 0)) continue;
+    reviewed++;
+    totalCorrect += batch.timesCorrect[i] || 0;
+    totalSeen += seen;
+  }
+
+  if (reviewed === 0 || totalSeen === 0) return 0;
+  return Math.round((totalCorrect / totalSeen) * 100);
+}
+
+/**
+ * Review priority per row (calculatePriority over a batch)
+ * @param {Object} batch - From createProgressBatch
+ * @param {number} [nowMs] - Reference time (epoch ms)
+ * @returns {Float64Array}
+ */
+export function batchPriority(batch, nowMs = Date.now()) {
+  const out = new Float64Array(batch.length);
+
+  for (let i = 0; i < batch.length; i++) {
+    if (batch.present[i] === 0) {
+      out[i] = 100; // New questions have high priority
+      continue;
+    }
+
+    const nextReview = batch.nextReview[i];
+    const daysOverdue = (nowMs - (nextReview === nextReview ? nextReview : nowMs)) / DAY_MS;
+    let priority = daysOverdue * 10;
+
+    const difficulty = batch.difficulty[i];
+    if (difficulty === difficulty) {
+      priority += difficulty * 2;
+    } else {
+      const ease = batch.easeFactor[i] || 2.5;
+      priority += (3.0 - ease) * 5;
+    }
+
+    if (batch.interval[i] <= 3) {
+      priority += 20;
+    }
+
+    out[i] = priority;
+  }
+
+  return out;
+}
+
+const KERNELS = {
+  nextReview: (batch, { correct, params, nowMs }) => batchNextReview(batch, correct, params, nowMs),
+  selectDue: (batch, { nowMs, limit }) => batchSelectDue(batch, nowMs, limit),
+  retention: (batch) => batchRetention(batch),
+  priority: (batch, { nowMs }) => batchPriority(batch, nowMs)
+};
+
+/**
+ * Run a kernel by name (used by the worker and the inline fallback)
+ * @param {string} op - nextReview | selectDue | retention | priority
+ * @param {Object} batch
+ * @param {Object} [args]
+ * @returns {*}
+ */
+export function runFsrsKernel(op, batch, args = {}) {
+  const kernel = KERNELS[op];
+  if (!kernel) throw new Error(`Unknown FSRS batch op: ${op}`);
+  return kernel(batch, args);
+}
+
+/**
+ * Buffers of the typed arrays in a batch or kernel result (transfer list)
+ * @param {*} value
+ * @returns {ArrayBuffer[]}
+ */
+export function typedArrayBuffers(value) {
+  if (ArrayBuffer.isView(value)) return [value.buffer];
+  if (!value || typeof value !== 'object') return [];
+  const buffers = new Set();
+  for (const field of Object.values(value)) {
+    if (ArrayBuffer.isView(field)) buffers.add(field.buffer);
+  }
+  return [...buffers];
+}
+
+let worker = null;
+let workerBroken = false;
+// Set once the worker has answered a request: from then on input buffers
+// are transferred instead of copied
+let workerReady = false;
+let nextRequestId = 0;
+const requests = new Map();
+
+function getWorker() {
+  if (worker || workerBroken || typeof Worker === 'undefined') return worker;
+
+  try {
+    worker = new Worker(new URL('./fsrs.worker.js', import.meta.url), { type: 'module' });
+  } catch (err) {
+    console.warn('FSRS worker unavailable, running inline:', err);
+    workerBroken = true;
+    return null;
+  }
+
+  worker.onmessage = ({ data }) => {
+    workerReady = true;
+    const request = requests.get(data.id);
+    if (!request) return;
+    requests.delete(data.id);
+    // Transferred input arrays come back with the answer
+    if (data.batch) Object.assign(request.batch, data.batch);
+    if (data.error) request.reject(new Error(data.error));
+    else request.resolve(data.result);
+  };
+
+  worker.onerror = (event) => {
+    // Fail everything in flight over to the inline path
+    console.warn('FSRS worker failed, running inline:', event.message);
+    workerBroken = true;
+    worker.terminate();
+    worker = null;
+    for (const request of requests.values()) request.fallback();
+    requests.clear();
+  };
+
+  return worker;
+}
+
+/**
+ * Run a batch kernel, off the main thread when the batch is large
+ *
+ * Buffers are transferred both ways without copying: the batch's arrays
+ * move to the worker and are handed back (re-attached to `batch`) with the
+ * result buffers. Until the worker has answered once the batch is copied
+ * instead, so a worker that fails to load can still fall back inline.
+ *
+ * @param {string} op - nextReview | selectDue | retention | priority
+ * @param {Object} batch - From createProgressBatch
+ * @param {Object} [args] - Kernel arguments ({ correct, params, nowMs, limit })
+ * @returns {Promise<*>} Kernel result
+ */
+export function runFsrsBatch(op, batch, args = {}) {
+  const runInline = () => {
+    try {
+      return Promise.resolve(runFsrsKernel(op, batch, args));
+    } catch (err) {
+      return Promise.reject(err);
+    }
+  };
+
+  const target = batch.length >= WORKER_MIN_ROWS ? getWorker() : null;
+  if (!target) return runInline();
+
+  const transfer = workerReady;
+
+  return new Promise((resolve, reject) => {
+    const id = ++nextRequestId;
+    requests.set(id, {
+      batch,
+      resolve,
+      reject,
+      // A transferred batch died with the worker: nothing left to run inline
+      fallback: transfer
+        ? () => reject(new Error('FSRS worker failed'))
+        : () => runInline().then(resolve, reject)
+    });
+    target.postMessage({ id, op, batch, args, returnBatch: transfer }, transfer ? typedArrayBuffers(batch) : []);
+  });
+}
+
+export default {
+  createProgressBatch,
+  batchNextReview,
+  batchSelectDue,
+  batchRetention,
+  batchPriority,
+  runFsrsKernel,
+  runFsrsBatch,
+  typedArrayBuffers
+};
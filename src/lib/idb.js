@@ -0,0 +1,123 @@
+/**
+ * Minimal IndexedDB key-value helper
+ *
+ * One database ('oposita-cache') with a few named object stores, each used as
+ * a plain key-value store. Every call degrades to a no-op / empty result when
+ * IndexedDB is unavailable (private mode, old Safari, SSR), so callers can
+ * treat persistence as best-effort.
+ */
+
+const DB_NAME = 'oposita-cache';
+const DB_VERSION = 2;
+
+export const STORES = {
+  PROGRESS_OUTBOX: 'progress_outbox',
+  QUERY_CACHE: 'query_cache',
+};
+
+let dbPromise = null;
+
+function openDB() {
+  if (dbPromise) return dbPromise;
+
+  dbPromise = new Promise((resolve) => {
+    if (typeof indexedDB === 'undefined') {
+      resolve(null);
+      return;
+    }
+
+    try {
+      const request = indexedDB.open(DB_NAME, DB_VERSION);
+
+      request.onupgradeneeded = () => {
+        const db = request.result;
+        for (const store of Object.values(STORES)) {
+          if (!db.objectStoreNames.contains(store)) {
+            db.createObjectStore(store);
+          }
+        }
+      };
+
+      request.onsuccess = () => resolve(request.result);
+      request.onerror = () => {
+        console.warn('[idb] Failed to open database:', request.error);
+        resolve(null);
+      };
+    } catch (err) {
+      console.warn('[idb] IndexedDB unavailable:', err);
+      resolve(null);
+    }
+  });
+
+  return dbPromise;
+}
+
+/**
+ * Run a single request against a store and resolve with its result
+ */
+async function withStore(storeName, mode, fn) {
+  const db = await openDB();
+  if (!db) return undefined;
+
+  return new Promise((resolve) => {
+    try {
+      const tx = db.transaction(storeName, mode);
+      const request = fn(tx.objectStore(storeName));
+      tx.oncomplete = () => resolve(request?.result);
+      tx.onerror = () => {
+        console.warn(`[idb] ${mode} on ${storeName} failed:`, tx.error);
+        resolve(undefined);
+      };
+      tx.onabort = tx.onerror;
+    } catch (err) {
+      console.warn(`[idb] ${mode} on ${storeName} failed:`, err);
+      resolve(undefined);
+    }
+  });
+}
+
+export function idbGet(storeName, key) {
+  return withStore(storeName, 'readonly', store => store.get(key));
+}
+
+export function idbSet(storeName, key, value) {
+  return withStore(storeName, 'readwrite', store => store.put(value, key));
+}
+
+export function idbDelete(storeName, key) {
+  return withStore(storeName, 'readwrite', store => store.delete(key));
+}
+
+/**
+ * Read every entry of a store as [key, value] pairs
+ */
+export async function idbEntries(storeName) {
+  const db = await openDB();
+  if (!db) return [];
+
+  return new Promise((resolve) => {
+    try {
+      const tx = db.transaction(storeName, 'readonly');
+      const store = tx.objectStore(storeName);
+      const keysReq = store.getAllKeys();
+      const valuesReq = store.getAll();
+      tx.oncomplete = () => {
+        const keys = keysReq.result || [];
+        const values = valuesReq.result || [];
+        resolve(keys.map((key, i) => [key, values[i]]));
+      };
+      tx.onerror = () => resolve([]);
+      tx.onabort = tx.onerror;
+    } catch {
+      resolve([]);
+    }
+  });
+}
+
+export default {
+  STORES,
+  idbGet,
+  idbSet,
+  idbDelete,
+  idbEntries,
+};
@@ -0,0 +1,115 @@
+/**
+ * Fixed-bucket latency histograms
+ *
+ * Timings are aggregated client-side into histograms over fixed bucket
+ * bounds, so only a handful of numbers per operation leave the browser.
+ * Histograms with the same bounds merge by adding bucket counts; the
+ * server (get_perf_summary, migration 018) merges and reads percentiles
+ * the same way as histogramPercentile() below.
+ *
+ * Bucket i counts values in (BUCKET_BOUNDS[i-1], BUCKET_BOUNDS[i]]; the
+ * last bucket counts everything above the last bound.
+ *
+ * KEEP IN SYNC with the bounds in supabase/migrations/018_perf_metrics.sql
+ */
+
+export const BUCKET_BOUNDS = [5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000, 30000];
+
+/**
+ * Empty histogram
+ * @returns {Object} { count, sum, min, max, errors, buckets }
+ */
+export function createHistogram() {
+  return {
+    count: 0,
+    sum: 0,
+    min: Infinity,
+    max: -Infinity,
+    errors: 0,
+    buckets: new Array(BUCKET_BOUNDS.length + 1).fill(0)
+  };
+}
+
+/**
+ * Index of the bucket a value falls in
+ * @param {number} value
+ * @returns {number}
+ */
+export function bucketIndex(value) {
+  let lo = 0;
+  let hi = BUCKET_BOUNDS.length;
+  while (lo < hi) {
+    const mid = (lo + hi) >> 1;
+    if (value <= BUCKET_BOUNDS[mid]) hi = mid;
+    else lo = mid + 1;
+  }
+  return lo;
+}
+
+/**
+ * Add one observation
+ * @param {Object} histogram
+ * @param {number} value
+ * @param {boolean} [isError=false]
+ */
+export function recordValue(histogram, value, isError = false) {
+  histogram.count++;
+  histogram.sum += value;
+  if (value < histogram.min) histogram.min = value;
+  if (value > histogram.max) histogram.max = value;
+  if (isError) histogram.errors++;
+  histogram.buckets[bucketIndex(value)]++;
+}
+
+/**
+ * Add `other` into `target` (same bounds)
+ * @param {Object} target
+ * @param {Object} other
+ * @returns {Object} target
+ */
+export function mergeHistogram(target, other) {
+  target.count += other.count;
+  target.sum += other.sum;
+  target.min = Math.min(target.min, other.min);
+  target.max = Math.max(target.max, other.max);
+  target.errors += other.errors;
+  for (let i = 0; i < target.buckets.length; i++) target.buckets[i] += other.buckets[i];
+  return target;
+}
+
+/**
+ * Approximate percentile, interpolating linearly inside the bucket and
+ * clamped to the observed min/max
+ * @param {Object} histogram
+ * @param {number} p - 0..1
+ * @returns {number|null} null when empty
+ */
+export function histogramPercentile(histogram, p) {
+  if (histogram.count === 0) return null;
+
+  const target = p * histogram.count;
+  let cumulative = 0;
+
+  for (let i = 0; i < histogram.buckets.length; i++) {
+    const n = histogram.buckets[i];
+    if (n === 0 || cumulative + n < target) {
+      cumulative += n;
+      continue;
+    }
+    const lower = i === 0 ? 0 : BUCKET_BOUNDS[i - 1];
+    const upper = i < BUCKET_BOUNDS.length ? BUCKET_BOUNDS[i] : histogram.max;
+    const value = lower + (upper - lower) * ((target - cumulative) / n);
+    return Math.min(Math.max(value, histogram.min), histogram.max);
+  }
+
+  return histogram.max;
+}
+
+export default {
+  BUCKET_BOUNDS,
+  createHistogram,
+  bucketIndex,
+  recordValue,
+  mergeHistogram,
+  histogramPercentile
+};
@@ -0,0 +1,312 @@
+/**
+ * Performance Telemetry
+ *
+ * Client-side latency instrumentation:
+ *   - timing spans around service functions (measure / timed / startSpan)
+ *   - every supabase.rpc() and supabase.from(...) query, timed by name
+ *     (`rpc:<fn>`, `<table>.<select|insert|upsert|update|delete>`)
+ *   - web vitals (TTFB, FCP, LCP, CLS, INP) and long tasks
+ *
+ * Nothing is sent per event. Observations are aggregated in memory into
+ * fixed-bucket histograms (lib/perfHistogram), one per operation, and each
+ * histogram becomes one perf_metrics row when the errorTracking queue
+ * flushes (every 30s and when the tab is hidden). Spans are sampled
+ * (SPAN_SAMPLE_RATE); the rate is stored with the row so totals can be
+ * scaled back up. Percentiles per operation: get_perf_summary()
+ * (migration 018), shown in the admin panel.
+ *
+ * Local snapshot in the browser console: window.perfTelemetry.snapshot()
+ */
+
+import { supabase } from './supabase';
+import { queueRecord, onBeforeFlush } from './errorTracking';
+import { createHistogram, recordValue, histogramPercentile } from './perfHistogram';
+
+const PERF_TABLE = 'perf_metrics';
+const SPAN_SAMPLE_RATE = 0.25;
+const QUERY_METHODS = ['select', 'insert', 'upsert', 'update', 'delete'];
+// Telemetry writes are not timed (they would measure themselves)
+const UNTRACKED_TABLES = new Set([PERF_TABLE, 'error_logs']);
+
+// `${kind}|${name}|${unit}` -> { name, kind, unit, sampleRate, histogram }
+let metrics = new Map();
+let windowStart = Date.now();
+let initialized = false;
+let reportVitals = null;
+
+const noop = () => {};
+const hasPerformance = typeof performance !== 'undefined';
+const now = () => (hasPerformance ? performance.now() : Date.now());
+
+/**
+ * Record one observation into its operation's histogram
+ * @param {string} name - Operation, e.g. 'rpc:get_study_questions'
+ * @param {number} value - Duration in ms (or `unit`)
+ * @param {Object} [options]
+ * @param {string} [options.kind='span'] - span | vital | longtask | ux
+ * @param {string} [options.unit='ms']
+ * @param {boolean} [options.error=false]
+ * @param {number} [options.sampleRate=1] - Sampling rate the value was taken at
+ */
+export function recordMetric(name, value, options = {}) {
+  const { kind = 'span', unit = 'ms', error = false, sampleRate = 1 } = options;
+  if (!Number.isFinite(value) || value < 0) return;
+
+  const key = `${kind}|${name}|${unit}`;
+  let metric = metrics.get(key);
+  if (!metric) {
+    metric = { name, kind, unit, sampleRate, histogram: createHistogram() };
+    metrics.set(key, metric);
+  }
+  recordValue(metric.histogram, value, error);
+}
+
+/**
+ * Start a timing span (sampled)
+ * @param {string} name
+ * @param {Object} [options]
+ * @param {number} [options.sampleRate] - Defaults to SPAN_SAMPLE_RATE
+ * @param {string} [options.kind='span']
+ * @returns {Function} end({ error }) - Records the duration once; no-op when not sampled
+ */
+export function startSpan(name, options = {}) {
+  const { sampleRate = SPAN_SAMPLE_RATE, kind = 'span' } = options;
+  if (Math.random() >= sampleRate) return noop;
+
+  const start = now();
+  let ended = false;
+  return ({ error = false } = {}) => {
+    if (ended) return;
+    ended = true;
+    recordMetric(name, now() - start, { kind, error, sampleRate });
+  };
+}
+
+/**
+ * Time an async call. Rejections and supabase-style `{ error }` results
+ * count as errors.
+ * @param {string} name
+ * @param {Function} fn - Returns a promise
+ * @param {Object} [options] - startSpan options
+ * @returns {Promise<*>} fn's result
+ */
+export async function measure(name, fn, options) {
+  const end = startSpan(name, options);
+  try {
+    const result = await fn();
+    end({ error: !!result?.error });
+    return result;
+  } catch (err) {
+    end({ error: true });
+    throw err;
+  }
+}
+
+/**
+ * Wrap an async function so every call is timed
+ * @param {string} name
+ * @param {Function} fn
+ * @param {Object} [options] - startSpan options
+ * @returns {Function}
+ */
+export function timed(name, fn, options) {
+  return function timedCall(...args) {
+    return measure(name, () => fn.apply(this, args), options);
+  };
+}
+
+// Time the request a postgrest builder sends when awaited
+function instrumentBuilder(builder, name) {
+  const then = builder.then;
+  builder.then = function instrumentedThen(onFulfilled, onRejected) {
+    const end = startSpan(name);
+    return then
+      .call(this, (result) => {
+        end({ error: !!result?.error });
+        return result;
+      }, (err) => {
+        end({ error: true });
+        throw err;
+      })
+      .then(onFulfilled, onRejected);
+  };
+  return builder;
+}
+
+/**
+ * Time every rpc() and from(table).<method>() request of a supabase client
+ * @param {Object} client
+ */
+export function instrumentSupabase(client) {
+  if (client.__perfInstrumented) return;
+  client.__perfInstrumented = true;
+
+  const rpc = client.rpc.bind(client);
+  client.rpc = (fn, args, options) => instrumentBuilder(rpc(fn, args, options), `rpc:${fn}`);
+
+  const from = client.from.bind(client);
+  client.from = (table) => {
+    const query = from(table);
+    if (UNTRACKED_TABLES.has(table)) return query;
+
+    for (const method of QUERY_METHODS) {
+      const original = query[method];
+      if (typeof original !== 'function') continue;
+      query[method] = (...args) => instrumentBuilder(original.apply(query, args), `${table}.${method}`);
+    }
+    return query;
+  };
+}
+
+function observe(type, onEntry, options = {}) {
+  try {
+    const observer = new PerformanceObserver((list) => list.getEntries().forEach(onEntry));
+    observer.observe({ type, buffered: true, ...options });
+    return observer;
+  } catch {
+    return null; // Entry type not supported by this browser
+  }
+}
+
+/**
+ * Web vitals and long tasks
+ * TTFB and FCP are final immediately; LCP, CLS and INP are reported once,
+ * the first time the page is hidden (same rule as the web-vitals library).
+ */
+function initWebVitals() {
+  if (typeof PerformanceObserver === 'undefined') return;
+
+  const navigation = performance.getEntriesByType?.('navigation')?.[0];
+  if (navigation?.responseStart > 0) {
+    recordMetric('TTFB', navigation.responseStart, { kind: 'vital' });
+  }
+
+  observe('paint', (entry) => {
+    if (entry.name === 'first-contentful-paint') {
+      recordMetric('FCP', entry.startTime, { kind: 'vital' });
+    }
+  });
+
+  let lcp = null;
+  observe('largest-contentful-paint', (entry) => {
+    lcp = entry.startTime;
+  });
+
+  // CLS: largest session window (shifts <1s apart, window <5s)
+  let cls = 0;
+  let sessionValue = 0;
+  let sessionFirst = 0;
+  let sessionLast = 0;
+  observe('layout-shift', (entry) => {
+    if (entry.hadRecentInput) return;
+    if (sessionValue > 0 && entry.startTime - sessionLast < 1000 && entry.startTime - sessionFirst < 5000) {
+      sessionValue += entry.value;
+    } else {
+      sessionValue = entry.value;
+      sessionFirst = entry.startTime;
+    }
+    sessionLast = entry.startTime;
+    cls = Math.max(cls, sessionValue);
+  });
+
+  // INP (approximation): slowest interaction
+  let inp = 0;
+  observe('event', (entry) => {
+    if (entry.interactionId) inp = Math.max(inp, entry.duration);
+  }, { durationThreshold: 40 });
+
+  observe('longtask', (entry) => {
+    recordMetric('longtask', entry.duration, { kind: 'longtask' });
+  });
+
+  let reported = false;
+  reportVitals = () => {
+    if (reported) return;
+    reported = true;
+    if (lcp !== null) recordMetric('LCP', lcp, { kind: 'vital' });
+    // CLS is unitless: stored in thousandths so it fits the same buckets
+    recordMetric('CLS', Math.round(cls * 1000), { kind: 'vital', unit: 'mcls' });
+    if (inp > 0) recordMetric('INP', inp, { kind: 'vital' });
+  };
+}
+
+/**
+ * Turn the current histograms into perf_metrics rows on the shared queue
+ */
+function drainMetrics() {
+  if (reportVitals && typeof document !== 'undefined' && document.visibilityState === 'hidden') {
+    reportVitals();
+  }
+  if (metrics.size === 0) return;
+
+  // Swap first: queueRecord may trigger a flush that calls back in here
+  const drained = metrics;
+  const drainedStart = windowStart;
+  const windowEnd = Date.now();
+  metrics = new Map();
+  windowStart = windowEnd;
+
+  for (const { name, kind, unit, sampleRate, histogram } of drained.values()) {
+    queueRecord(PERF_TABLE, {
+      name,
+      kind,
+      unit,
+      sample_count: histogram.count,
+      sum_value: Math.round(histogram.sum * 10) / 10,
+      min_value: Math.round(histogram.min * 10) / 10,
+      max_value: Math.round(histogram.max * 10) / 10,
+      error_count: histogram.errors,
+      buckets: histogram.buckets,
+      sample_rate: sampleRate,
+      window_start: new Date(drainedStart).toISOString(),
+      window_seconds: Math.max(1, Math.round((windowEnd - drainedStart) / 1000)),
+    });
+  }
+}
+
+/**
+ * p50/p95 of the current (unflushed) window, per operation
+ * @returns {Object[]} { name, kind, unit, count, p50, p95, max, errors }
+ */
+export function getPerfSnapshot() {
+  return [...metrics.values()].map(({ name, kind, unit, histogram }) => ({
+    name,
+    kind,
+    unit,
+    count: histogram.count,
+    p50: histogramPercentile(histogram, 0.5),
+    p95: histogramPercentile(histogram, 0.95),
+    max: histogram.max,
+    errors: histogram.errors
+  }));
+}
+
+/**
+ * Initialize performance telemetry
+ * Call once at app startup (main.jsx), after initErrorTracking()
+ */
+export function initPerfTelemetry() {
+  if (initialized) return;
+  initialized = true;
+
+  instrumentSupabase(supabase);
+  initWebVitals();
+  onBeforeFlush(drainMetrics);
+}
+
+// Inspect from the browser console
+if (typeof window !== 'undefined') {
+  window.perfTelemetry = {
+    snapshot: getPerfSnapshot
+  };
+}
+
+export default {
+  recordMetric,
+  startSpan,
+  measure,
+  timed,
+  instrumentSupabase,
+  getPerfSnapshot,
+  initPerfTelemetry
+};
@@ -0,0 +1,401 @@
+/**
+ * Progress Outbox (write-behind FSRS updates)
+ *
+ * Answers are queued locally instead of doing a select + upsert round trip
+ * per card. Each answer is one record in the IndexedDB outbox (so it survives
+ * reloads), and pending answers are flushed with ONE bulk upsert per flush:
+ *   - every FLUSH_INTERVAL_MS while the app is open
+ *   - when the browser comes back online
+ *   - when the page is hidden / unloaded
+ *   - explicitly via flushProgressOutbox() (session end, before
+ *     recordTestSession / recordDailyStudy, before sign-out)
+ *
+ * IndexedDB is the source of truth and is shared by every open tab, so a
+ * flush runs under the 'progress-outbox' Web Lock: one tab at a time reads
+ * the stored answers, writes them and deletes them before releasing the lock.
+ * Only the signed-in user's answers are flushed; answers left by another
+ * account stay stored until that user signs in again.
+ *
+ * FSRS values are computed on the client with calculateNextReview(), replaying
+ * each queued answer (with its original timestamp) on top of the current
+ * progress row. Base rows are read in one `in` query inside the lock, so a
+ * row written by another tab is never overwritten from a stale copy.
+ *
+ * When the database rejects a bulk upsert, the batch is split in halves
+ * until the offending rows are isolated; the rest is written. A rejected
+ * question is retried on later flushes and dropped (reported to error_logs)
+ * after MAX_REJECTIONS. Network and auth failures (expired JWT, RLS) are
+ * retried without limit.
+ */
+
+import { supabase } from './supabase';
+import { calculateNextReview, stateToInt } from './fsrs';
+import { STORES, idbSet, idbDelete, idbEntries } from './idb';
+import { invalidateQueries } from './queryCache';
+import { captureError } from './errorTracking';
+import { startSpan } from './perfTelemetry';
+
+const FLUSH_INTERVAL_MS = 15_000; // 15 seconds
+const MAX_PENDING = 50; // Backpressure: enqueue waits on a flush past this many answers
+const MAX_REJECTIONS = 5; // Rejected upserts before a question's answers are dropped
+const FAILURE_BACKOFF_MS = 30_000; // No backpressure waits this long after a failed flush
+const LOCK_NAME = 'progress-outbox';
+
+// Errors that depend on the session, not on the row: retry, never drop
+// (42501 RLS violation, PGRST301 invalid JWT, PGRST302 anonymous access)
+const RETRYABLE_CODES = new Set(['42501', 'PGRST301', 'PGRST302']);
+
+// Tables whose cached reads are stale once progress rows are written
+// (user_progress_rollup is maintained by a trigger on user_question_progress)
+export const PROGRESS_TABLES = ['user_question_progress', 'user_progress_rollup'];
+
+// Records that could not be stored in IndexedDB (private mode, quota):
+// key -> { userId, questionId, answers: [{ correct, at }], rejections }
+const memoryRecords = new Map();
+
+let flushPromise = null;
+let lastFailureAt = 0;
+let unflushed = 0; // Answers known to be waiting (this tab's view)
+let initialized = false;
+let recordSeq = 0;
+
+/**
+ * Build the user_question_progress row for one answer on top of `existing`
+ * @param {Object|null} existing - Current progress row (null if never seen)
+ * @param {string} userId
+ * @param {number|string} questionId
+ * @param {boolean} wasCorrect
+ * @param {Date} [answeredAt]
+ * @returns {Object} Row ready to upsert
+ */
+export function buildProgressRow(existing, userId, questionId, wasCorrect, answeredAt = new Date()) {
+  const fsrsResult = calculateNextReview(existing, wasCorrect, undefined, answeredAt);
+
+  return {
+    user_id: userId,
+    question_id: Number(questionId),
+    times_seen: (existing?.times_seen || 0) + 1,
+    times_correct: (existing?.times_correct || 0) + (wasCorrect ? 1 : 0),
+    stability: fsrsResult.stability || 1.0,
+    difficulty: fsrsResult.difficulty || 5.0,
+    scheduled_days: fsrsResult.interval || 1,
+    next_review: fsrsResult.nextReview.toISOString(),
+    last_review: answeredAt.toISOString(),
+    state: stateToInt(fsrsResult.state)
+  };
+}
+
+function recordKey(userId, questionId) {
+  recordSeq += 1;
+  return `${userId}:${Number(questionId)}:${Date.now()}:${recordSeq}:${Math.random().toString(36).slice(2, 8)}`;
+}
+
+async function writeRecord(key, record) {
+  const stored = await idbSet(STORES.PROGRESS_OUTBOX, key, record);
+  if (stored === undefined) {
+    memoryRecords.set(key, record);
+  } else {
+    memoryRecords.delete(key);
+  }
+}
+
+async function removeRecords(keys) {
+  for (const key of keys) {
+    memoryRecords.delete(key);
+    await idbDelete(STORES.PROGRESS_OUTBOX, key);
+  }
+}
+
+/**
+ * Queue an answer for write-behind persistence
+ *
+ * Resolves once the answer is durable locally. When more than MAX_PENDING
+ * answers are waiting it also waits for a flush (backpressure), unless the
+ * browser is offline or a flush failed in the last FAILURE_BACKOFF_MS: the
+ * answers stay queued and the periodic flush retries them.
+ *
+ * @param {string} userId
+ * @param {number|string} questionId
+ * @param {boolean} wasCorrect
+ * @returns {Promise<void>}
+ */
+export async function enqueueProgress(userId, questionId, wasCorrect) {
+  if (!userId || questionId == null) return;
+
+  // One record per answer: enqueueing never reads or rewrites what another
+  // tab may be flushing
+  await writeRecord(recordKey(userId, questionId), {
+    userId,
+    questionId: Number(questionId),
+    answers: [{ correct: !!wasCorrect, at: new Date().toISOString() }],
+    rejections: 0
+  });
+  unflushed += 1;
+
+  if (unflushed >= MAX_PENDING && canFlushNow()) {
+    await flushProgressOutbox();
+  }
+}
+
+function canFlushNow() {
+  if (typeof navigator !== 'undefined' && navigator.onLine === false) return false;
+  return Date.now() - lastFailureAt >= FAILURE_BACKOFF_MS;
+}
+
+async function getSessionUserId() {
+  const { data } = await supabase.auth.getSession();
+  return data?.session?.user?.id || null;
+}
+
+/**
+ * Group the stored records of one user by question, answers in time order
+ * @returns {Array} [{ userId, questionId, records, answers, rejections }]
+ */
+async function loadEntries(userId) {
+  const records = [...await idbEntries(STORES.PROGRESS_OUTBOX), ...memoryRecords];
+  const byQuestion = new Map();
+
+  for (const [key, record] of records) {
+    if (record?.userId !== userId || !record.answers?.length) continue;
+
+    let entry = byQuestion.get(record.questionId);
+    if (!entry) {
+      entry = { userId, questionId: record.questionId, records: new Map(), answers: [], rejections: 0 };
+      byQuestion.set(record.questionId, entry);
+    }
+    entry.records.set(key, record);
+    entry.answers.push(...record.answers);
+    entry.rejections = Math.max(entry.rejections, record.rejections || 0);
+  }
+
+  for (const entry of byQuestion.values()) {
+    entry.answers.sort((a, b) => (a.at < b.at ? -1 : a.at > b.at ? 1 : 0));
+  }
+  return [...byQuestion.values()];
+}
+
+/**
+ * Read the current progress rows of the questions being flushed
+ * @returns {Promise<Map|null>} questionId -> row, or null if the read failed
+ */
+async function loadBaseRows(userId, questionIds) {
+  const { data, error } = await supabase
+    .from('user_question_progress')
+    .select('*')
+    .eq('user_id', userId)
+    .in('question_id', questionIds);
+
+  if (error) {
+    console.error('[ProgressOutbox] Error loading progress rows:', error);
+    return null;
+  }
+
+  const bases = new Map();
+  for (const row of data || []) {
+    bases.set(Number(row.question_id), row);
+  }
+  return bases;
+}
+
+/**
+ * Upsert rows in one request; when the database rejects it, split the
+ * batch in halves until the rejected rows are isolated
+ * @param {Array} items - [{ entry, row }]
+ * @returns {Promise<Object>} { written, retry, rejected } - items by outcome
+ */
+async function upsertItems(items) {
+  const { error } = await supabase
+    .from('user_question_progress')
+    .upsert(items.map(item => item.row), { onConflict: 'user_id,question_id' });
+
+  if (!error) return { written: items, retry: [], rejected: [] };
+
+  // No PostgREST code (network / fetch failure) or a session problem:
+  // retry the whole batch later
+  if (!error.code || RETRYABLE_CODES.has(error.code)) {
+    console.error('[ProgressOutbox] Error flushing progress:', error);
+    return { written: [], retry: items, rejected: [] };
+  }
+
+  if (items.length === 1) {
+    console.error('[ProgressOutbox] Progress row rejected:', error);
+    return { written: [], retry: [], rejected: items };
+  }
+
+  const middle = Math.ceil(items.length / 2);
+  const first = await upsertItems(items.slice(0, middle));
+  const second = await upsertItems(items.slice(middle));
+  return {
+    written: [...first.written, ...second.written],
+    retry: [...first.retry, ...second.retry],
+    rejected: [...first.rejected, ...second.rejected]
+  };
+}
+
+/**
+ * Write one user's entries (one bulk upsert unless rows are rejected)
+ * @returns {Promise<Object>} { written, retry, rejected } - entries by outcome
+ */
+async function flushUser(userId, entries) {
+  const bases = await loadBaseRows(userId, entries.map(e => e.questionId));
+  if (!bases) return { written: [], retry: entries, rejected: [] };
+
+  const items = entries.map((entry) => {
+    let row = bases.get(entry.questionId) || null;
+    for (const answer of entry.answers) {
+      row = buildProgressRow(row, userId, entry.questionId, answer.correct, new Date(answer.at));
+    }
+    return { entry, row };
+  });
+
+  const result = await upsertItems(items);
+
+  if (result.written.length > 0) {
+    invalidateQueries(PROGRESS_TABLES);
+  }
+
+  return {
+    written: result.written.map(item => item.entry),
+    retry: result.retry.map(item => item.entry),
+    rejected: result.rejected.map(item => item.entry)
+  };
+}
+
+/**
+ * Flush the signed-in user's stored answers (caller holds the lock)
+ */
+async function drain() {
+  const userId = await getSessionUserId();
+  if (!userId) {
+    // Signed out: stored answers wait for their user's next login
+    unflushed = 0;
+    return true;
+  }
+
+  const entries = await loadEntries(userId);
+  if (entries.length === 0) {
+    unflushed = 0;
+    return true;
+  }
+
+  let result;
+  const endSpan = startSpan('outbox.flushUser');
+  try {
+    result = await flushUser(userId, entries);
+  } catch (err) {
+    console.error('[ProgressOutbox] Error in flush:', err);
+    result = { written: [], retry: entries, rejected: [] };
+  }
+  const ok = result.retry.length === 0 && result.rejected.length === 0;
+  endSpan({ error: !ok });
+
+  let remaining = 0;
+  for (const entry of result.written) {
+    await removeRecords(entry.records.keys());
+  }
+
+  for (const entry of result.retry) {
+    remaining += entry.answers.length;
+  }
+
+  for (const entry of result.rejected) {
+    const rejections = entry.rejections + 1;
+    if (rejections < MAX_REJECTIONS) {
+      for (const [key, record] of entry.records) {
+        await writeRecord(key, { ...record, rejections });
+      }
+      remaining += entry.answers.length;
+    } else {
+      // Poison entry: stop retrying it, keep a trace in error_logs
+      captureError('Progress entry dropped after repeated rejections', {
+        questionId: entry.questionId,
+        answers: entry.answers
+      });
+      await removeRecords(entry.records.keys());
+    }
+  }
+
+  unflushed = remaining;
+  if (!ok) lastFailureAt = Date.now();
+  return ok;
+}
+
+/**
+ * Run fn while holding the cross-tab outbox lock (Web Locks API); browsers
+ * without it only have the in-tab serialization of flushProgressOutbox
+ */
+function withOutboxLock(fn) {
+  if (typeof navigator !== 'undefined' && navigator.locks?.request) {
+    return navigator.locks.request(LOCK_NAME, fn);
+  }
+  return fn();
+}
+
+/**
+ * Flush the signed-in user's pending answers to Supabase
+ *
+ * Concurrent callers wait for the in-flight flush and then flush whatever was
+ * queued after it started, so awaiting this guarantees all answers queued
+ * before the call have been written (or retained for retry on failure).
+ *
+ * @returns {Promise<boolean>} true if everything pending was written
+ */
+export async function flushProgressOutbox() {
+  while (flushPromise) {
+    await flushPromise;
+  }
+
+  flushPromise = withOutboxLock(drain)
+    .catch((err) => {
+      console.error('[ProgressOutbox] Error in flush:', err);
+      lastFailureAt = Date.now();
+      return false;
+    })
+    .finally(() => {
+      flushPromise = null;
+    });
+  return flushPromise;
+}
+
+/**
+ * Number of answers waiting to be written (as last seen by this tab)
+ */
+export function getPendingProgressCount() {
+  return unflushed;
+}
+
+function flushIfOnline() {
+  if (typeof navigator !== 'undefined' && navigator.onLine === false) return;
+  if (unflushed === 0) return;
+  flushProgressOutbox();
+}
+
+/**
+ * Start background flushing; answers stored by a previous page load (or by
+ * tabs closed before they flushed) are written by the first flush
+ * Call once at app startup (main.jsx)
+ */
+export function initProgressOutbox() {
+  if (initialized) return;
+  initialized = true;
+
+  flushProgressOutbox();
+
+  setInterval(flushIfOnline, FLUSH_INTERVAL_MS);
+
+  window.addEventListener('online', flushIfOnline);
+
+  document.addEventListener('visibilitychange', () => {
+    if (document.visibilityState === 'hidden') flushIfOnline();
+  });
+
+  window.addEventListener('pagehide', flushIfOnline);
+}
+
+export default {
+  buildProgressRow,
+  enqueueProgress,
+  flushProgressOutbox,
+  getPendingProgressCount,
+  initProgressOutbox
+};
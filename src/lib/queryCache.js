@@ -0,0 +1,322 @@
+/**
+ * Query Cache (stale-while-revalidate)
+ *
+ * Shared cache in front of the supabase client for read queries issued by
+ * the data hooks. Entries are keyed by table/RPC name + params and:
+ *   - are served from memory while fresh (per-key TTL)
+ *   - are served immediately once stale, while a background refetch runs;
+ *     `onRevalidate` receives the fresh value
+ *   - share one in-flight request between concurrent callers
+ *   - are evicted least-recently-used past MAX_ENTRIES
+ *   - are persisted to IndexedDB, so a reload starts warm (stale) instead of
+ *     empty
+ *
+ * Each entry lists the tables it depends on. Writes call
+ * invalidateQueries(tables) to drop every dependent entry (memory and
+ * IndexedDB), so the next read goes to the network.
+ *
+ * Counters are available via getQueryCacheStats() (or window.queryCache.stats()
+ * in the browser console).
+ */
+
+import { supabase } from './supabase';
+import { STORES, idbSet, idbDelete, idbEntries } from './idb';
+
+const MAX_ENTRIES = 100;
+const DEFAULT_TTL_MS = 60_000; // 1 minute
+const MAX_PERSISTED_AGE_MS = 24 * 60 * 60 * 1000; // Drop persisted entries older than a day
+
+// key -> { value, storedAt, ttl, tables }  (Map order = LRU order, oldest first)
+const entries = new Map();
+// key -> { promise, token, tables }
+const inFlight = new Map();
+
+const stats = {
+  hits: 0,
+  staleHits: 0,
+  misses: 0,
+  deduped: 0,
+  revalidations: 0,
+  evictions: 0,
+  invalidations: 0,
+  errors: 0
+};
+
+let hydratePromise = null;
+let nextToken = 0;
+// Bumped by clearQueryCache so a hydration still in progress is discarded
+let generation = 0;
+
+/**
+ * Stable JSON (sorted object keys) so equal params give equal keys
+ */
+function stableStringify(value) {
+  if (value === undefined) return '';
+  if (value === null || typeof value !== 'object') return JSON.stringify(value);
+  if (Array.isArray(value)) return `[${value.map(stableStringify).join(',')}]`;
+  return `{${Object.keys(value)
+    .filter(k => value[k] !== undefined)
+    .sort()
+    .map(k => `${JSON.stringify(k)}:${stableStringify(value[k])}`)
+    .join(',')}}`;
+}
+
+/**
+ * Build a cache key from a table/RPC name and its params
+ * @param {string} name - e.g. 'topics' or 'rpc:get_topic_question_counts'
+ * @param {Object} [params]
+ * @returns {string}
+ */
+export function queryKey(name, params) {
+  return params === undefined ? name : `${name}?${stableStringify(params)}`;
+}
+
+/**
+ * Load persisted entries into memory once (warm start)
+ */
+function hydrate() {
+  if (hydratePromise) return hydratePromise;
+
+  const hydrateGeneration = generation;
+  hydratePromise = idbEntries(STORES.QUERY_CACHE).then((persisted) => {
+    if (hydrateGeneration !== generation) return;
+    const now = Date.now();
+    persisted
+      .filter(([, entry]) => entry && now - entry.storedAt < MAX_PERSISTED_AGE_MS)
+      .sort(([, a], [, b]) => a.storedAt - b.storedAt)
+      .forEach(([key, entry]) => {
+        // Anything written since startup is newer than the persisted copy
+        if (!entries.has(key)) entries.set(key, entry);
+      });
+
+    for (const [key, entry] of persisted) {
+      if (!entry || now - entry.storedAt >= MAX_PERSISTED_AGE_MS) idbDelete(STORES.QUERY_CACHE, key);
+    }
+    evictOverflow();
+  });
+
+  return hydratePromise;
+}
+
+function touch(key, entry) {
+  entries.delete(key);
+  entries.set(key, entry);
+}
+
+function evictOverflow() {
+  while (entries.size > MAX_ENTRIES) {
+    const oldestKey = entries.keys().next().value;
+    entries.delete(oldestKey);
+    idbDelete(STORES.QUERY_CACHE, oldestKey);
+    stats.evictions++;
+  }
+}
+
+function store(key, value, { ttl, tables, persist }) {
+  const entry = { value, storedAt: Date.now(), ttl, tables };
+  touch(key, entry);
+  evictOverflow();
+  if (persist) idbSet(STORES.QUERY_CACHE, key, entry);
+}
+
+/**
+ * Fetch (or join the in-flight fetch for) a key and store the result
+ */
+function fetchInto(key, fetcher, options) {
+  const existing = inFlight.get(key);
+  if (existing) {
+    stats.deduped++;
+    return existing.promise;
+  }
+
+  const token = ++nextToken;
+  const promise = Promise.resolve()
+    .then(fetcher)
+    .then((value) => {
+      // Skip the write if the key was invalidated while this was in flight
+      if (inFlight.get(key)?.token === token) store(key, value, options);
+      return value;
+    })
+    .catch((err) => {
+      stats.errors++;
+      throw err;
+    })
+    .finally(() => {
+      if (inFlight.get(key)?.token === token) inFlight.delete(key);
+    });
+
+  inFlight.set(key, { promise, token, tables: options.tables });
+  return promise;
+}
+
+/**
+ * Read through the cache
+ *
+ * @param {string} key - From queryKey()
+ * @param {Function} fetcher - Resolves to the value to cache, rejects on error (never cached)
+ * @param {Object} [options]
+ * @param {number} [options.ttl=60000] - Milliseconds the value is served without refetching
+ * @param {string[]} [options.tables=[]] - Tables whose writes invalidate this entry
+ * @param {boolean} [options.persist=true] - Persist to IndexedDB
+ * @param {Function} [options.onRevalidate] - Called with the fresh value after a stale hit
+ * @returns {Promise<*>} Cached or fetched value
+ */
+export async function cachedQuery(key, fetcher, options = {}) {
+  const {
+    ttl = DEFAULT_TTL_MS,
+    tables = [],
+    persist = true,
+    onRevalidate
+  } = options;
+  const storeOptions = { ttl, tables, persist };
+
+  await hydrate();
+
+  const entry = entries.get(key);
+  if (!entry) {
+    stats.misses++;
+    return fetchInto(key, fetcher, storeOptions);
+  }
+
+  touch(key, entry);
+
+  if (Date.now() - entry.storedAt < entry.ttl) {
+    stats.hits++;
+    return entry.value;
+  }
+
+  // Stale: answer now, refresh in the background
+  stats.staleHits++;
+  stats.revalidations++;
+  fetchInto(key, fetcher, storeOptions)
+    .then((value) => onRevalidate?.(value))
+    .catch((err) => console.warn(`[queryCache] Revalidation failed for ${key}:`, err?.message || err));
+
+  return entry.value;
+}
+
+/**
+ * Run a supabase query and turn its { error } into a rejection
+ */
+async function runQuery(query) {
+  const { data, count, error } = await query;
+  if (error) throw error;
+  return { data, count: count ?? null };
+}
+
+// Resolve to supabase's { data, count, error } shape so call sites stay unchanged
+function settle(promise) {
+  return promise.then(
+    result => ({ ...result, error: null }),
+    error => ({ data: null, count: null, error })
+  );
+}
+
+/**
+ * Cached `supabase.from(table)` read
+ *
+ * @param {string} table
+ * @param {Object} params - Everything the query depends on (filters, columns, user id)
+ * @param {Function} build - (supabase.from(table)) => query builder
+ * @param {Object} [options] - cachedQuery options; `tables` defaults to [table]
+ * @returns {Promise<Object>} { data, count, error }
+ */
+export function cachedFrom(table, params, build, options = {}) {
+  return settle(cachedQuery(
+    queryKey(table, params),
+    () => runQuery(build(supabase.from(table))),
+    { tables: [table], ...options }
+  ));
+}
+
+/**
+ * Cached `supabase.rpc(fn, args)` call
+ *
+ * @param {string} fn - RPC name
+ * @param {Object} [args]
+ * @param {Object} [options] - cachedQuery options (list the tables the RPC reads)
+ * @returns {Promise<Object>} { data, count, error }
+ */
+export function cachedRpc(fn, args, options = {}) {
+  return settle(cachedQuery(
+    queryKey(`rpc:${fn}`, args),
+    () => runQuery(supabase.rpc(fn, args)),
+    options
+  ));
+}
+
+/**
+ * Drop every entry depending on any of `tables`
+ * @param {string|string[]} tables
+ * @returns {number} Entries removed
+ */
+export function invalidateQueries(tables) {
+  const targets = new Set(Array.isArray(tables) ? tables : [tables]);
+  let removed = 0;
+
+  const matches = (entryTables) => (entryTables || []).some(t => targets.has(t));
+
+  for (const [key, entry] of entries) {
+    if (!matches(entry.tables)) continue;
+    entries.delete(key);
+    idbDelete(STORES.QUERY_CACHE, key);
+    removed++;
+  }
+
+  // In-flight fetches for these tables may carry pre-write data: detach them
+  // so their result isn't stored and the next read starts a new request.
+  // The pending promise still settles for callers already awaiting it.
+  for (const [key, request] of inFlight) {
+    if (matches(request.tables)) inFlight.delete(key);
+  }
+
+  stats.invalidations += removed;
+  return removed;
+}
+
+/**
+ * Drop everything (memory and IndexedDB), e.g. on sign-out
+ */
+export function clearQueryCache() {
+  for (const key of entries.keys()) idbDelete(STORES.QUERY_CACHE, key);
+  entries.clear();
+  inFlight.clear();
+  generation++;
+  hydratePromise = Promise.resolve();
+  idbEntries(STORES.QUERY_CACHE).then((persisted) => {
+    for (const [key] of persisted) idbDelete(STORES.QUERY_CACHE, key);
+  });
+}
+
+/**
+ * Cache counters
+ * @returns {Object} { hits, staleHits, misses, deduped, revalidations, evictions, invalidations, errors, hitRate, size, inFlight }
+ */
+export function getQueryCacheStats() {
+  const lookups = stats.hits + stats.staleHits + stats.misses;
+  return {
+    ...stats,
+    hitRate: lookups > 0 ? Math.round(((stats.hits + stats.staleHits) / lookups) * 100) : 0,
+    size: entries.size,
+    inFlight: inFlight.size
+  };
+}
+
+// Inspect from the browser console
+if (typeof window !== 'undefined') {
+  window.queryCache = {
+    stats: getQueryCacheStats,
+    invalidate: invalidateQueries,
+    clear: clearQueryCache
+  };
+}
+
+export default {
+  queryKey,
+  cachedQuery,
+  cachedFrom,
+  cachedRpc,
+  invalidateQueries,
+  clearQueryCache,
+  getQueryCacheStats
+};
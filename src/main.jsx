@@ -4,6 +4,8 @@ import '@fontsource-variable/inter'
 import './index.css'
 import './lib/storage.js'
 import { initErrorTracking } from './lib/errorTracking.js'
+import { initProgressOutbox } from './lib/progressOutbox.js'
+import { initPerfTelemetry } from './lib/perfTelemetry.js'
 import { AppRouter } from './router'
 import { AuthProvider } from './contexts/AuthContext.jsx'
 import { AdminProvider } from './contexts/AdminContext.jsx'
@@ -11,6 +13,12 @@ import { AdminProvider } from './contexts/AdminContext.jsx'
 // Initialize global error tracking
 initErrorTracking()
 
+// Latency histograms (supabase calls, web vitals), flushed with the error queue
+initPerfTelemetry()
+
+// Restore and periodically flush queued FSRS progress updates
+initProgressOutbox()
+
 createRoot(document.getElementById('root')).render(
   <StrictMode>
     <AuthProvider>
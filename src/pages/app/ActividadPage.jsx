@@ -28,7 +28,10 @@ export default function ActividadPageWrapper() {
     fsrsStats,
     simulacroAvg,
     fetchActivityData,
-    formatRelativeDate
+    formatRelativeDate,
+    hasMoreSessions,
+    loadingMoreSessions,
+    loadMoreSessions
   } = useActivityData();
 
   // Fetch data on mount
@@ -127,6 +130,9 @@ export default function ActividadPageWrapper() {
       fsrsStats={fsrsStats}
       simulacroAvg={simulacroAvg}
       weeklyData={weeklyData}
+      hasMoreSessions={hasMoreSessions}
+      loadingMoreSessions={loadingMoreSessions}
+      onLoadMoreSessions={loadMoreSessions}
     />
   ) : (
     <ActividadPage
@@ -140,6 +146,9 @@ export default function ActividadPageWrapper() {
       simulacroAvg={simulacroAvg}
       onStartTest={handleStartTest}
       formatRelativeDate={formatRelativeDate}
+      hasMoreSessions={hasMoreSessions}
+      loadingMoreSessions={loadingMoreSessions}
+      onLoadMoreSessions={loadMoreSessions}
     />
   );
 
@@ -4,17 +4,19 @@
  * Topics list and progress view with optional roadmap visualization.
  */
 
-import { useState, useMemo } from 'react';
+import { useState, useMemo, lazy, Suspense } from 'react';
 import { useNavigate } from 'react-router-dom';
 import { List, Network, Hexagon } from 'lucide-react';
 import { useAuth } from '../../contexts/AuthContext';
 import GuestLock from '../../components/common/GuestLock';
 import TemasListView from '../../components/temas/TemasListView';
 import TopicRoadmap from '../../components/temas/TopicRoadmap';
-import { TemarioDendrite } from '../../features/draft/TemarioGraph';
 import { ROUTES } from '../../router/routes';
 import { useTopics } from '../../hooks/useTopics';
 
+// Graph view pulls in the force-graph libraries: load it only when selected
+const TemarioDendrite = lazy(() => import('../../features/draft/TemarioGraph/TemarioDendrite'));
+
 export default function TemasPage() {
   const { user } = useAuth();
   const navigate = useNavigate();
@@ -139,11 +141,13 @@ export default function TemasPage() {
       )}
       {viewMode === 'dendrite' && (
         <div className="h-[650px] bg-slate-50 rounded-2xl overflow-hidden border border-gray-200">
-          <TemarioDendrite
-            userProgress={userProgress}
-            questionCounts={questionCounts}
-            onStudy={handleDendriteStudy}
-          />
+          <Suspense fallback={<div className="w-full h-full flex items-center justify-center text-sm text-gray-400">Cargando grafo...</div>}>
+            <TemarioDendrite
+              userProgress={userProgress}
+              questionCounts={questionCounts}
+              onStudy={handleDendriteStudy}
+            />
+          </Suspense>
         </div>
       )}
     </div>
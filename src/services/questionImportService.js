@@ -5,49 +5,144 @@
 
 import { supabase } from '../lib/supabase';
 import { transformQuestionForSupabase, validateQuestions } from '../utils/questionValidator';
+import { createSimilarityIndex } from '../utils/questionSimilarity';
+import { createBlobWriter, downloadBlob } from '../utils/blobWriter';
+
+const INDEX_PAGE_SIZE = 1000;
 
 /**
- * Check for duplicate questions by similar text
- * @param {string} questionText - Question text to check
- * @returns {Promise<boolean>} True if duplicate found
+ * Build a near-duplicate index over the whole question bank
+ * Pages through questions by id (keyset) so the entire bank is covered,
+ * not just the first 1000 rows.
+ * @param {Function} [onPage] - Called with the number of rows indexed so far
+ * @returns {Promise<Object>} Similarity index (see utils/questionSimilarity)
  */
-async function checkDuplicate(questionText) {
-  const normalizedText = questionText.toLowerCase().trim().replace(/\s+/g, ' ');
+export async function buildQuestionSimilarityIndex(onPage = null) {
+  const index = createSimilarityIndex();
+  let lastId = null;
 
-  // Get existing questions and check for similarity
-  const { data, error } = await supabase
-    .from('questions')
-    .select('question_text')
-    .limit(1000);
+  for (;;) {
+    let query = supabase
+      .from('questions')
+      .select('id, question_text')
+      .order('id', { ascending: true })
+      .limit(INDEX_PAGE_SIZE);
 
-  if (error) {
-    console.error('Error checking duplicates:', error);
-    return false;
+    if (lastId !== null) query = query.gt('id', lastId);
+
+    const { data, error } = await query;
+
+    if (error) {
+      throw new Error(`Error indexando preguntas existentes: ${error.message}`);
+    }
+
+    for (const q of data || []) {
+      if (q.question_text) index.add(q.id, q.question_text);
+    }
+
+    if (onPage) onPage(index.size);
+
+    if (!data || data.length < INDEX_PAGE_SIZE) break;
+    lastId = data[data.length - 1].id;
   }
 
-  // Simple similarity check (exact match after normalization)
-  return data.some(q => {
-    const existingNormalized = q.question_text.toLowerCase().trim().replace(/\s+/g, ' ');
-    // Check for high similarity (>90% match)
-    return existingNormalized === normalizedText ||
-           calculateSimilarity(existingNormalized, normalizedText) > 0.9;
+  return index;
+}
+
+/**
+ * Record a duplicate in the import result
+ * @param {Object} result - Import result (mutated)
+ * @param {number} index - Position in the import
+ * @param {Object} match - findDuplicate() match
+ * @param {string} questionText
+ */
+function recordDuplicate(result, index, match, questionText) {
+  const inBatch = typeof match.id === 'string' && match.id.startsWith('import:');
+  result.duplicates++;
+  result.details.push({
+    index,
+    status: 'duplicate',
+    duplicateOf: inBatch ? { index: Number(match.id.slice(7)) } : { id: match.id },
+    question: questionText.substring(0, 50) + '...'
   });
 }
 
 /**
- * Calculate similarity between two strings (Jaccard similarity)
- * @param {string} str1
- * @param {string} str2
- * @returns {number} Similarity score 0-1
+ * Insert one question and record the outcome
+ * @param {Object} q - { data, index, questionText }
+ * @param {Object} result - Import result (mutated)
+ * @returns {Promise<boolean>} true if inserted
  */
-function calculateSimilarity(str1, str2) {
-  const words1 = new Set(str1.split(' '));
-  const words2 = new Set(str2.split(' '));
+async function insertQuestionSingle(q, result) {
+  try {
+    const { data, error } = await supabase
+      .from('questions')
+      .insert(q.data)
+      .select('id')
+      .single();
+
+    if (error) throw error;
+
+    result.imported++;
+    result.details.push({
+      index: q.index,
+      status: 'imported',
+      id: data?.id,
+      question: q.questionText.substring(0, 50) + '...'
+    });
+    return true;
+  } catch (err) {
+    result.errors.push(`Pregunta ${q.index + 1}: ${err.message}`);
+    result.details.push({
+      index: q.index,
+      status: 'error',
+      error: err.message,
+      question: q.questionText.substring(0, 50) + '...'
+    });
+    return false;
+  }
+}
+
+/**
+ * Bulk insert questions, falling back to individual inserts if the batch fails
+ * @param {Object[]} questionsToInsert - [{ data, index, questionText }]
+ * @param {Object} result - Import result (mutated)
+ * @returns {Promise<Object[]>} The entries that were inserted
+ */
+async function insertQuestionBatch(questionsToInsert, result) {
+  if (questionsToInsert.length === 0) return [];
+
+  try {
+    const { data, error } = await supabase
+      .from('questions')
+      .insert(questionsToInsert.map(q => q.data))
+      .select('id');
+
+    if (!error) {
+      // Success: record all imported questions
+      data.forEach((item, idx) => {
+        const q = questionsToInsert[idx];
+        result.imported++;
+        result.details.push({
+          index: q.index,
+          status: 'imported',
+          id: item.id,
+          question: q.questionText.substring(0, 50) + '...'
+        });
+      });
+      return questionsToInsert;
+    }
 
-  const intersection = new Set([...words1].filter(x => words2.has(x)));
-  const union = new Set([...words1, ...words2]);
+    console.warn('Bulk insert failed, falling back to individual inserts:', error);
+  } catch (err) {
+    console.error('Batch insert error:', err);
+  }
 
-  return intersection.size / union.size;
+  const inserted = [];
+  for (const q of questionsToInsert) {
+    if (await insertQuestionSingle(q, result)) inserted.push(q);
+  }
+  return inserted;
 }
 
 /**
@@ -61,7 +156,9 @@ export async function importQuestions(questions, options = {}) {
     skipDuplicates = true,
     validateBeforeImport = true,
     batchSize = 50, // Process in batches of 50 questions
-    onProgress = null // Callback for progress updates: (imported, total) => {}
+    // Callback for progress updates: (imported, total, { phase, processed }) => {}
+    // phase is 'indexing' (processed = bank rows indexed) or 'importing'
+    onProgress = null
   } = options;
 
   const result = {
@@ -81,9 +178,20 @@ export async function importQuestions(questions, options = {}) {
     questions = validation.validQuestions;
   }
 
-  // If skip duplicates is enabled, we need to check each question individually
+  // If skip duplicates is enabled, index the bank once and check every
+  // question (including earlier ones in this import) against it.
   // Otherwise, we can use bulk insert for better performance
   if (skipDuplicates) {
+    let similarityIndex;
+    try {
+      similarityIndex = await buildQuestionSimilarityIndex(indexed => {
+        if (onProgress) onProgress(0, questions.length, { phase: 'indexing', processed: indexed });
+      });
+    } catch (err) {
+      result.errors.push(err.message);
+      return result;
+    }
+
     // Process in batches but check duplicates
     const batches = [];
     for (let i = 0; i < questions.length; i += batchSize) {
@@ -93,6 +201,10 @@ export async function importQuestions(questions, options = {}) {
     for (let batchIndex = 0; batchIndex < batches.length; batchIndex++) {
       const batch = batches[batchIndex];
       const questionsToInsert = [];
+      // Copies of a question still waiting in this batch: decided after the
+      // insert, since a failed insert must not make them duplicates
+      const pendingIndex = createSimilarityIndex();
+      const deferred = [];
       const batchOffset = batchIndex * batchSize;
 
       // Check duplicates for this batch
@@ -102,22 +214,25 @@ export async function importQuestions(questions, options = {}) {
         const mainQuestionText = question.reformulated_text || question.question_text;
 
         try {
-          const isDuplicate = await checkDuplicate(mainQuestionText);
-          if (isDuplicate) {
-            result.duplicates++;
-            result.details.push({
-              index: globalIndex,
-              status: 'duplicate',
-              question: mainQuestionText.substring(0, 50) + '...'
-            });
+          const match = similarityIndex.findDuplicate(mainQuestionText);
+          if (match) {
+            recordDuplicate(result, globalIndex, match, mainQuestionText);
+            continue;
+          }
+
+          const supabaseQuestion = transformQuestionForSupabase(question);
+          delete supabaseQuestion.id;
+          const entry = {
+            data: supabaseQuestion,
+            index: globalIndex,
+            questionText: mainQuestionText
+          };
+
+          if (pendingIndex.findDuplicate(mainQuestionText)) {
+            deferred.push(entry);
           } else {
-            const supabaseQuestion = transformQuestionForSupabase(question);
-            delete supabaseQuestion.id;
-            questionsToInsert.push({
-              data: supabaseQuestion,
-              index: globalIndex,
-              questionText: mainQuestionText
-            });
+            pendingIndex.add(globalIndex, mainQuestionText);
+            questionsToInsert.push(entry);
           }
         } catch (err) {
           result.errors.push(`Pregunta ${globalIndex + 1}: ${err.message}`);
@@ -131,108 +246,28 @@ export async function importQuestions(questions, options = {}) {
       }
 
       // Bulk insert non-duplicate questions
-      if (questionsToInsert.length > 0) {
-        try {
-          const { data, error } = await supabase
-            .from('questions')
-            .insert(questionsToInsert.map(q => q.data))
-            .select('id');
-
-          if (error) {
-            // If bulk insert fails, fall back to individual inserts
-            console.warn('Bulk insert failed, falling back to individual inserts:', error);
-            for (const q of questionsToInsert) {
-              try {
-                const { data: singleData, error: singleError } = await supabase
-                  .from('questions')
-                  .insert(q.data)
-                  .select('id')
-                  .single();
-
-                if (singleError) {
-                  result.errors.push(`Pregunta ${q.index + 1}: ${singleError.message}`);
-                  result.details.push({
-                    index: q.index,
-                    status: 'error',
-                    error: singleError.message,
-                    question: q.questionText.substring(0, 50) + '...'
-                  });
-                } else {
-                  result.imported++;
-                  result.details.push({
-                    index: q.index,
-                    status: 'imported',
-                    id: singleData?.id,
-                    question: q.questionText.substring(0, 50) + '...'
-                  });
-                }
-              } catch (singleErr) {
-                result.errors.push(`Pregunta ${q.index + 1}: ${singleErr.message}`);
-                result.details.push({
-                  index: q.index,
-                  status: 'error',
-                  error: singleErr.message,
-                  question: q.questionText.substring(0, 50) + '...'
-                });
-              }
-            }
-          } else {
-            // Success: record all imported questions
-            data.forEach((item, idx) => {
-              const q = questionsToInsert[idx];
-              result.imported++;
-              result.details.push({
-                index: q.index,
-                status: 'imported',
-                id: item.id,
-                question: q.questionText.substring(0, 50) + '...'
-              });
-            });
-          }
-        } catch (err) {
-          // Unexpected error, try individual inserts
-          console.error('Batch insert error:', err);
-          for (const q of questionsToInsert) {
-            try {
-              const { data: singleData, error: singleError } = await supabase
-                .from('questions')
-                .insert(q.data)
-                .select('id')
-                .single();
-
-              if (singleError) {
-                result.errors.push(`Pregunta ${q.index + 1}: ${singleError.message}`);
-                result.details.push({
-                  index: q.index,
-                  status: 'error',
-                  error: singleError.message,
-                  question: q.questionText.substring(0, 50) + '...'
-                });
-              } else {
-                result.imported++;
-                result.details.push({
-                  index: q.index,
-                  status: 'imported',
-                  id: singleData?.id,
-                  question: q.questionText.substring(0, 50) + '...'
-                });
-              }
-            } catch (singleErr) {
-              result.errors.push(`Pregunta ${q.index + 1}: ${singleErr.message}`);
-              result.details.push({
-                index: q.index,
-                status: 'error',
-                error: singleErr.message,
-                question: q.questionText.substring(0, 50) + '...'
-              });
-            }
-          }
+      const inserted = await insertQuestionBatch(questionsToInsert, result);
+
+      // Only questions that were actually inserted count for later checks
+      for (const q of inserted) {
+        similarityIndex.add(`import:${q.index}`, q.questionText);
+      }
+
+      for (const q of deferred) {
+        const match = similarityIndex.findDuplicate(q.questionText);
+        if (match) {
+          recordDuplicate(result, q.index, match, q.questionText);
+        } else if (await insertQuestionSingle(q, result)) {
+          similarityIndex.add(`import:${q.index}`, q.questionText);
         }
       }
 
       // Call progress callback
       if (onProgress) {
-        onProgress(result.imported, questions.length);
+        onProgress(result.imported, questions.length, {
+          phase: 'importing',
+          processed: Math.min(batchOffset + batch.length, questions.length)
+        });
       }
     }
   } else {
@@ -293,7 +328,10 @@ export async function importQuestions(questions, options = {}) {
 
       // Call progress callback
       if (onProgress) {
-        onProgress(result.imported, questions.length);
+        onProgress(result.imported, questions.length, {
+          phase: 'importing',
+          processed: Math.min(batchOffset + batch.length, questions.length)
+        });
       }
     }
   }
@@ -301,12 +339,14 @@ export async function importQuestions(questions, options = {}) {
   return result;
 }
 
+const EXPORT_PAGE_SIZE = 500;
+
 /**
- * Export questions from Supabase
- * @param {Object} filters - Filter options
- * @returns {Promise<Object>} Export result with questions
+ * Apply export filters to a questions query
+ * Equality filters on tema / materia / difficulty / validation_status /
+ * tier are served by the partial indexes on active questions
  */
-export async function exportQuestions(filters = {}) {
+function applyExportFilters(query, filters) {
   const {
     tema,
     materia,
@@ -314,18 +354,10 @@ export async function exportQuestions(filters = {}) {
     validation_status,
     difficulty,
     minConfidence,
-    maxConfidence,
-    limit = 1000
+    maxConfidence
   } = filters;
 
-  let query = supabase
-    .from('questions')
-    .select('*')
-    .eq('is_active', true)
-    .order('created_at', { ascending: false })
-    .limit(limit);
-
-  // Apply filters
+  query = query.eq('is_active', true);
   if (tema) query = query.eq('tema', tema);
   if (materia) query = query.eq('materia', materia);
   if (tier) query = query.eq('tier', tier);
@@ -333,19 +365,14 @@ export async function exportQuestions(filters = {}) {
   if (difficulty) query = query.eq('difficulty', difficulty);
   if (minConfidence !== undefined) query = query.gte('confidence_score', minConfidence);
   if (maxConfidence !== undefined) query = query.lte('confidence_score', maxConfidence);
+  return query;
+}
 
-  const { data, error } = await query;
-
-  if (error) {
-    return {
-      success: false,
-      error: error.message,
-      questions: []
-    };
-  }
-
-  // Transform back to export format
-  const exportQuestions = data.map(q => ({
+/**
+ * Transform a questions row back to import format
+ */
+function toExportFormat(q) {
+  return {
     question_text: q.question_text,
     original_text: q.original_text,
     options: q.options, // Already in correct JSONB format
@@ -359,16 +386,159 @@ export async function exportQuestions(filters = {}) {
     confidence_score: q.confidence_score,
     tier: q.tier,
     validation_status: q.validation_status
-  }));
+  };
+}
+
+function cancelledError() {
+  const err = new Error('Exportación cancelada');
+  err.name = 'AbortError';
+  return err;
+}
+
+/**
+ * Page through the filtered questions by id (keyset)
+ * Each page is one indexed range scan; no OFFSET, no full-table sort.
+ * @param {Object} filters - Filter options (see exportQuestions)
+ * @param {Object} [options]
+ * @param {number} [options.pageSize=500]
+ * @param {number} [options.limit=Infinity] - Stop after this many rows
+ * @param {AbortSignal} [options.signal] - Cancels between and during pages
+ * @yields {Object[]} Rows of each page, in import format
+ */
+export async function* streamQuestions(filters = {}, options = {}) {
+  const { pageSize = EXPORT_PAGE_SIZE, limit = Infinity, signal } = options;
+  let lastId = null;
+  let remaining = limit;
+
+  while (remaining > 0) {
+    if (signal?.aborted) throw cancelledError();
+
+    const size = Math.min(pageSize, remaining);
+    let query = applyExportFilters(supabase.from('questions').select('*'), filters)
+      .order('id', { ascending: true })
+      .limit(size);
+
+    if (lastId !== null) query = query.gt('id', lastId);
+    if (signal) query = query.abortSignal(signal);
+
+    const { data, error } = await query;
+
+    if (signal?.aborted) throw cancelledError();
+    if (error) throw new Error(error.message);
+
+    if (data?.length) {
+      yield data.map(toExportFormat);
+      remaining -= data.length;
+      lastId = data[data.length - 1].id;
+    }
+
+    if (!data || data.length < size) break;
+  }
+}
+
+/**
+ * Estimated number of questions matching the filters (planner estimate
+ * for large results, exact for small ones; no full count)
+ * @param {Object} filters
+ * @returns {Promise<number|null>}
+ */
+export async function estimateExportCount(filters = {}) {
+  const { count, error } = await applyExportFilters(
+    supabase.from('questions').select('id', { count: 'estimated', head: true }),
+    filters
+  );
+  return error ? null : count;
+}
+
+/**
+ * Export questions from Supabase (newest first, bounded: used for previews)
+ * Full exports go through streamQuestions / exportQuestionsToBlob instead.
+ * @param {Object} filters - Filter options
+ * @param {number} [filters.limit=1000] - Maximum rows (one request)
+ * @returns {Promise<Object>} Export result with questions
+ */
+export async function exportQuestions(filters = {}) {
+  const { limit = 1000 } = filters;
+
+  // id breaks created_at ties so the order is stable (batch imports share
+  // a timestamp)
+  const { data, error } = await applyExportFilters(supabase.from('questions').select('*'), filters)
+    .order('created_at', { ascending: false })
+    .order('id', { ascending: false })
+    .limit(limit);
+
+  if (error) {
+    return {
+      success: false,
+      error: error.message,
+      questions: []
+    };
+  }
+
+  const questions = (data || []).map(toExportFormat);
 
   return {
     success: true,
-    questions: exportQuestions,
-    count: exportQuestions.length,
+    questions,
+    count: questions.length,
     filters: filters
   };
 }
 
+/**
+ * Export every matching question into a Blob, page by page
+ *
+ * JSON output is `{ "questions": [...] }` (the import format); NDJSON writes
+ * one question per line. Rows are serialized as they arrive, so memory
+ * holds one page plus the Blob parts, never the whole bank.
+ *
+ * @param {Object} filters - Filter options (see exportQuestions; no limit)
+ * @param {Object} [options]
+ * @param {'json'|'ndjson'} [options.format='json']
+ * @param {Function} [options.onProgress] - Called with { exported, estimatedTotal }
+ * @param {AbortSignal} [options.signal] - Cancel the export
+ * @returns {Promise<Object>} { success, blob, count, format } or { success: false, cancelled?, error }
+ */
+export async function exportQuestionsToBlob(filters = {}, options = {}) {
+  const { format = 'json', onProgress = null, signal } = options;
+  const ndjson = format === 'ndjson';
+  const writer = createBlobWriter(ndjson ? 'application/x-ndjson' : 'application/json');
+  let exported = 0;
+
+  try {
+    const estimatedTotal = await estimateExportCount(filters);
+    if (onProgress) onProgress({ exported, estimatedTotal });
+
+    if (!ndjson) writer.write('{"questions":[');
+
+    for await (const page of streamQuestions(filters, { signal })) {
+      for (const q of page) {
+        if (ndjson) {
+          writer.write(`${JSON.stringify(q)}\n`);
+        } else {
+          writer.write(`${exported > 0 ? ',' : ''}\n${JSON.stringify(q)}`);
+        }
+        exported++;
+      }
+      if (onProgress) onProgress({ exported, estimatedTotal });
+    }
+
+    if (!ndjson) writer.write('\n]}\n');
+  } catch (err) {
+    if (err.name === 'AbortError' || signal?.aborted) {
+      return { success: false, cancelled: true, error: 'Exportación cancelada', count: exported };
+    }
+    return { success: false, error: err.message, count: exported };
+  }
+
+  return {
+    success: true,
+    blob: writer.close(),
+    count: exported,
+    format
+  };
+}
+
 /**
  * Get question statistics
  * @returns {Promise<Object>} Statistics
@@ -414,22 +584,28 @@ export async function getQuestionStats() {
  * @param {string} filename - Filename without extension
  */
 export function downloadAsJSON(questions, filename = 'questions_export') {
-  const dataStr = JSON.stringify({ questions }, null, 2);
-  const dataBlob = new Blob([dataStr], { type: 'application/json' });
-  const url = URL.createObjectURL(dataBlob);
-
-  const link = document.createElement('a');
-  link.href = url;
-  link.download = `${filename}_${new Date().toISOString().split('T')[0]}.json`;
-  document.body.appendChild(link);
-  link.click();
-  document.body.removeChild(link);
-  URL.revokeObjectURL(url);
+  const dataBlob = new Blob([JSON.stringify({ questions }, null, 2)], { type: 'application/json' });
+  downloadExport(dataBlob, filename, 'json');
+}
+
+/**
+ * Download an export Blob (from exportQuestionsToBlob)
+ * @param {Blob} blob
+ * @param {string} filename - Filename without extension
+ * @param {'json'|'ndjson'} [format='json']
+ */
+export function downloadExport(blob, filename = 'questions_export', format = 'json') {
+  downloadBlob(blob, `${filename}_${new Date().toISOString().split('T')[0]}.${format}`);
 }
 
 export default {
+  buildQuestionSimilarityIndex,
   importQuestions,
+  streamQuestions,
+  estimateExportCount,
   exportQuestions,
+  exportQuestionsToBlob,
   getQuestionStats,
-  downloadAsJSON
+  downloadAsJSON,
+  downloadExport
 };
@@ -286,24 +286,43 @@ export async function rotateFreeTier(percentage = 30) {
 }
 
 /**
- * Get questions with pagination for admin
+ * Get questions for the admin grid, one keyset page at a time
+ *
+ * Pages are ordered by id (primary key) and continue from `cursor`, so every
+ * page is an index range scan regardless of depth (no OFFSET). The count is
+ * the planner estimate and is only requested for the first page.
+ *
+ * The offset options of the previous signature (`page`, `sortBy`) can't be
+ * honoured and are rejected with an error instead of being ignored.
+ *
  * @param {Object} options
- * @returns {Promise<Object>} { data, count, error }
+ * @param {number} [options.perPage=50]
+ * @param {Object|null} [options.cursor] - nextCursor of the previous page
+ * @param {boolean} [options.sortAsc=false] - Oldest first
+ * @returns {Promise<Object>} { data, count, nextCursor, error } (count null after the first page)
  */
 export async function getQuestionsAdmin(options = {}) {
   const {
-    page = 1,
-    perPage = 20,
+    perPage = 50,
+    cursor = null,
     tier = null,
     tema = null,
     search = null,
-    sortBy = 'created_at',
     sortAsc = false
   } = options;
 
+  const legacy = ['page', 'sortBy'].filter(name => options[name] !== undefined);
+  if (legacy.length > 0) {
+    const error = new Error(
+      `getQuestionsAdmin: ${legacy.join(', ')} no longer supported; pages are keyset cursors ordered by id (pass cursor / sortAsc)`
+    );
+    console.error(error.message);
+    return { data: null, count: null, nextCursor: null, error };
+  }
+
   let query = supabase
     .from('questions')
-    .select('*', { count: 'exact' })
+    .select('*', cursor ? undefined : { count: 'estimated' })
     .eq('is_active', true);
 
   if (tier) {
@@ -318,13 +337,20 @@ export async function getQuestionsAdmin(options = {}) {
     query = query.ilike('question_text', `%${search}%`);
   }
 
+  if (cursor) {
+    query = sortAsc ? query.gt('id', cursor.id) : query.lt('id', cursor.id);
+  }
+
   query = query
-    .order(sortBy, { ascending: sortAsc })
-    .range((page - 1) * perPage, page * perPage - 1);
+    .order('id', { ascending: sortAsc })
+    .limit(perPage);
 
   const { data, count, error } = await query;
 
-  return { data, count, error };
+  const last = data?.[data.length - 1];
+  const nextCursor = data?.length === perPage ? { id: last.id } : null;
+
+  return { data, count: cursor ? null : count, nextCursor, error };
 }
 
 export default {
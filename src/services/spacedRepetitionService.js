@@ -5,12 +5,59 @@
 
 import { supabase } from '../lib/supabase';
 import {
-  calculateNextReview,
   calculateState,
   QuestionState,
-  stateToInt,
   stateToString
 } from '../lib/fsrs';
+import {
+  buildProgressRow,
+  enqueueProgress,
+  flushProgressOutbox,
+  PROGRESS_TABLES
+} from '../lib/progressOutbox';
+import { invalidateQueries } from '../lib/queryCache';
+import { measure } from '../lib/perfTelemetry';
+
+/**
+ * Get the user's progress rollup (migration 016)
+ * Totals are maintained by a trigger on user_question_progress, so this reads
+ * one row per tema instead of one row per question.
+ * @param {string} userId
+ * @returns {Promise<Object|null>} { total, byTema } or null if unavailable
+ */
+export async function getProgressRollup(userId) {
+  const { data, error } = await supabase
+    .from('user_progress_rollup')
+    .select('*')
+    .eq('user_id', userId);
+
+  if (error) {
+    console.warn('Progress rollup unavailable, scanning progress instead:', error.message);
+    return null;
+  }
+
+  const rows = data || [];
+  return {
+    total: rows.find(r => r.tema === 0) || null,
+    byTema: rows.filter(r => r.tema !== 0)
+  };
+}
+
+/**
+ * Aggregate raw progress rows into the same shape as a rollup row
+ * (fallback when the rollup table is not available)
+ */
+function rollupFromProgress(progressData) {
+  const seen = progressData.filter(p => (p.times_seen || 0) > 0);
+  return {
+    progress_count: progressData.length,
+    seen_count: seen.length,
+    times_seen: progressData.reduce((sum, p) => sum + (p.times_seen || 0), 0),
+    times_correct: progressData.reduce((sum, p) => sum + (p.times_correct || 0), 0),
+    difficulty_sum: seen.reduce((sum, p) => sum + (p.difficulty || 5.0), 0),
+    relearning_count: seen.filter(p => p.state === 3).length
+  };
+}
 
 /**
  * Calculate adaptive difficulty level for a user
@@ -20,14 +67,24 @@ import {
  */
 export async function calculateAdaptiveDifficulty(userId) {
   try {
-    // Get user's recent progress
-    const { data: progressData } = await supabase
-      .from('user_question_progress')
-      .select('difficulty, times_correct, times_seen, state')
-      .eq('user_id', userId)
-      .gt('times_seen', 0);
+    let totals;
+    const rollup = await getProgressRollup(userId);
+
+    if (rollup) {
+      totals = rollup.total;
+    } else {
+      // Fallback: get user's progress rows
+      const { data: progressData } = await supabase
+        .from('user_question_progress')
+        .select('difficulty, times_correct, times_seen, state')
+        .eq('user_id', userId)
+        .gt('times_seen', 0);
+      totals = rollupFromProgress(progressData || []);
+    }
+
+    const seenCount = totals?.seen_count || 0;
 
-    if (!progressData || progressData.length === 0) {
+    if (seenCount === 0) {
       // New user - start with medium difficulty
       return {
         recommendedLevel: 2,
@@ -39,17 +96,15 @@ export async function calculateAdaptiveDifficulty(userId) {
     }
 
     // Calculate average FSRS difficulty (0-10 scale, 5.0 = default)
-    const totalDiff = progressData.reduce((sum, p) => sum + (p.difficulty || 5.0), 0);
-    const avgDifficulty = totalDiff / progressData.length;
+    const avgDifficulty = Number(totals.difficulty_sum) / seenCount;
 
     // Calculate accuracy
-    const totalSeen = progressData.reduce((sum, p) => sum + (p.times_seen || 0), 0);
-    const totalCorrect = progressData.reduce((sum, p) => sum + (p.times_correct || 0), 0);
+    const totalSeen = Number(totals.times_seen) || 0;
+    const totalCorrect = Number(totals.times_correct) || 0;
     const accuracy = totalSeen > 0 ? (totalCorrect / totalSeen) * 100 : 0;
 
     // Calculate relearning rate (state=3 means relearning in FSRS)
-    const relearningCount = progressData.filter(p => p.state === 3).length;
-    const relearningRate = progressData.length > 0 ? (relearningCount / progressData.length) * 100 : 0;
+    const relearningRate = (totals.relearning_count / seenCount) * 100;
 
     // Determine recommended difficulty level (1-3)
     // 1 = Fácil, 2 = Media, 3 = Difícil
@@ -79,9 +134,9 @@ export async function calculateAdaptiveDifficulty(userId) {
       avgDifficulty: Math.round(avgDifficulty * 100) / 100,
       accuracy: Math.round(accuracy),
       relearningRate: Math.round(relearningRate),
-      confidence: progressData.length >= 20 ? 'high' : progressData.length >= 10 ? 'medium' : 'low',
+      confidence: seenCount >= 20 ? 'high' : seenCount >= 10 ? 'medium' : 'low',
       adjustmentReason,
-      totalQuestionsSeen: progressData.length
+      totalQuestionsSeen: seenCount
     };
   } catch (error) {
     console.error('Error calculating adaptive difficulty:', error);
@@ -290,13 +345,50 @@ export async function getNewQuestions(userId, options = {}) {
   return questions.slice(0, limit);
 }
 
+/**
+ * Build a hybrid session server-side in a single round trip
+ * (generate_hybrid_session RPC, migration 015)
+ * @param {string} userId
+ * @param {Object} config - Same options as generateHybridSession
+ * @returns {Promise<Array|null>} Session questions, or null to use the client path
+ */
+async function fetchHybridSessionRpc(userId, config) {
+  const { totalQuestions, reviewRatio, tema, tier, adaptiveDifficulty } = config;
+
+  try {
+    const { data, error } = await supabase.rpc('generate_hybrid_session', {
+      p_user_id: userId,
+      p_total: totalQuestions,
+      p_review_ratio: reviewRatio,
+      p_tema: tema != null ? Number(tema) : null,
+      p_tier: tier,
+      p_adaptive: adaptiveDifficulty
+    });
+
+    if (error || !data) {
+      if (error) console.warn('generate_hybrid_session unavailable, using client path:', error.message);
+      return null;
+    }
+
+    return data.questions || [];
+  } catch (err) {
+    console.warn('generate_hybrid_session failed, using client path:', err);
+    return null;
+  }
+}
+
 /**
  * Generate a hybrid study session (mix of review + new questions)
+ * Tries the single-round-trip RPC first and falls back to the client path.
  * @param {string} userId
  * @param {Object} config
  * @returns {Promise<Array>}
  */
 export async function generateHybridSession(userId, config = {}) {
+  return measure('service.generateHybridSession', () => buildHybridSession(userId, config));
+}
+
+async function buildHybridSession(userId, config) {
   const {
     totalQuestions = 20,
     reviewRatio = 0.25,
@@ -306,6 +398,13 @@ export async function generateHybridSession(userId, config = {}) {
     adaptiveDifficulty = true // Enable adaptive difficulty by default
   } = config;
 
+  if (!failedOnly) {
+    const serverSession = await fetchHybridSessionRpc(userId, {
+      totalQuestions, reviewRatio, tema, tier, adaptiveDifficulty
+    });
+    if (serverSession) return serverSession;
+  }
+
   // Calculate adaptive difficulty if enabled
   let difficultyConfig = null;
   if (adaptiveDifficulty) {
@@ -432,20 +531,7 @@ export async function updateProgress(userId, questionId, wasCorrect) {
       .maybeSingle();
 
     // Calculate new FSRS values
-    const fsrsResult = calculateNextReview(existing, wasCorrect);
-
-    const progressData = {
-      user_id: userId,
-      question_id: Number(questionId),
-      times_seen: (existing?.times_seen || 0) + 1,
-      times_correct: (existing?.times_correct || 0) + (wasCorrect ? 1 : 0),
-      stability: fsrsResult.stability || 1.0,
-      difficulty: fsrsResult.difficulty || 5.0,
-      scheduled_days: fsrsResult.interval || 1,
-      next_review: fsrsResult.nextReview.toISOString(),
-      last_review: new Date().toISOString(),
-      state: stateToInt(fsrsResult.state)
-    };
+    const progressData = buildProgressRow(existing, userId, questionId, wasCorrect);
 
     // Upsert progress
     const { data, error } = await supabase
@@ -461,6 +547,7 @@ export async function updateProgress(userId, questionId, wasCorrect) {
       return null;
     }
 
+    invalidateQueries(PROGRESS_TABLES);
     return data;
   } catch (err) {
     // Never throw - session stats should update regardless
@@ -469,16 +556,95 @@ export async function updateProgress(userId, questionId, wasCorrect) {
   }
 }
 
+/**
+ * Queue a progress update through the write-behind outbox
+ * Returns as soon as the answer is stored locally; the FSRS row is written
+ * in a later bulk upsert (see lib/progressOutbox).
+ * @param {string} userId
+ * @param {string} questionId
+ * @param {boolean} wasCorrect
+ * @returns {Promise<void>}
+ */
+export async function queueProgressUpdate(userId, questionId, wasCorrect) {
+  try {
+    await enqueueProgress(userId, questionId, wasCorrect);
+  } catch (err) {
+    // Never throw - session stats should update regardless
+    console.error('Error in queueProgressUpdate:', err);
+  }
+}
+
+/**
+ * Write all queued progress updates now
+ * @returns {Promise<boolean>} true if nothing is left pending
+ */
+export async function flushProgressUpdates() {
+  try {
+    return await flushProgressOutbox();
+  } catch (err) {
+    console.error('Error in flushProgressUpdates:', err);
+    return false;
+  }
+}
+
+/**
+ * Count progress rows due for review (served by idx_uqp_user_next_review)
+ * @param {string} userId
+ * @returns {Promise<number>}
+ */
+export async function getDueReviewCount(userId) {
+  const { count, error } = await supabase
+    .from('user_question_progress')
+    .select('question_id', { count: 'exact', head: true })
+    .eq('user_id', userId)
+    .lte('next_review', new Date().toISOString());
+
+  if (error) {
+    console.error('Error counting due reviews:', error);
+    return 0;
+  }
+  return count || 0;
+}
+
 /**
  * Get study statistics for dashboard
  * @param {string} userId
  * @returns {Promise<Object>}
  */
 export async function getStudyStats(userId) {
-  // Get all progress
-  const progress = await getUserProgress(userId);
+  const rollup = await getProgressRollup(userId);
+
+  let totals;
+  let dueToday;
+  let byState;
+
+  if (rollup) {
+    totals = rollup.total;
+    if (!totals || totals.progress_count === 0) totals = null;
+    dueToday = totals ? await getDueReviewCount(userId) : 0;
+    byState = totals ? {
+      [QuestionState.LEARNING]: totals.learning_count,
+      [QuestionState.REVIEW]: totals.review_count,
+      // DB state 3 maps to MASTERED via stateToString
+      [QuestionState.MASTERED]: totals.relearning_count
+    } : {};
+  } else {
+    // Fallback: get all progress
+    const progress = await getUserProgress(userId);
+    totals = progress.length > 0 ? rollupFromProgress(progress) : null;
+
+    const nowMs = Date.now();
+    dueToday = progress.filter(p => p.next_review && Date.parse(p.next_review) <= nowMs).length;
+
+    byState = progress.reduce((acc, p) => {
+      // DB stores state as integer; convert to string for QuestionState matching
+      const state = p.state != null ? stateToString(p.state) : calculateState(p);
+      acc[state] = (acc[state] || 0) + 1;
+      return acc;
+    }, {});
+  }
 
-  if (progress.length === 0) {
+  if (!totals) {
     return {
       totalStudied: 0,
       dueToday: 0,
@@ -489,25 +655,12 @@ export async function getStudyStats(userId) {
     };
   }
 
-  // Calculate stats
   const now = new Date();
   const today = new Date(now.getFullYear(), now.getMonth(), now.getDate());
 
-  const dueToday = progress.filter(p => {
-    if (!p.next_review) return false;
-    return new Date(p.next_review) <= now;
-  }).length;
-
-  const byState = progress.reduce((acc, p) => {
-    // DB stores state as integer; convert to string for QuestionState matching
-    const state = p.state != null ? stateToString(p.state) : calculateState(p);
-    acc[state] = (acc[state] || 0) + 1;
-    return acc;
-  }, {});
-
   // Calculate retention
-  const totalCorrect = progress.reduce((sum, p) => sum + (p.times_correct || 0), 0);
-  const totalSeen = progress.reduce((sum, p) => sum + (p.times_seen || 0), 0);
+  const totalCorrect = Number(totals.times_correct) || 0;
+  const totalSeen = Number(totals.times_seen) || 0;
   const retention = totalSeen > 0 ? Math.round((totalCorrect / totalSeen) * 100) : 0;
 
   // Calculate streak from study_history if available
@@ -536,7 +689,7 @@ export async function getStudyStats(userId) {
   }
 
   return {
-    totalStudied: progress.length,
+    totalStudied: totals.progress_count,
     dueToday,
     mastered: byState[QuestionState.MASTERED] || 0,
     learning: byState[QuestionState.LEARNING] || 0,
@@ -562,6 +715,9 @@ export async function getStudyStats(userId) {
  */
 export async function recordTestSession(userId, sessionData) {
   try {
+    // Session rows must land after the answers they summarize
+    await flushProgressUpdates();
+
     const {
       temaFilter = null,
       correctCount = 0,
@@ -627,6 +783,8 @@ export async function recordTestSession(userId, sessionData) {
       }
     }
 
+    invalidateQueries(['test_sessions', 'user_topic_progress']);
+
     return data;
   } catch (err) {
     console.error('Error in recordTestSession:', err);
@@ -641,6 +799,8 @@ export async function recordTestSession(userId, sessionData) {
  * @param {number} correctAnswers
  */
 export async function recordDailyStudy(userId, questionsAnswered, correctAnswers) {
+  await flushProgressUpdates();
+
   const today = new Date().toISOString().split('T')[0];
 
   // First, try to get existing record
@@ -669,7 +829,10 @@ export async function recordDailyStudy(userId, questionsAnswered, correctAnswers
 
   if (error) {
     console.error('Error recording daily study:', error);
+    return;
   }
+
+  invalidateQueries('study_history');
 }
 
 /**
@@ -716,13 +879,19 @@ export async function getWeeklyProgress(userId) {
 }
 
 export default {
+  getProgressRollup,
+  calculateAdaptiveDifficulty,
   getUserProgress,
   getDueReviews,
   getFailedQuestions,
   getNewQuestions,
   generateHybridSession,
   updateProgress,
+  queueProgressUpdate,
+  flushProgressUpdates,
+  getDueReviewCount,
   getStudyStats,
+  recordTestSession,
   recordDailyStudy,
   getWeeklyProgress
 };
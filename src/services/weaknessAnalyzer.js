@@ -6,83 +6,168 @@
  * - Topics trending down in accuracy
  * - Error clusters by legal reference
  *
- * Works with existing data (user_question_progress, test_sessions)
- * without requiring new DB tables.
+ * Reads the trigger-maintained user_progress_rollup and the
+ * get_weak_articles RPC (migration 016); falls back to scanning
+ * user_question_progress when those are not deployed (weak articles only).
  */
 
 import { supabase } from '../lib/supabase';
+import { getProgressRollup } from './spacedRepetitionService';
+
+const emptyAnalysis = () => ({ weakTopics: [], weakArticles: [], recommendations: [] });
 
 /**
- * Analyze user's persistent weaknesses from question-level progress
- *
- * @param {string} userId
- * @returns {Promise<Object>} { weakTopics, weakArticles, recommendations }
+ * Weak articles aggregated server-side over the full history (migration 016)
+ * @returns {Promise<Array|null>} null if the RPC is unavailable
  */
-export async function analyzeWeaknesses(userId) {
-  if (!userId) return { weakTopics: [], weakArticles: [], recommendations: [] };
+async function getWeakArticles() {
+  const { data, error } = await supabase.rpc('get_weak_articles', { p_limit: 10 });
 
-  try {
-    // Get all user question progress with question details
-    const { data: progressData, error } = await supabase
-      .from('user_question_progress')
-      .select('question_id, times_seen, times_correct, difficulty, state')
-      .eq('user_id', userId)
-      .gt('times_seen', 0)
-      .order('difficulty', { ascending: false });
+  if (error) {
+    console.warn('get_weak_articles unavailable, using client analysis:', error.message);
+    return null;
+  }
+
+  return (data || []).map(a => ({
+    ref: a.ref,
+    tema: a.tema,
+    questionIds: a.question_ids || [],
+    failCount: Number(a.fail_count) || 0,
+    totalSeen: Number(a.total_seen) || 0,
+  }));
+}
+
+// Fallback limits: get_questions_by_ids is capped at 50 ids and audited
+const DETAIL_CHUNK_SIZE = 50;
+const DETAIL_CONCURRENCY = 3;
+const MAX_DETAIL_IDS = 500; // Hardest failed questions first
 
-    if (error || !progressData || progressData.length === 0) {
-      return { weakTopics: [], weakArticles: [], recommendations: [] };
+/**
+ * Fetch question details in RPC chunks, a few requests at a time
+ */
+async function fetchQuestionDetails(ids) {
+  const chunks = [];
+  for (let i = 0; i < ids.length; i += DETAIL_CHUNK_SIZE) {
+    chunks.push(ids.slice(i, i + DETAIL_CHUNK_SIZE));
+  }
+
+  const questions = [];
+  let next = 0;
+  const worker = async () => {
+    while (next < chunks.length) {
+      const chunk = chunks[next++];
+      const { data } = await supabase.rpc('get_questions_by_ids', { p_ids: chunk });
+      questions.push(...(data || []));
     }
+  };
 
-    // Get question details for failed questions
-    const failedQuestionIds = progressData
-      .filter(p => p.times_correct < p.times_seen)
-      .map(p => p.question_id);
+  await Promise.all(Array.from({ length: Math.min(DETAIL_CONCURRENCY, chunks.length) }, worker));
+  return questions;
+}
 
-    if (failedQuestionIds.length === 0) {
-      return { weakTopics: [], weakArticles: [], recommendations: [] };
+/**
+ * Fallback: build article stats from raw progress + question details
+ *
+ * Degraded compared to the rollup path: details are fetched only for failed
+ * questions (at most MAX_DETAIL_IDS, DETAIL_CONCURRENCY requests at a time),
+ * so the tema of always-correct questions is unknown and per-tema accuracy
+ * can't be computed. No weak topics are reported here; weak articles only
+ * need failed questions and match get_weak_articles.
+ */
+async function collectStatsFromProgress(userId) {
+  const { data: progressData, error } = await supabase
+    .from('user_question_progress')
+    .select('question_id, times_seen, times_correct, difficulty, state')
+    .eq('user_id', userId)
+    .gt('times_seen', 0)
+    .order('difficulty', { ascending: false });
+
+  if (error || !progressData || progressData.length === 0) return null;
+
+  const failedProgress = progressData.filter(p => p.times_correct < p.times_seen);
+  if (failedProgress.length === 0) return null;
+
+  // SECURITY: use RPC (capped to 50 per call + audits reads).
+  const questions = await fetchQuestionDetails(
+    failedProgress.slice(0, MAX_DETAIL_IDS).map(p => p.question_id)
+  );
+  if (questions.length === 0) return null;
+
+  const progressById = new Map(failedProgress.map(p => [p.question_id, p]));
+
+  // --- By legal reference (articles) ---
+  // Failed questions only, like get_weak_articles
+  const articleStats = new Map();
+  for (const q of questions) {
+    const progress = progressById.get(q.id);
+    if (!progress) continue;
+    const ref = q.legal_reference?.trim();
+    if (!ref) continue;
+    let a = articleStats.get(ref);
+    if (!a) {
+      a = { ref, tema: q.tema, questionIds: [], failCount: 0, totalSeen: 0 };
+      articleStats.set(ref, a);
     }
+    a.totalSeen += progress.times_seen;
+    a.failCount += (progress.times_seen - progress.times_correct);
+    a.questionIds.push(q.id);
+  }
+
+  return {
+    topics: [],
+    articles: [...articleStats.values()],
+    failedCount: failedProgress.length,
+  };
+}
 
-    // SECURITY: use RPC (capped to 50 per call + audits reads).
-    // Chunk failed IDs in groups of 50; cap total analysis to 200 to bound cost.
-    const idsToFetch = failedQuestionIds.slice(0, 200);
-    const chunks = [];
-    for (let i = 0; i < idsToFetch.length; i += 50) chunks.push(idsToFetch.slice(i, i + 50));
-
-    const questionArrays = await Promise.all(
-      chunks.map(ids =>
-        supabase.rpc('get_questions_by_ids', { p_ids: ids })
-          .then(({ data }) => data || [])
-      )
-    );
-    const questions = questionArrays.flat();
-
-    if (!questions.length) {
-      return { weakTopics: [], weakArticles: [], recommendations: [] };
+/**
+ * Build topic/article stats from the progress rollup (O(temas) rows)
+ * @returns {Promise<Object|null|undefined>} undefined if the rollup is unavailable
+ */
+async function collectStatsFromRollup(userId) {
+  const [rollup, articles] = await Promise.all([
+    getProgressRollup(userId),
+    getWeakArticles(),
+  ]);
+
+  if (!rollup || !articles) return undefined;
+
+  const failedCount = rollup.total?.failed_count || 0;
+  if (failedCount === 0) return null;
+
+  return {
+    topics: rollup.byTema.map(t => ({
+      tema: t.tema,
+      correct: Number(t.times_correct) || 0,
+      total: Number(t.times_seen) || 0,
+      failed: t.failed_count,
+      highDifficulty: t.high_difficulty_count,
+    })),
+    articles,
+    failedCount,
+  };
+}
+
+/**
+ * Analyze user's persistent weaknesses from question-level progress
+ *
+ * @param {string} userId
+ * @returns {Promise<Object>} { weakTopics, weakArticles, recommendations }
+ */
+export async function analyzeWeaknesses(userId) {
+  if (!userId) return emptyAnalysis();
+
+  try {
+    let stats = await collectStatsFromRollup(userId);
+    if (stats === undefined) {
+      stats = await collectStatsFromProgress(userId);
     }
 
-    // Build progress lookup
-    const progressMap = {};
-    progressData.forEach(p => {
-      progressMap[p.question_id] = p;
-    });
+    if (!stats) return emptyAnalysis();
 
-    // --- Analyze by topic ---
-    const topicStats = {};
-    progressData.forEach(p => {
-      const q = questions.find(q => q.id === p.question_id);
-      if (!q) return;
-      const tema = q.tema;
-      if (!topicStats[tema]) {
-        topicStats[tema] = { tema, correct: 0, total: 0, failed: 0, highDifficulty: 0 };
-      }
-      topicStats[tema].total += p.times_seen;
-      topicStats[tema].correct += p.times_correct;
-      if (p.times_correct < p.times_seen) topicStats[tema].failed++;
-      if (p.difficulty > 7) topicStats[tema].highDifficulty++;
-    });
+    const { topics, articles, failedCount } = stats;
 
-    const weakTopics = Object.values(topicStats)
+    const weakTopics = topics
       .map(t => ({
         ...t,
         accuracy: t.total > 0 ? Math.round((t.correct / t.total) * 100) : 0,
@@ -91,23 +176,7 @@ export async function analyzeWeaknesses(userId) {
       .filter(t => t.accuracy < 65 && t.total >= 5)
       .sort((a, b) => a.accuracy - b.accuracy);
 
-    // --- Analyze by legal reference (articles) ---
-    const articleStats = {};
-    questions.forEach(q => {
-      if (!q.legal_reference) return;
-      const ref = q.legal_reference.trim();
-      if (!articleStats[ref]) {
-        articleStats[ref] = { ref, tema: q.tema, questionIds: [], failCount: 0, totalSeen: 0 };
-      }
-      const progress = progressMap[q.id];
-      if (progress) {
-        articleStats[ref].totalSeen += progress.times_seen;
-        articleStats[ref].failCount += (progress.times_seen - progress.times_correct);
-        articleStats[ref].questionIds.push(q.id);
-      }
-    });
-
-    const weakArticles = Object.values(articleStats)
+    const weakArticles = articles
       .filter(a => a.failCount >= 2 && a.totalSeen >= 3)
       .map(a => ({
         ...a,
@@ -141,12 +210,12 @@ export async function analyzeWeaknesses(userId) {
       });
     }
 
-    if (failedQuestionIds.length > 10) {
+    if (failedCount > 10) {
       recommendations.push({
         type: 'error-review',
         priority: 3,
         title: 'Sesión de errores',
-        description: `Tienes ${failedQuestionIds.length} preguntas con fallos acumulados. Repásalas.`,
+        description: `Tienes ${failedCount} preguntas con fallos acumulados. Repásalas.`,
         action: { mode: 'repaso-errores', failedOnly: true },
       });
     }
@@ -154,7 +223,7 @@ export async function analyzeWeaknesses(userId) {
     return { weakTopics, weakArticles, recommendations };
   } catch (err) {
     console.error('Error analyzing weaknesses:', err);
-    return { weakTopics: [], weakArticles: [], recommendations: [] };
+    return emptyAnalysis();
   }
 }
 
@@ -0,0 +1,83 @@
+/**
+ * Blob Writer
+ * Incremental text-to-Blob writer for large downloads
+ *
+ * Writes are buffered as small strings and folded into a Blob every
+ * FLUSH_CHARS characters, so the export never holds one huge string in
+ * memory (browsers may keep large Blobs on disk). close() returns the final
+ * Blob made of those parts.
+ */
+
+const FLUSH_CHARS = 1 << 20; // ~1M characters per Blob part
+
+/**
+ * Create a writer
+ * @param {string} [type='application/json'] - MIME type of the final Blob
+ * @returns {Object} { write(text), close() -> Blob, size }
+ */
+export function createBlobWriter(type = 'application/json') {
+  const parts = [];
+  let pending = [];
+  let pendingChars = 0;
+  let written = 0;
+  let closed = false;
+
+  const flush = () => {
+    if (pending.length === 0) return;
+    parts.push(new Blob(pending));
+    pending = [];
+    pendingChars = 0;
+  };
+
+  return {
+    /**
+     * Append text
+     * @param {string} text
+     */
+    write(text) {
+      if (closed) throw new Error('Blob writer already closed');
+      if (!text) return;
+      pending.push(text);
+      pendingChars += text.length;
+      written += text.length;
+      if (pendingChars >= FLUSH_CHARS) flush();
+    },
+
+    /**
+     * Finish and return the Blob
+     * @returns {Blob}
+     */
+    close() {
+      flush();
+      closed = true;
+      return new Blob(parts, { type });
+    },
+
+    // Characters written so far
+    get size() {
+      return written;
+    }
+  };
+}
+
+/**
+ * Trigger a browser download for a Blob
+ * @param {Blob} blob
+ * @param {string} filename - Full filename including extension
+ */
+export function downloadBlob(blob, filename) {
+  const url = URL.createObjectURL(blob);
+
+  const link = document.createElement('a');
+  link.href = url;
+  link.download = filename;
+  document.body.appendChild(link);
+  link.click();
+  document.body.removeChild(link);
+  URL.revokeObjectURL(url);
+}
+
+export default {
+  createBlobWriter,
+  downloadBlob
+};
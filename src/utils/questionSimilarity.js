@@ -0,0 +1,194 @@
+/**
+ * Question Similarity Index
+ * Near-duplicate detection for bulk imports using MinHash + LSH
+ *
+ * Similarity is word-level Jaccard over normalized text (same measure the
+ * importer always used). Each text gets a MinHash signature; signatures are
+ * split into LSH bands so that only texts sharing a band bucket are compared
+ * exactly. With 20 bands x 5 rows, a pair at Jaccard 0.9 becomes a candidate
+ * with probability > 0.99999, while unrelated pairs are almost never compared.
+ */
+
+const NUM_BANDS = 20;
+const ROWS_PER_BAND = 5;
+const NUM_HASHES = NUM_BANDS * ROWS_PER_BAND;
+
+export const DEFAULT_SIMILARITY_THRESHOLD = 0.9;
+
+// Deterministic per-hash seeds (xorshift32)
+const SEEDS = (() => {
+  const seeds = new Uint32Array(NUM_HASHES);
+  let x = 0x9e3779b9;
+  for (let i = 0; i < NUM_HASHES; i++) {
+    x ^= x << 13; x >>>= 0;
+    x ^= x >>> 17;
+    x ^= x << 5; x >>>= 0;
+    seeds[i] = x;
+  }
+  return seeds;
+})();
+
+/**
+ * Normalize question text for comparison
+ * @param {string} text
+ * @returns {string}
+ */
+export function normalizeQuestionText(text) {
+  return String(text || '').toLowerCase().trim().replace(/\s+/g, ' ');
+}
+
+/**
+ * Word set of a normalized text
+ * @param {string} normalized
+ * @returns {Set<string>}
+ */
+function tokenize(normalized) {
+  return new Set(normalized.split(' '));
+}
+
+/**
+ * Jaccard similarity between two word sets
+ * @param {Set<string>} words1
+ * @param {Set<string>} words2
+ * @returns {number} Similarity score 0-1
+ */
+export function jaccardSimilarity(words1, words2) {
+  let intersection = 0;
+  const [small, large] = words1.size <= words2.size ? [words1, words2] : [words2, words1];
+  for (const w of small) {
+    if (large.has(w)) intersection++;
+  }
+  const union = words1.size + words2.size - intersection;
+  return union === 0 ? 0 : intersection / union;
+}
+
+// 32-bit FNV-1a
+function hashToken(token) {
+  let h = 0x811c9dc5;
+  for (let i = 0; i < token.length; i++) {
+    h ^= token.charCodeAt(i);
+    h = Math.imul(h, 0x01000193);
+  }
+  return h >>> 0;
+}
+
+// murmur3 finalizer
+function mix32(h) {
+  h ^= h >>> 16;
+  h = Math.imul(h, 0x85ebca6b);
+  h ^= h >>> 13;
+  h = Math.imul(h, 0xc2b2ae35);
+  h ^= h >>> 16;
+  return h >>> 0;
+}
+
+/**
+ * MinHash signature of a word set
+ * @param {Set<string>} words
+ * @returns {Uint32Array}
+ */
+function minHashSignature(words) {
+  const signature = new Uint32Array(NUM_HASHES).fill(0xffffffff);
+  for (const word of words) {
+    const base = hashToken(word);
+    for (let i = 0; i < NUM_HASHES; i++) {
+      const h = mix32(base ^ SEEDS[i]);
+      if (h < signature[i]) signature[i] = h;
+    }
+  }
+  return signature;
+}
+
+// Fold one band of the signature into a 32-bit bucket key. Collisions only
+// add candidates, which are then rejected by the exact Jaccard check.
+function bandKey(signature, band) {
+  const start = band * ROWS_PER_BAND;
+  let key = band;
+  for (let r = 0; r < ROWS_PER_BAND; r++) {
+    key = mix32(key ^ signature[start + r]);
+  }
+  return key;
+}
+
+/**
+ * Create an in-memory near-duplicate index
+ *
+ * @param {Object} [options]
+ * @param {number} [options.threshold=0.9] - Jaccard threshold for a duplicate
+ * @returns {Object} { add, findDuplicate, size }
+ */
+export function createSimilarityIndex({ threshold = DEFAULT_SIMILARITY_THRESHOLD } = {}) {
+  const exact = new Map();        // normalized text -> id
+  const entries = [];             // { id, words }
+  const buckets = Array.from({ length: NUM_BANDS }, () => new Map()); // band key -> entry indexes
+
+  /**
+   * Add a text to the index
+   * @param {*} id - Identifier returned by findDuplicate
+   * @param {string} text
+   */
+  function add(id, text) {
+    const normalized = normalizeQuestionText(text);
+    if (!exact.has(normalized)) exact.set(normalized, id);
+
+    const words = tokenize(normalized);
+    const signature = minHashSignature(words);
+    const entryIndex = entries.push({ id, words }) - 1;
+
+    for (let band = 0; band < NUM_BANDS; band++) {
+      const key = bandKey(signature, band);
+      const bucket = buckets[band].get(key);
+      if (bucket) bucket.push(entryIndex);
+      else buckets[band].set(key, [entryIndex]);
+    }
+  }
+
+  /**
+   * Find an indexed text similar to `text`
+   * @param {string} text
+   * @returns {Object|null} { id, similarity } of the best match, or null
+   */
+  function findDuplicate(text) {
+    const normalized = normalizeQuestionText(text);
+    if (exact.has(normalized)) {
+      return { id: exact.get(normalized), similarity: 1 };
+    }
+
+    const words = tokenize(normalized);
+    const signature = minHashSignature(words);
+    const checked = new Set();
+    let best = null;
+
+    for (let band = 0; band < NUM_BANDS; band++) {
+      const bucket = buckets[band].get(bandKey(signature, band));
+      if (!bucket) continue;
+
+      for (const entryIndex of bucket) {
+        if (checked.has(entryIndex)) continue;
+        checked.add(entryIndex);
+
+        const similarity = jaccardSimilarity(words, entries[entryIndex].words);
+        if (similarity > threshold && (!best || similarity > best.similarity)) {
+          best = { id: entries[entryIndex].id, similarity };
+        }
+      }
+    }
+
+    return best;
+  }
+
+  return {
+    add,
+    findDuplicate,
+    get size() {
+      return entries.length;
+    }
+  };
+}
+
+export default {
+  normalizeQuestionText,
+  jaccardSimilarity,
+  createSimilarityIndex,
+  DEFAULT_SIMILARITY_THRESHOLD
+};
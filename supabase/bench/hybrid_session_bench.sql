@@ -0,0 +1,154 @@
+-- ============================================================================
+-- BENCHMARK: generate_hybrid_session (RPC) vs. legacy client path
+-- ============================================================================
+-- Seeds a throwaway user with 100 / 5k / 50k progress rows (plus synthetic
+-- questions so every row has its own question), then times:
+--   legacy: the 4 requests generateHybridSession() used to issue
+--           (adaptive difficulty scan, due reviews join, seen ids,
+--           get_study_questions)
+--   rpc:    one generate_hybrid_session() call
+--
+-- Time-to-first-question is estimated as
+--   server time + round trips * :rtt_ms + payload bytes / :kbps
+-- so the numbers are comparable across networks without a browser.
+--
+-- Everything runs inside a transaction that is rolled back.
+--
+-- Usage (local Supabase, superuser connection):
+--   psql "$DATABASE_URL" -v rtt_ms=120 -v kbps=1000 -f supabase/bench/hybrid_session_bench.sql
+-- ============================================================================
+
+\set ON_ERROR_STOP on
+\if :{?rtt_ms} \else \set rtt_ms 120 \endif
+\if :{?kbps} \else \set kbps 1000 \endif
+
+BEGIN;
+
+SELECT set_config('bench.rtt_ms', :'rtt_ms', true),
+       set_config('bench.kbps', :'kbps', true);
+
+DO $$
+DECLARE
+    v_sizes INTEGER[] := ARRAY[100, 5000, 50000];
+    v_runs CONSTANT INTEGER := 5;
+    v_rtt NUMERIC := current_setting('bench.rtt_ms')::NUMERIC;
+    v_kbps NUMERIC := current_setting('bench.kbps')::NUMERIC;
+    v_size INTEGER;
+    v_user UUID;
+    v_t0 TIMESTAMPTZ;
+    v_legacy_ms NUMERIC;
+    v_rpc_ms NUMERIC;
+    v_legacy_bytes BIGINT;
+    v_rpc_bytes BIGINT;
+    v_bytes BIGINT;
+    v_payload JSONB;
+    i INTEGER;
+BEGIN
+    FOREACH v_size IN ARRAY v_sizes LOOP
+        v_user := gen_random_uuid();
+
+        INSERT INTO auth.users (id, email, aud, role)
+        VALUES (v_user, 'bench+' || v_user || '@example.com', 'authenticated', 'authenticated');
+
+        PERFORM set_config('request.jwt.claims',
+            json_build_object('sub', v_user, 'role', 'authenticated')::TEXT, true);
+        PERFORM set_config('request.jwt.claim.sub', v_user::TEXT, true);
+
+        -- One synthetic question per progress row
+        WITH new_questions AS (
+            INSERT INTO questions (question_text, options, tema, difficulty, is_active)
+            SELECT
+                'Pregunta sintética de benchmark número ' || g,
+                '[{"id":"a","text":"A","is_correct":true},{"id":"b","text":"B","is_correct":false}]'::JSONB,
+                1 + (g % 20),
+                1 + (g % 5),
+                true
+            FROM generate_series(1, v_size) g
+            RETURNING id
+        )
+        INSERT INTO user_question_progress (
+            user_id, question_id, stability, difficulty, scheduled_days,
+            state, times_seen, times_correct, last_review, next_review
+        )
+        SELECT
+            v_user,
+            nq.id,
+            1 + random() * 30,
+            random() * 10,
+            1 + floor(random() * 60),
+            floor(random() * 4)::INTEGER,
+            1 + floor(random() * 5)::INTEGER,
+            floor(random() * 3)::INTEGER,
+            NOW() - (random() * 90 || ' days')::INTERVAL,
+            NOW() + ((random() * 60 - 30) || ' days')::INTERVAL
+        FROM new_questions nq;
+
+        ANALYZE user_question_progress;
+
+        -- Legacy client path: 4 sequential requests
+        v_legacy_ms := 0;
+        v_legacy_bytes := 0;
+        FOR i IN 1..v_runs LOOP
+            v_t0 := clock_timestamp();
+
+            SELECT COALESCE(octet_length(json_agg(t)::TEXT), 0) INTO v_bytes
+            FROM (
+                SELECT difficulty, times_correct, times_seen, state
+                FROM user_question_progress
+                WHERE user_id = v_user AND times_seen > 0
+            ) t;
+            v_legacy_bytes := v_bytes;
+
+            SELECT COALESCE(octet_length(json_agg(t)::TEXT), 0) INTO v_bytes
+            FROM (
+                SELECT uqp.*, to_jsonb(q) AS questions
+                FROM user_question_progress uqp
+                JOIN questions q ON q.id = uqp.question_id
+                WHERE uqp.user_id = v_user AND q.is_active = true
+                  AND uqp.next_review <= NOW()
+                ORDER BY uqp.next_review
+                LIMIT 10
+            ) t;
+            v_legacy_bytes := v_legacy_bytes + v_bytes;
+
+            SELECT COALESCE(octet_length(json_agg(t)::TEXT), 0) INTO v_bytes
+            FROM (
+                SELECT question_id FROM user_question_progress WHERE user_id = v_user
+            ) t;
+            v_legacy_bytes := v_legacy_bytes + v_bytes;
+
+            SELECT COALESCE(octet_length(json_agg(t)::TEXT), 0) INTO v_bytes
+            FROM get_study_questions(NULL, 20, ARRAY(
+                SELECT question_id FROM user_question_progress WHERE user_id = v_user LIMIT 1000
+            )) t;
+            v_legacy_bytes := v_legacy_bytes + v_bytes;
+
+            v_legacy_ms := v_legacy_ms
+                + EXTRACT(EPOCH FROM clock_timestamp() - v_t0) * 1000;
+        END LOOP;
+        v_legacy_ms := v_legacy_ms / v_runs;
+
+        -- RPC path: one request
+        v_rpc_ms := 0;
+        FOR i IN 1..v_runs LOOP
+            v_t0 := clock_timestamp();
+            v_payload := generate_hybrid_session(v_user, 20, 0.25, NULL, NULL, true);
+            v_rpc_ms := v_rpc_ms
+                + EXTRACT(EPOCH FROM clock_timestamp() - v_t0) * 1000;
+        END LOOP;
+        v_rpc_ms := v_rpc_ms / v_runs;
+        v_rpc_bytes := octet_length(v_payload::TEXT);
+
+        RAISE NOTICE '% progress rows | legacy: %ms server, 4 round trips, % KB -> ~%ms to first question | rpc: %ms server, 1 round trip, % KB -> ~%ms to first question',
+            lpad(v_size::TEXT, 6),
+            round(v_legacy_ms, 1),
+            round(v_legacy_bytes / 1024.0, 1),
+            round(v_legacy_ms + 4 * v_rtt + v_legacy_bytes * 8 / v_kbps),
+            round(v_rpc_ms, 1),
+            round(v_rpc_bytes / 1024.0, 1),
+            round(v_rpc_ms + v_rtt + v_rpc_bytes * 8 / v_kbps);
+    END LOOP;
+END;
+$$;
+
+ROLLBACK;
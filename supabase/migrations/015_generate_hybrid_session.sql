@@ -0,0 +1,240 @@
+-- ============================================================================
+-- MIGRATION 015: Server-side hybrid session builder
+-- ============================================================================
+-- generateHybridSession() used to run 3-5 sequential requests on session
+-- start (adaptive difficulty over every seen progress row, due reviews with a
+-- questions!inner join, seen ids, get_study_questions). This RPC does the
+-- same work in a single round trip:
+--   1. Adaptive difficulty (from the user's tema = 0 row of
+--      user_progress_rollup, migration 016: O(1) regardless of history)
+--   2. Due reviews (served by idx_uqp_user_next_review)
+--   3. New questions through get_study_questions (keeps 50 cap, daily quota
+--      and audit, since this function runs as the caller)
+--   4. Review-ratio shortfall backfill in both directions
+--   5. Interleaving (avoid two reviews in a row)
+--
+-- user_progress_rollup is created by migration 016; plpgsql resolves it at
+-- call time, and until 016 is applied the client falls back to its own path.
+--
+-- Returns JSONB: { "difficulty": {...} | null, "questions": [...] }
+-- Each question is the questions row plus "isReview" and "progress" (the full
+-- user_question_progress row for reviews, null for new questions).
+-- ============================================================================
+
+CREATE OR REPLACE FUNCTION generate_hybrid_session(
+    p_user_id UUID,
+    p_total INTEGER DEFAULT 20,
+    p_review_ratio NUMERIC DEFAULT 0.25,
+    p_tema INTEGER DEFAULT NULL,
+    p_tier TEXT DEFAULT NULL,
+    p_adaptive BOOLEAN DEFAULT true
+)
+RETURNS JSONB
+LANGUAGE plpgsql
+SET search_path = public
+AS $$
+DECLARE
+    v_total INTEGER := LEAST(GREATEST(COALESCE(p_total, 20), 1), 200);
+    v_review_count INTEGER;
+    v_new_count INTEGER;
+
+    -- Adaptive difficulty
+    v_seen_count INTEGER;
+    v_avg_difficulty NUMERIC;
+    v_accuracy NUMERIC;
+    v_relearning_rate NUMERIC;
+    v_level NUMERIC := NULL;
+    v_reason TEXT;
+    v_difficulty JSONB := NULL;
+
+    -- Selection
+    v_exclude INTEGER[];
+    v_reviews JSONB[];
+    v_new JSONB[];
+    v_sel_reviews JSONB[];
+    v_sel_new JSONB[];
+    v_shortfall INTEGER;
+
+    -- Interleaving
+    v_session JSONB := '[]'::JSONB;
+    v_last_was_review BOOLEAN := false;
+    v_ri INTEGER := 1;
+    v_ni INTEGER := 1;
+    v_nr INTEGER;
+    v_nn INTEGER;
+BEGIN
+    IF auth.uid() IS NULL OR p_user_id IS DISTINCT FROM auth.uid() THEN
+        RAISE EXCEPTION 'No autorizado';
+    END IF;
+
+    v_review_count := FLOOR(v_total * COALESCE(p_review_ratio, 0.25));
+    v_new_count := v_total - v_review_count;
+
+    -- ------------------------------------------------------------------
+    -- 1. Adaptive difficulty (same totals and thresholds as
+    --    calculateAdaptiveDifficulty, read from the rollup)
+    -- ------------------------------------------------------------------
+    IF p_adaptive THEN
+        SELECT
+            r.seen_count,
+            CASE WHEN r.seen_count > 0
+                 THEN r.difficulty_sum / r.seen_count
+                 ELSE 5.0 END,
+            CASE WHEN r.times_seen > 0
+                 THEN r.times_correct::NUMERIC / r.times_seen * 100
+                 ELSE 0 END,
+            CASE WHEN r.seen_count > 0
+                 THEN r.relearning_count::NUMERIC / r.seen_count * 100
+                 ELSE 0 END
+        INTO v_seen_count, v_avg_difficulty, v_accuracy, v_relearning_rate
+        FROM user_progress_rollup r
+        WHERE r.user_id = p_user_id
+          AND r.tema = 0;
+
+        -- No rollup row yet: the user has no progress
+        IF COALESCE(v_seen_count, 0) = 0 THEN
+            v_level := 2;
+            v_difficulty := jsonb_build_object(
+                'recommendedLevel', 2,
+                'avgDifficulty', 5.0,
+                'accuracy', 0,
+                'confidence', 'low',
+                'adjustmentReason', 'new_user'
+            );
+        ELSE
+            IF v_accuracy >= 85 AND v_avg_difficulty <= 4.0 THEN
+                v_level := 3;   v_reason := 'high_performance';
+            ELSIF v_accuracy >= 70 AND v_avg_difficulty <= 5.0 THEN
+                v_level := 2.5; v_reason := 'good_performance';
+            ELSIF v_accuracy < 50 OR v_avg_difficulty > 7.0 THEN
+                v_level := 1;   v_reason := 'struggling';
+            ELSIF v_relearning_rate > 30 THEN
+                v_level := 1.5; v_reason := 'high_relearning_rate';
+            ELSE
+                v_level := 2;   v_reason := 'balanced';
+            END IF;
+
+            v_level := ROUND(v_level);
+            v_difficulty := jsonb_build_object(
+                'recommendedLevel', v_level,
+                'avgDifficulty', ROUND(v_avg_difficulty, 2),
+                'accuracy', ROUND(v_accuracy),
+                'relearningRate', ROUND(v_relearning_rate),
+                'confidence', CASE WHEN v_seen_count >= 20 THEN 'high'
+                                   WHEN v_seen_count >= 10 THEN 'medium'
+                                   ELSE 'low' END,
+                'adjustmentReason', v_reason,
+                'totalQuestionsSeen', v_seen_count
+            );
+        END IF;
+    END IF;
+
+    -- ------------------------------------------------------------------
+    -- 2. Due reviews, most overdue first
+    -- ------------------------------------------------------------------
+    SELECT COALESCE(array_agg(r.item ORDER BY r.next_review), '{}')
+    INTO v_reviews
+    FROM (
+        SELECT
+            uqp.next_review,
+            to_jsonb(q) || jsonb_build_object('isReview', true, 'progress', to_jsonb(uqp)) AS item
+        FROM user_question_progress uqp
+        JOIN questions q ON q.id = uqp.question_id
+        WHERE uqp.user_id = p_user_id
+          AND uqp.next_review <= NOW()
+          AND q.is_active = true
+          AND (p_tema IS NULL OR q.tema = p_tema)
+        ORDER BY uqp.next_review
+        LIMIT v_review_count + 5
+    ) r;
+
+    -- ------------------------------------------------------------------
+    -- 3. New questions via get_study_questions, closest to target difficulty
+    -- ------------------------------------------------------------------
+    -- Most recently reviewed 1000 ids (older seen ones are fine to see again)
+    SELECT COALESCE(array_agg(question_id), '{}')
+    INTO v_exclude
+    FROM (
+        SELECT question_id
+        FROM user_question_progress
+        WHERE user_id = p_user_id
+        ORDER BY last_review DESC NULLS LAST
+        LIMIT 1000
+    ) s;
+
+    SELECT COALESCE(array_agg(n.item ORDER BY n.distance, n.ord), '{}')
+    INTO v_new
+    FROM (
+        SELECT
+            to_jsonb(sq.g) || jsonb_build_object('isReview', false, 'progress', NULL) AS item,
+            CASE WHEN v_level IS NULL THEN 0
+                 ELSE ABS(COALESCE((to_jsonb(sq.g)->>'difficulty')::NUMERIC, 3) - v_level)
+            END AS distance,
+            sq.ord
+        FROM (
+            SELECT g, row_number() OVER () AS ord
+            FROM get_study_questions(
+                CASE WHEN p_tema IS NULL THEN NULL ELSE ARRAY[p_tema] END,
+                LEAST(GREATEST(v_new_count + 5, 1), 50),
+                v_exclude
+            ) g
+        ) sq
+        WHERE p_tier IS NULL OR to_jsonb(sq.g)->>'tier' = p_tier
+    ) n;
+
+    -- ------------------------------------------------------------------
+    -- 4. Backfill shortfalls
+    -- ------------------------------------------------------------------
+    v_sel_reviews := COALESCE(v_reviews[1:v_review_count], '{}');
+    v_sel_new := COALESCE(v_new[1:v_new_count], '{}');
+
+    v_shortfall := v_review_count - cardinality(v_sel_reviews);
+    IF v_shortfall > 0 AND cardinality(v_new) > v_new_count THEN
+        v_sel_new := v_sel_new || COALESCE(v_new[v_new_count + 1:v_new_count + v_shortfall], '{}');
+    END IF;
+
+    v_shortfall := v_new_count - cardinality(v_sel_new);
+    IF v_shortfall > 0 AND cardinality(v_reviews) > v_review_count THEN
+        v_sel_reviews := v_sel_reviews || COALESCE(v_reviews[v_review_count + 1:v_review_count + v_shortfall], '{}');
+    END IF;
+
+    -- ------------------------------------------------------------------
+    -- 5. Interleave: prefer a new question after a review
+    -- ------------------------------------------------------------------
+    v_nr := cardinality(v_sel_reviews);
+    v_nn := cardinality(v_sel_new);
+
+    WHILE v_ri <= v_nr OR v_ni <= v_nn LOOP
+        IF v_last_was_review AND v_ni <= v_nn THEN
+            v_session := v_session || jsonb_build_array(v_sel_new[v_ni]);
+            v_ni := v_ni + 1;
+            v_last_was_review := false;
+        ELSIF NOT v_last_was_review AND v_ri <= v_nr AND random() < 0.3 THEN
+            v_session := v_session || jsonb_build_array(v_sel_reviews[v_ri]);
+            v_ri := v_ri + 1;
+            v_last_was_review := true;
+        ELSIF v_ni <= v_nn THEN
+            v_session := v_session || jsonb_build_array(v_sel_new[v_ni]);
+            v_ni := v_ni + 1;
+            v_last_was_review := false;
+        ELSE
+            v_session := v_session || jsonb_build_array(v_sel_reviews[v_ri]);
+            v_ri := v_ri + 1;
+            v_last_was_review := true;
+        END IF;
+    END LOOP;
+
+    RETURN jsonb_build_object(
+        'difficulty', v_difficulty,
+        'questions', v_session
+    );
+END;
+$$;
+
+GRANT EXECUTE ON FUNCTION generate_hybrid_session(UUID, INTEGER, NUMERIC, INTEGER, TEXT, BOOLEAN) TO authenticated;
+
+COMMENT ON FUNCTION generate_hybrid_session IS 'Construye una sesión híbrida (repaso + nuevas) en una sola llamada: dificultad adaptativa, selección, relleno e intercalado';
+
+-- ============================================================================
+-- END OF MIGRATION 015
+-- ============================================================================
@@ -0,0 +1,236 @@
+-- ============================================================================
+-- MIGRATION 016: Incrementally maintained per-user progress rollup
+-- ============================================================================
+-- calculateAdaptiveDifficulty, getStudyStats and analyzeWeaknesses used to
+-- scan every user_question_progress row of the user on each dashboard load.
+-- This migration keeps running totals per user and per user x tema, updated
+-- by a row-level trigger, so those services read O(temas) rows instead of
+-- O(questions).
+--
+-- Rows:
+--   tema = 0       -> totals across the whole bank for the user
+--   tema = 1..100  -> totals for that tema (questions without tema only
+--                     count towards the tema 0 row)
+--
+-- Also adds get_weak_articles(), which aggregates failed questions by
+-- legal_reference server-side (full history, no client-side cap).
+-- ============================================================================
+
+-- ============================================================================
+-- PART 1: ROLLUP TABLE
+-- ============================================================================
+
+CREATE TABLE IF NOT EXISTS user_progress_rollup (
+    user_id UUID NOT NULL REFERENCES auth.users(id) ON DELETE CASCADE,
+    tema INTEGER NOT NULL DEFAULT 0,
+
+    -- Row counts
+    progress_count INTEGER NOT NULL DEFAULT 0,        -- progress rows
+    seen_count INTEGER NOT NULL DEFAULT 0,            -- rows with times_seen > 0
+    failed_count INTEGER NOT NULL DEFAULT 0,          -- rows with times_correct < times_seen
+    high_difficulty_count INTEGER NOT NULL DEFAULT 0, -- rows with difficulty > 7
+
+    -- Sums
+    times_seen BIGINT NOT NULL DEFAULT 0,
+    times_correct BIGINT NOT NULL DEFAULT 0,
+    difficulty_sum NUMERIC NOT NULL DEFAULT 0,        -- over seen rows, 0/NULL counted as 5.0
+
+    -- FSRS state counts (0=New, 1=Learning, 2=Review, 3=Relearning)
+    new_count INTEGER NOT NULL DEFAULT 0,
+    learning_count INTEGER NOT NULL DEFAULT 0,
+    review_count INTEGER NOT NULL DEFAULT 0,
+    relearning_count INTEGER NOT NULL DEFAULT 0,
+
+    updated_at TIMESTAMPTZ DEFAULT NOW(),
+
+    PRIMARY KEY (user_id, tema)
+);
+
+COMMENT ON TABLE user_progress_rollup IS 'Totales de progreso por usuario (tema=0) y por usuario x tema, mantenidos por trigger sobre user_question_progress';
+
+ALTER TABLE user_progress_rollup ENABLE ROW LEVEL SECURITY;
+
+-- Read-only for the owner; writes only happen through the trigger
+CREATE POLICY "Progress rollup: Users can view own rollup"
+    ON user_progress_rollup FOR SELECT
+    TO authenticated
+    USING (auth.uid() = user_id);
+
+-- ============================================================================
+-- PART 2: DELTA FUNCTION + TRIGGER
+-- ============================================================================
+
+-- Apply the difference between an old and a new progress row for one
+-- (user, question). Either row may be NULL (insert / delete).
+CREATE OR REPLACE FUNCTION apply_progress_rollup_delta(
+    p_user_id UUID,
+    p_question_id INTEGER,
+    p_old user_question_progress,
+    p_new user_question_progress
+)
+RETURNS void AS $$
+DECLARE
+    v_tema INTEGER;
+    v_has_old INTEGER := CASE WHEN (p_old).user_id IS NOT NULL THEN 1 ELSE 0 END;
+    v_has_new INTEGER := CASE WHEN (p_new).user_id IS NOT NULL THEN 1 ELSE 0 END;
+    v_old_seen INTEGER := CASE WHEN COALESCE((p_old).times_seen, 0) > 0 THEN 1 ELSE 0 END;
+    v_new_seen INTEGER := CASE WHEN COALESCE((p_new).times_seen, 0) > 0 THEN 1 ELSE 0 END;
+BEGIN
+    SELECT tema INTO v_tema FROM questions WHERE id = p_question_id;
+
+    INSERT INTO user_progress_rollup AS r (
+        user_id, tema,
+        progress_count, seen_count, failed_count, high_difficulty_count,
+        times_seen, times_correct, difficulty_sum,
+        new_count, learning_count, review_count, relearning_count
+    )
+    SELECT
+        p_user_id, t,
+        v_has_new - v_has_old,
+        v_new_seen - v_old_seen,
+        (CASE WHEN COALESCE((p_new).times_correct, 0) < COALESCE((p_new).times_seen, 0) THEN 1 ELSE 0 END)
+          - (CASE WHEN COALESCE((p_old).times_correct, 0) < COALESCE((p_old).times_seen, 0) THEN 1 ELSE 0 END),
+        (CASE WHEN COALESCE((p_new).difficulty, 0) > 7 THEN 1 ELSE 0 END)
+          - (CASE WHEN COALESCE((p_old).difficulty, 0) > 7 THEN 1 ELSE 0 END),
+        COALESCE((p_new).times_seen, 0) - COALESCE((p_old).times_seen, 0),
+        COALESCE((p_new).times_correct, 0) - COALESCE((p_old).times_correct, 0),
+        v_new_seen * COALESCE(NULLIF((p_new).difficulty, 0), 5.0)
+          - v_old_seen * COALESCE(NULLIF((p_old).difficulty, 0), 5.0),
+        v_has_new * (CASE WHEN COALESCE((p_new).state, 0) = 0 THEN 1 ELSE 0 END)
+          - v_has_old * (CASE WHEN COALESCE((p_old).state, 0) = 0 THEN 1 ELSE 0 END),
+        (CASE WHEN (p_new).state = 1 THEN 1 ELSE 0 END) - (CASE WHEN (p_old).state = 1 THEN 1 ELSE 0 END),
+        (CASE WHEN (p_new).state = 2 THEN 1 ELSE 0 END) - (CASE WHEN (p_old).state = 2 THEN 1 ELSE 0 END),
+        (CASE WHEN (p_new).state = 3 THEN 1 ELSE 0 END) - (CASE WHEN (p_old).state = 3 THEN 1 ELSE 0 END)
+    FROM unnest(CASE WHEN v_tema IS NULL THEN ARRAY[0] ELSE ARRAY[0, v_tema] END) AS t
+    ON CONFLICT (user_id, tema) DO UPDATE SET
+        progress_count = r.progress_count + EXCLUDED.progress_count,
+        seen_count = r.seen_count + EXCLUDED.seen_count,
+        failed_count = r.failed_count + EXCLUDED.failed_count,
+        high_difficulty_count = r.high_difficulty_count + EXCLUDED.high_difficulty_count,
+        times_seen = r.times_seen + EXCLUDED.times_seen,
+        times_correct = r.times_correct + EXCLUDED.times_correct,
+        difficulty_sum = r.difficulty_sum + EXCLUDED.difficulty_sum,
+        new_count = r.new_count + EXCLUDED.new_count,
+        learning_count = r.learning_count + EXCLUDED.learning_count,
+        review_count = r.review_count + EXCLUDED.review_count,
+        relearning_count = r.relearning_count + EXCLUDED.relearning_count,
+        updated_at = NOW();
+END;
+$$ LANGUAGE plpgsql SECURITY DEFINER SET search_path = public;
+
+CREATE OR REPLACE FUNCTION maintain_user_progress_rollup()
+RETURNS TRIGGER AS $$
+BEGIN
+    IF TG_OP = 'INSERT' THEN
+        PERFORM apply_progress_rollup_delta(NEW.user_id, NEW.question_id, NULL, NEW);
+    ELSIF TG_OP = 'DELETE' THEN
+        PERFORM apply_progress_rollup_delta(OLD.user_id, OLD.question_id, OLD, NULL);
+    ELSIF OLD.user_id = NEW.user_id AND OLD.question_id = NEW.question_id THEN
+        -- Normal answer update: one combined delta
+        PERFORM apply_progress_rollup_delta(NEW.user_id, NEW.question_id, OLD, NEW);
+    ELSE
+        PERFORM apply_progress_rollup_delta(OLD.user_id, OLD.question_id, OLD, NULL);
+        PERFORM apply_progress_rollup_delta(NEW.user_id, NEW.question_id, NULL, NEW);
+    END IF;
+
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql SECURITY DEFINER SET search_path = public;
+
+DROP TRIGGER IF EXISTS maintain_user_progress_rollup ON user_question_progress;
+CREATE TRIGGER maintain_user_progress_rollup
+    AFTER INSERT OR UPDATE OR DELETE ON user_question_progress
+    FOR EACH ROW
+    EXECUTE FUNCTION maintain_user_progress_rollup();
+
+-- ============================================================================
+-- PART 3: REBUILD (backfill + repair if question temas change)
+-- ============================================================================
+
+CREATE OR REPLACE FUNCTION refresh_user_progress_rollup(p_user_id UUID DEFAULT NULL)
+RETURNS void AS $$
+BEGIN
+    DELETE FROM user_progress_rollup
+    WHERE p_user_id IS NULL OR user_id = p_user_id;
+
+    INSERT INTO user_progress_rollup (
+        user_id, tema,
+        progress_count, seen_count, failed_count, high_difficulty_count,
+        times_seen, times_correct, difficulty_sum,
+        new_count, learning_count, review_count, relearning_count
+    )
+    SELECT
+        uqp.user_id,
+        COALESCE(g.tema, 0),
+        COUNT(*),
+        COUNT(*) FILTER (WHERE uqp.times_seen > 0),
+        COUNT(*) FILTER (WHERE COALESCE(uqp.times_correct, 0) < COALESCE(uqp.times_seen, 0)),
+        COUNT(*) FILTER (WHERE uqp.difficulty > 7),
+        COALESCE(SUM(uqp.times_seen), 0),
+        COALESCE(SUM(uqp.times_correct), 0),
+        COALESCE(SUM(COALESCE(NULLIF(uqp.difficulty, 0), 5.0)) FILTER (WHERE uqp.times_seen > 0), 0),
+        COUNT(*) FILTER (WHERE COALESCE(uqp.state, 0) = 0),
+        COUNT(*) FILTER (WHERE uqp.state = 1),
+        COUNT(*) FILTER (WHERE uqp.state = 2),
+        COUNT(*) FILTER (WHERE uqp.state = 3)
+    FROM user_question_progress uqp
+    LEFT JOIN questions q ON q.id = uqp.question_id
+    CROSS JOIN LATERAL (
+        SELECT NULL::INTEGER AS tema
+        UNION ALL
+        SELECT q.tema WHERE q.tema IS NOT NULL
+    ) g
+    WHERE p_user_id IS NULL OR uqp.user_id = p_user_id
+    GROUP BY uqp.user_id, g.tema;
+END;
+$$ LANGUAGE plpgsql SECURITY DEFINER SET search_path = public;
+
+COMMENT ON FUNCTION refresh_user_progress_rollup IS 'Recalcula user_progress_rollup desde user_question_progress (NULL = todos los usuarios)';
+
+-- Maintenance only: not callable through the API (the trigger still runs)
+REVOKE EXECUTE ON FUNCTION apply_progress_rollup_delta(UUID, INTEGER, user_question_progress, user_question_progress) FROM PUBLIC, anon, authenticated;
+REVOKE EXECUTE ON FUNCTION maintain_user_progress_rollup() FROM PUBLIC, anon, authenticated;
+REVOKE EXECUTE ON FUNCTION refresh_user_progress_rollup(UUID) FROM PUBLIC, anon, authenticated;
+
+-- Backfill existing progress
+SELECT refresh_user_progress_rollup(NULL);
+
+-- ============================================================================
+-- PART 4: WEAK ARTICLES (server-side aggregate, full history)
+-- ============================================================================
+
+CREATE OR REPLACE FUNCTION get_weak_articles(p_limit INTEGER DEFAULT 10)
+RETURNS TABLE (
+    ref TEXT,
+    tema INTEGER,
+    fail_count BIGINT,
+    total_seen BIGINT,
+    question_ids INTEGER[]
+) AS $$
+    SELECT
+        TRIM(q.legal_reference) AS ref,
+        MIN(q.tema) AS tema,
+        SUM(uqp.times_seen - uqp.times_correct) AS fail_count,
+        SUM(uqp.times_seen) AS total_seen,
+        array_agg(q.id ORDER BY q.id) AS question_ids
+    FROM user_question_progress uqp
+    JOIN questions q ON q.id = uqp.question_id
+    WHERE uqp.user_id = auth.uid()
+      AND uqp.times_seen > 0
+      AND uqp.times_correct < uqp.times_seen
+      AND q.legal_reference IS NOT NULL
+      AND TRIM(q.legal_reference) <> ''
+    GROUP BY TRIM(q.legal_reference)
+    HAVING SUM(uqp.times_seen - uqp.times_correct) >= 2
+       AND SUM(uqp.times_seen) >= 3
+    ORDER BY SUM(uqp.times_correct)::NUMERIC / SUM(uqp.times_seen) ASC
+    LIMIT LEAST(GREATEST(COALESCE(p_limit, 10), 1), 50);
+$$ LANGUAGE sql STABLE SECURITY DEFINER SET search_path = public;
+
+GRANT EXECUTE ON FUNCTION get_weak_articles(INTEGER) TO authenticated;
+
+COMMENT ON FUNCTION get_weak_articles IS 'Artículos (legal_reference) con más fallos acumulados del usuario actual';
+
+-- ============================================================================
+-- END OF MIGRATION 016
+-- ============================================================================
@@ -0,0 +1,426 @@
+-- ============================================================================
+-- MIGRATION 017: Daily activity rollup + activity dashboard RPC
+-- ============================================================================
+-- useActivityData.fetchActivityData used to download every completed
+-- test_sessions row of the user and derive the Activity tab figures in
+-- JavaScript. This migration:
+--   1. Keeps a per-user, per-day (and per-day x topic) aggregate of
+--      completed sessions, refreshed by a trigger on test_sessions for the
+--      affected day only.
+--   2. Adds get_activity_dashboard(), returning every Activity tab figure
+--      (weekly bars, month calendar, streaks, today, totals, weekly
+--      improvement, least practiced tema, simulacro average) from O(days)
+--      aggregate rows.
+--   3. Adds get_session_history_page(), a keyset-paginated session list
+--      (started_at DESC, id DESC) served by idx_test_sessions_user_date.
+--
+-- Days are calendar days in Europe/Madrid (activity_day()), the time zone of
+-- the exam calendar; the client used the browser's local day before.
+--
+-- Rows:
+--   topic_id = 0   -> every completed session of the day
+--   topic_id > 0   -> sessions with that topic_id
+-- ============================================================================
+
+-- ============================================================================
+-- PART 1: DAY BUCKETING
+-- ============================================================================
+
+CREATE OR REPLACE FUNCTION activity_day(p_ts TIMESTAMPTZ)
+RETURNS DATE AS $$
+    SELECT (p_ts AT TIME ZONE 'Europe/Madrid')::DATE;
+$$ LANGUAGE sql IMMUTABLE;
+
+-- First instant of a calendar day (inverse of activity_day)
+CREATE OR REPLACE FUNCTION activity_day_start(p_day DATE)
+RETURNS TIMESTAMPTZ AS $$
+    SELECT p_day::TIMESTAMP AT TIME ZONE 'Europe/Madrid';
+$$ LANGUAGE sql IMMUTABLE;
+
+-- ============================================================================
+-- PART 2: DAILY ACTIVITY TABLE
+-- ============================================================================
+
+CREATE TABLE IF NOT EXISTS user_daily_activity (
+    user_id UUID NOT NULL REFERENCES auth.users(id) ON DELETE CASCADE,
+    activity_date DATE NOT NULL,
+    topic_id INTEGER NOT NULL DEFAULT 0,
+
+    sessions_count INTEGER NOT NULL DEFAULT 0,
+    questions_total INTEGER NOT NULL DEFAULT 0,
+    questions_correct INTEGER NOT NULL DEFAULT 0,
+    time_seconds INTEGER NOT NULL DEFAULT 0,
+
+    -- test_type = 'simulacro' or >= 80 questions (same rule as the client)
+    simulacro_count INTEGER NOT NULL DEFAULT 0,
+    simulacro_percentage_sum INTEGER NOT NULL DEFAULT 0,
+
+    last_session_at TIMESTAMPTZ,
+    updated_at TIMESTAMPTZ DEFAULT NOW(),
+
+    PRIMARY KEY (user_id, activity_date, topic_id)
+);
+
+COMMENT ON TABLE user_daily_activity IS 'Actividad diaria por usuario (topic_id=0) y por usuario x tema, mantenida por trigger sobre test_sessions';
+
+ALTER TABLE user_daily_activity ENABLE ROW LEVEL SECURITY;
+
+-- Read-only for the owner; writes only happen through the trigger
+CREATE POLICY "Daily activity: Users can view own activity"
+    ON user_daily_activity FOR SELECT
+    TO authenticated
+    USING (auth.uid() = user_id);
+
+-- ============================================================================
+-- PART 3: REFRESH ONE DAY + TRIGGER
+-- ============================================================================
+
+-- Recompute the rows of one (user, day) from test_sessions. A day holds a
+-- handful of sessions, so this stays cheap and can't drift like deltas
+-- (last_session_at is a MAX and can't be decremented on delete).
+-- Two sessions of the same (user, day) completing at once would both delete
+-- and re-insert the day; under READ COMMITTED the second DELETE can't see
+-- the first one's uncommitted rows and its INSERT hits the primary key. The
+-- transaction-level advisory lock serializes refreshes of the same day, and
+-- each DELETE runs with a snapshot taken after the lock is granted.
+CREATE OR REPLACE FUNCTION refresh_user_daily_activity(p_user_id UUID, p_day DATE)
+RETURNS void AS $$
+BEGIN
+    PERFORM pg_advisory_xact_lock(
+        hashtext('user_daily_activity'),
+        hashtext(p_user_id::text || ':' || p_day::text)
+    );
+
+    DELETE FROM user_daily_activity
+    WHERE user_id = p_user_id AND activity_date = p_day;
+
+    INSERT INTO user_daily_activity (
+        user_id, activity_date, topic_id,
+        sessions_count, questions_total, questions_correct, time_seconds,
+        simulacro_count, simulacro_percentage_sum, last_session_at
+    )
+    SELECT
+        p_user_id,
+        p_day,
+        COALESCE(g.topic_id, 0),
+        COUNT(*),
+        COALESCE(SUM(ts.total_questions), 0),
+        COALESCE(SUM(ts.correct_count), 0),
+        COALESCE(SUM(ts.time_seconds), 0),
+        COUNT(*) FILTER (WHERE ts.test_type = 'simulacro' OR ts.total_questions >= 80),
+        COALESCE(SUM(COALESCE(ts.percentage, 0))
+            FILTER (WHERE ts.test_type = 'simulacro' OR ts.total_questions >= 80), 0),
+        MAX(ts.started_at)
+    FROM test_sessions ts
+    CROSS JOIN LATERAL (
+        SELECT NULL::INTEGER AS topic_id
+        UNION ALL
+        SELECT ts.topic_id WHERE ts.topic_id IS NOT NULL AND ts.topic_id > 0
+    ) g
+    WHERE ts.user_id = p_user_id
+      AND ts.status = 'completed'
+      AND ts.started_at >= activity_day_start(p_day)
+      AND ts.started_at < activity_day_start(p_day + 1)
+    GROUP BY g.topic_id;
+END;
+$$ LANGUAGE plpgsql SECURITY DEFINER SET search_path = public;
+
+-- A failed refresh must never abort the user's test_sessions write: the
+-- error is logged and the day is fixed by its next refresh or by
+-- rebuild_user_daily_activity().
+CREATE OR REPLACE FUNCTION maintain_user_daily_activity()
+RETURNS TRIGGER AS $$
+BEGIN
+    BEGIN
+        IF TG_OP IN ('UPDATE', 'DELETE') AND OLD.status = 'completed' AND OLD.started_at IS NOT NULL THEN
+            PERFORM refresh_user_daily_activity(OLD.user_id, activity_day(OLD.started_at));
+        END IF;
+
+        IF TG_OP IN ('INSERT', 'UPDATE') AND NEW.status = 'completed' AND NEW.started_at IS NOT NULL THEN
+            -- Skip the second refresh when an update stays in the same day bucket
+            IF TG_OP = 'INSERT'
+               OR OLD.status IS DISTINCT FROM 'completed'
+               OR OLD.user_id <> NEW.user_id
+               OR activity_day(OLD.started_at) IS DISTINCT FROM activity_day(NEW.started_at) THEN
+                PERFORM refresh_user_daily_activity(NEW.user_id, activity_day(NEW.started_at));
+            END IF;
+        END IF;
+    EXCEPTION WHEN OTHERS THEN
+        RAISE WARNING 'maintain_user_daily_activity: refresh failed for session % (%): %',
+            COALESCE(NEW.id, OLD.id), SQLSTATE, SQLERRM;
+    END;
+
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql SECURITY DEFINER SET search_path = public;
+
+DROP TRIGGER IF EXISTS maintain_user_daily_activity ON test_sessions;
+CREATE TRIGGER maintain_user_daily_activity
+    AFTER INSERT OR UPDATE OR DELETE ON test_sessions
+    FOR EACH ROW
+    EXECUTE FUNCTION maintain_user_daily_activity();
+
+-- ============================================================================
+-- PART 4: BACKFILL
+-- ============================================================================
+
+CREATE OR REPLACE FUNCTION rebuild_user_daily_activity(p_user_id UUID DEFAULT NULL)
+RETURNS void AS $$
+DECLARE
+    v_row RECORD;
+BEGIN
+    DELETE FROM user_daily_activity
+    WHERE p_user_id IS NULL OR user_id = p_user_id;
+
+    FOR v_row IN
+        SELECT DISTINCT user_id, activity_day(started_at) AS day
+        FROM test_sessions
+        WHERE status = 'completed'
+          AND started_at IS NOT NULL
+          AND (p_user_id IS NULL OR user_id = p_user_id)
+    LOOP
+        PERFORM refresh_user_daily_activity(v_row.user_id, v_row.day);
+    END LOOP;
+END;
+$$ LANGUAGE plpgsql SECURITY DEFINER SET search_path = public;
+
+COMMENT ON FUNCTION rebuild_user_daily_activity IS 'Recalcula user_daily_activity desde test_sessions (NULL = todos los usuarios)';
+
+-- Maintenance only: not callable through the API
+REVOKE EXECUTE ON FUNCTION refresh_user_daily_activity(UUID, DATE) FROM PUBLIC, anon, authenticated;
+REVOKE EXECUTE ON FUNCTION rebuild_user_daily_activity(UUID) FROM PUBLIC, anon, authenticated;
+
+SELECT rebuild_user_daily_activity(NULL);
+
+-- ============================================================================
+-- PART 5: ACTIVITY DASHBOARD RPC
+-- ============================================================================
+-- Returns JSONB:
+-- {
+--   "today":   { questionsAnswered, questionsCorrect, testsCompleted, accuracyRate },
+--   "weekly":  [correct answers Mon..Sun of the current week],
+--   "calendar": [days of the current month with activity],
+--   "totals":  { testsCompleted, questionsCorrect, totalQuestions, accuracyRate, daysStudied },
+--   "streak":  { current, longest },
+--   "weeklyImprovement": accuracy points vs last week (0 without last week data),
+--   "leastPracticedTema": { tema, daysSince } | null (only when >= 7 days),
+--   "simulacroAvg": average percentage of simulacros,
+--   "days":    [{ date, sessions, questions, correct }] for the last p_range_days
+-- }
+-- Rounding mirrors Math.round (half up) so figures match the old client code.
+
+CREATE OR REPLACE FUNCTION get_activity_dashboard(
+    p_user_id UUID,
+    p_range_days INTEGER DEFAULT 30
+)
+RETURNS JSONB
+LANGUAGE plpgsql
+STABLE
+SET search_path = public
+AS $$
+DECLARE
+    v_range INTEGER := LEAST(GREATEST(COALESCE(p_range_days, 30), 1), 366);
+    v_today DATE := activity_day(NOW());
+    v_week_start DATE := v_today - (EXTRACT(ISODOW FROM v_today)::INTEGER - 1);
+    v_month_start DATE := date_trunc('month', v_today)::DATE;
+
+    v_today_json JSONB;
+    v_weekly JSONB;
+    v_calendar JSONB;
+    v_totals JSONB;
+    v_days JSONB;
+
+    v_current_streak INTEGER := 0;
+    v_longest_streak INTEGER := 0;
+    v_last_day DATE;
+    v_last_run INTEGER;
+
+    v_this_week_correct BIGINT;
+    v_this_week_total BIGINT;
+    v_last_week_correct BIGINT;
+    v_last_week_total BIGINT;
+    v_improvement INTEGER := 0;
+
+    v_oldest_topic INTEGER;
+    v_oldest_at TIMESTAMPTZ;
+    v_days_since INTEGER;
+    v_least_practiced JSONB := NULL;
+
+    v_simulacro_count BIGINT;
+    v_simulacro_sum BIGINT;
+BEGIN
+    IF auth.uid() IS NULL OR p_user_id IS DISTINCT FROM auth.uid() THEN
+        RAISE EXCEPTION 'No autorizado';
+    END IF;
+
+    -- Today
+    SELECT jsonb_build_object(
+        'questionsAnswered', COALESCE(SUM(questions_total), 0),
+        'questionsCorrect', COALESCE(SUM(questions_correct), 0),
+        'testsCompleted', COALESCE(SUM(sessions_count), 0),
+        'accuracyRate', CASE WHEN COALESCE(SUM(questions_total), 0) > 0
+            THEN FLOOR(SUM(questions_correct)::NUMERIC / SUM(questions_total) * 100 + 0.5)::INTEGER
+            ELSE 0 END
+    )
+    INTO v_today_json
+    FROM user_daily_activity
+    WHERE user_id = p_user_id AND topic_id = 0 AND activity_date = v_today;
+
+    -- Weekly bars (correct answers per day, Monday first)
+    SELECT jsonb_agg(COALESCE(a.questions_correct, 0) ORDER BY d.n)
+    INTO v_weekly
+    FROM generate_series(0, 6) AS d(n)
+    LEFT JOIN user_daily_activity a
+        ON a.user_id = p_user_id AND a.topic_id = 0 AND a.activity_date = v_week_start + d.n;
+
+    -- Month calendar (day numbers with activity, from the 1st onwards)
+    SELECT COALESCE(jsonb_agg(EXTRACT(DAY FROM activity_date)::INTEGER ORDER BY activity_date), '[]'::JSONB)
+    INTO v_calendar
+    FROM user_daily_activity
+    WHERE user_id = p_user_id AND topic_id = 0 AND activity_date >= v_month_start;
+
+    -- All-time totals + simulacro average
+    SELECT
+        jsonb_build_object(
+            'testsCompleted', COALESCE(SUM(sessions_count), 0),
+            'questionsCorrect', COALESCE(SUM(questions_correct), 0),
+            'totalQuestions', COALESCE(SUM(questions_total), 0),
+            'accuracyRate', CASE WHEN COALESCE(SUM(questions_total), 0) > 0
+                THEN FLOOR(SUM(questions_correct)::NUMERIC / SUM(questions_total) * 100 + 0.5)::INTEGER
+                ELSE 0 END,
+            'daysStudied', COUNT(*)
+        ),
+        COALESCE(SUM(simulacro_count), 0),
+        COALESCE(SUM(simulacro_percentage_sum), 0)
+    INTO v_totals, v_simulacro_count, v_simulacro_sum
+    FROM user_daily_activity
+    WHERE user_id = p_user_id AND topic_id = 0;
+
+    -- Streaks: runs of consecutive days (gaps and islands)
+    WITH runs AS (
+        SELECT
+            MAX(activity_date) AS run_end,
+            COUNT(*)::INTEGER AS run_length
+        FROM (
+            SELECT activity_date,
+                   activity_date - (ROW_NUMBER() OVER (ORDER BY activity_date))::INTEGER AS grp
+            FROM user_daily_activity
+            WHERE user_id = p_user_id AND topic_id = 0
+        ) s
+        GROUP BY grp
+    )
+    SELECT
+        COALESCE(MAX(run_length), 0),
+        MAX(run_end),
+        (array_agg(run_length ORDER BY run_end DESC))[1]
+    INTO v_longest_streak, v_last_day, v_last_run
+    FROM runs;
+
+    -- Current streak: the latest run, if it reaches today or yesterday
+    IF v_last_day IS NOT NULL AND v_last_day >= v_today - 1 THEN
+        v_current_streak := v_last_run;
+    END IF;
+
+    -- Weekly improvement (accuracy this week vs last week)
+    SELECT
+        COALESCE(SUM(questions_correct) FILTER (WHERE activity_date >= v_week_start), 0),
+        COALESCE(SUM(questions_total) FILTER (WHERE activity_date >= v_week_start), 0),
+        COALESCE(SUM(questions_correct) FILTER (WHERE activity_date < v_week_start), 0),
+        COALESCE(SUM(questions_total) FILTER (WHERE activity_date < v_week_start), 0)
+    INTO v_this_week_correct, v_this_week_total, v_last_week_correct, v_last_week_total
+    FROM user_daily_activity
+    WHERE user_id = p_user_id AND topic_id = 0 AND activity_date >= v_week_start - 7;
+
+    IF v_last_week_total > 0 AND v_last_week_correct > 0 THEN
+        v_improvement := FLOOR(
+            (CASE WHEN v_this_week_total > 0
+                  THEN v_this_week_correct::NUMERIC / v_this_week_total * 100
+                  ELSE 0 END)
+            - v_last_week_correct::NUMERIC / v_last_week_total * 100
+            + 0.5
+        )::INTEGER;
+    END IF;
+
+    -- Least practiced tema (oldest last session, only if >= 7 days ago)
+    SELECT topic_id, MAX(last_session_at)
+    INTO v_oldest_topic, v_oldest_at
+    FROM user_daily_activity
+    WHERE user_id = p_user_id AND topic_id > 0
+    GROUP BY topic_id
+    ORDER BY MAX(last_session_at) ASC, topic_id ASC
+    LIMIT 1;
+
+    IF v_oldest_at IS NOT NULL THEN
+        v_days_since := FLOOR(EXTRACT(EPOCH FROM NOW() - v_oldest_at) / 86400)::INTEGER;
+        IF v_days_since >= 7 THEN
+            v_least_practiced := jsonb_build_object('tema', v_oldest_topic, 'daysSince', v_days_since);
+        END IF;
+    END IF;
+
+    -- Daily series for the requested range
+    SELECT jsonb_agg(jsonb_build_object(
+        'date', v_today - d.n,
+        'sessions', COALESCE(a.sessions_count, 0),
+        'questions', COALESCE(a.questions_total, 0),
+        'correct', COALESCE(a.questions_correct, 0)
+    ) ORDER BY d.n DESC)
+    INTO v_days
+    FROM generate_series(0, v_range - 1) AS d(n)
+    LEFT JOIN user_daily_activity a
+        ON a.user_id = p_user_id AND a.topic_id = 0 AND a.activity_date = v_today - d.n;
+
+    RETURN jsonb_build_object(
+        'today', v_today_json,
+        'weekly', v_weekly,
+        'calendar', v_calendar,
+        'totals', v_totals,
+        'streak', jsonb_build_object('current', v_current_streak, 'longest', v_longest_streak),
+        'weeklyImprovement', v_improvement,
+        'leastPracticedTema', v_least_practiced,
+        'simulacroAvg', CASE WHEN v_simulacro_count > 0
+            THEN FLOOR(v_simulacro_sum::NUMERIC / v_simulacro_count + 0.5)::INTEGER
+            ELSE 0 END,
+        'days', COALESCE(v_days, '[]'::JSONB)
+    );
+END;
+$$;
+
+GRANT EXECUTE ON FUNCTION get_activity_dashboard(UUID, INTEGER) TO authenticated;
+
+COMMENT ON FUNCTION get_activity_dashboard IS 'Todas las cifras de la pestaña Actividad en una llamada, desde user_daily_activity';
+
+-- ============================================================================
+-- PART 6: KEYSET-PAGINATED SESSION HISTORY
+-- ============================================================================
+-- Pass the started_at/id of the last row received to get the next page.
+-- Runs as the caller, so test_sessions RLS still applies. Returns whole
+-- test_sessions rows, so the result type always matches the deployed table
+-- (its columns differ from 001_initial_schema).
+
+DROP FUNCTION IF EXISTS get_session_history_page(INTEGER, TIMESTAMPTZ, UUID);
+
+CREATE OR REPLACE FUNCTION get_session_history_page(
+    p_limit INTEGER DEFAULT 10,
+    p_before_started_at TIMESTAMPTZ DEFAULT NULL,
+    p_before_id UUID DEFAULT NULL
+)
+RETURNS SETOF test_sessions AS $$
+    SELECT ts.*
+    FROM test_sessions ts
+    WHERE ts.user_id = auth.uid()
+      AND ts.status = 'completed'
+      AND (
+          p_before_started_at IS NULL
+          OR (ts.started_at, ts.id) < (p_before_started_at, COALESCE(p_before_id, 'ffffffff-ffff-ffff-ffff-ffffffffffff'::UUID))
+      )
+    ORDER BY ts.started_at DESC, ts.id DESC
+    LIMIT LEAST(GREATEST(COALESCE(p_limit, 10), 1), 100);
+$$ LANGUAGE sql STABLE SET search_path = public;
+
+GRANT EXECUTE ON FUNCTION get_session_history_page(INTEGER, TIMESTAMPTZ, UUID) TO authenticated;
+
+COMMENT ON FUNCTION get_session_history_page IS 'Historial de sesiones completadas del usuario actual, paginado por cursor (started_at, id)';
+
+-- ============================================================================
+-- END OF MIGRATION 017
+-- ============================================================================
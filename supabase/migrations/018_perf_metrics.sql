@@ -0,0 +1,182 @@
+-- ============================================================================
+-- MIGRATION 018: Client performance metrics
+-- ============================================================================
+-- lib/perfTelemetry aggregates latencies in the browser (supabase calls,
+-- service spans, web vitals, long tasks) into fixed-bucket histograms and
+-- flushes one row per operation and time window through the errorTracking
+-- queue. This migration:
+--   1. Creates perf_metrics (insert-only for clients, readable by admins,
+--      same policies as error_logs).
+--   2. Adds get_perf_summary(), merging the histograms of a time range and
+--      returning p50 / p95 per operation for the admin panel.
+--
+-- Histogram bucket i (1-based) counts values in (bounds[i-1], bounds[i]];
+-- the last bucket counts values above the last bound.
+-- KEEP IN SYNC with BUCKET_BOUNDS in src/lib/perfHistogram.js
+-- ============================================================================
+
+-- ============================================================================
+-- PART 1: TABLE
+-- ============================================================================
+
+CREATE TABLE IF NOT EXISTS perf_metrics (
+    id UUID DEFAULT gen_random_uuid() PRIMARY KEY,
+    name TEXT NOT NULL,                          -- 'rpc:get_study_questions', 'LCP', ...
+    kind TEXT NOT NULL DEFAULT 'span'
+        CHECK (kind IN ('span', 'vital', 'longtask', 'ux')),
+    unit TEXT NOT NULL DEFAULT 'ms',             -- 'ms' or 'mcls' (CLS x 1000)
+    sample_count INTEGER NOT NULL CHECK (sample_count > 0),
+    sum_value DOUBLE PRECISION NOT NULL,
+    min_value DOUBLE PRECISION NOT NULL,
+    max_value DOUBLE PRECISION NOT NULL,
+    error_count INTEGER NOT NULL DEFAULT 0,
+    buckets INTEGER[] NOT NULL CHECK (cardinality(buckets) = 13),
+    sample_rate REAL NOT NULL DEFAULT 1 CHECK (sample_rate > 0 AND sample_rate <= 1),
+    window_start TIMESTAMPTZ NOT NULL,
+    window_seconds INTEGER NOT NULL,
+    created_at TIMESTAMPTZ DEFAULT now()
+);
+
+CREATE INDEX IF NOT EXISTS idx_perf_metrics_window ON perf_metrics (window_start DESC);
+CREATE INDEX IF NOT EXISTS idx_perf_metrics_name_window ON perf_metrics (name, window_start DESC);
+
+ALTER TABLE perf_metrics ENABLE ROW LEVEL SECURITY;
+
+-- Clients only write (like error_logs)
+CREATE POLICY "Users can insert perf metrics"
+    ON perf_metrics FOR INSERT
+    TO authenticated
+    WITH CHECK (true);
+
+CREATE POLICY "Anonymous users can insert perf metrics"
+    ON perf_metrics FOR INSERT
+    TO anon
+    WITH CHECK (true);
+
+-- Only admins can read
+CREATE POLICY "Admins can read perf metrics"
+    ON perf_metrics FOR SELECT
+    TO authenticated
+    USING (
+        EXISTS (
+            SELECT 1 FROM admin_users
+            WHERE email = auth.jwt() ->> 'email'
+            AND role = 'admin'
+        )
+    );
+
+COMMENT ON TABLE perf_metrics IS 'Histogramas de latencia agregados en el cliente (una fila por operación y ventana de envío)';
+COMMENT ON COLUMN perf_metrics.buckets IS 'Recuentos por cubeta; límites en src/lib/perfHistogram.js (BUCKET_BOUNDS)';
+COMMENT ON COLUMN perf_metrics.sample_rate IS 'Fracción de llamadas medidas; sample_count / sample_rate estima el total de llamadas';
+
+-- Cleanup reminder (same policy as error_logs)
+-- DELETE FROM perf_metrics WHERE window_start < now() - interval '30 days';
+
+-- ============================================================================
+-- PART 2: SUMMARY RPC
+-- ============================================================================
+
+-- SECURITY INVOKER: the admin-only SELECT policy applies, so non-admins
+-- get an empty result.
+CREATE OR REPLACE FUNCTION get_perf_summary(p_since_hours INTEGER DEFAULT 168)
+RETURNS TABLE (
+    operation TEXT,
+    metric_kind TEXT,
+    metric_unit TEXT,
+    samples BIGINT,
+    estimated_calls BIGINT,
+    error_rate NUMERIC,
+    avg_value NUMERIC,
+    p50 NUMERIC,
+    p95 NUMERIC,
+    max_value NUMERIC
+)
+LANGUAGE sql
+STABLE
+SECURITY INVOKER
+SET search_path = public
+AS $$
+    WITH recent AS (
+        SELECT *
+        FROM perf_metrics m
+        WHERE m.window_start >= now() - make_interval(hours => GREATEST(p_since_hours, 1))
+    ),
+    totals AS (
+        SELECT
+            r.name,
+            r.kind,
+            r.unit,
+            SUM(r.sample_count)::BIGINT AS samples,
+            ROUND(SUM(r.sample_count / r.sample_rate))::BIGINT AS estimated_calls,
+            SUM(r.error_count)::BIGINT AS errors,
+            SUM(r.sum_value) AS total_value,
+            MIN(r.min_value) AS min_value,
+            MAX(r.max_value) AS max_value
+        FROM recent r
+        GROUP BY r.name, r.kind, r.unit
+    ),
+    histogram AS (
+        SELECT r.name, r.kind, r.unit, b.idx, SUM(b.n)::DOUBLE PRECISION AS n
+        FROM recent r
+        CROSS JOIN LATERAL unnest(r.buckets) WITH ORDINALITY AS b(n, idx)
+        GROUP BY r.name, r.kind, r.unit, b.idx
+    ),
+    cumulative AS (
+        SELECT
+            h.name,
+            h.kind,
+            h.unit,
+            h.idx,
+            h.n,
+            SUM(h.n) OVER (PARTITION BY h.name, h.kind, h.unit ORDER BY h.idx) AS cum,
+            COALESCE(bounds.b[h.idx - 1], 0) AS lower_bound,
+            COALESCE(bounds.b[h.idx], t.max_value) AS upper_bound,
+            t.samples,
+            t.min_value,
+            t.max_value
+        FROM histogram h
+        JOIN totals t USING (name, kind, unit)
+        CROSS JOIN (
+            SELECT ARRAY[5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000, 30000]::DOUBLE PRECISION[] AS b
+        ) bounds
+    ),
+    -- First bucket reaching the target rank, linear interpolation inside it
+    percentiles AS (
+        SELECT DISTINCT ON (c.name, c.kind, c.unit, q.p)
+            c.name,
+            c.kind,
+            c.unit,
+            q.p,
+            LEAST(
+                GREATEST(
+                    c.lower_bound + (c.upper_bound - c.lower_bound) * ((q.p * c.samples - (c.cum - c.n)) / c.n),
+                    c.min_value
+                ),
+                c.max_value
+            ) AS value
+        FROM cumulative c
+        CROSS JOIN (VALUES (0.5::DOUBLE PRECISION), (0.95::DOUBLE PRECISION)) AS q(p)
+        WHERE c.n > 0
+          AND c.cum >= q.p * c.samples
+        ORDER BY c.name, c.kind, c.unit, q.p, c.idx
+    )
+    SELECT
+        t.name,
+        t.kind,
+        t.unit,
+        t.samples,
+        t.estimated_calls,
+        ROUND(t.errors::NUMERIC / t.samples, 4),
+        ROUND((t.total_value / t.samples)::NUMERIC, 1),
+        ROUND(MAX(p.value) FILTER (WHERE p.p = 0.5)::NUMERIC, 1),
+        ROUND(MAX(p.value) FILTER (WHERE p.p = 0.95)::NUMERIC, 1),
+        ROUND(t.max_value::NUMERIC, 1)
+    FROM totals t
+    LEFT JOIN percentiles p USING (name, kind, unit)
+    GROUP BY t.name, t.kind, t.unit, t.samples, t.estimated_calls, t.errors, t.total_value, t.max_value
+    ORDER BY t.kind, t.name;
+$$;
+
+GRANT EXECUTE ON FUNCTION get_perf_summary(INTEGER) TO authenticated;
+
+COMMENT ON FUNCTION get_perf_summary IS 'p50/p95 por operación a partir de los histogramas de perf_metrics (solo administradores)';
@@ -3,6 +3,18 @@ import react from '@vitejs/plugin-react'
 import tailwindcss from '@tailwindcss/vite'
 import path from 'path'
 
+// Chunk per group. Feature chunks (admin, draft, lab-demo) are only reached
+// through lazy imports, so learners never download them
+const CHUNK_GROUPS = [
+  ['vendor-react', /\/node_modules\/(react|react-dom|react-router|react-router-dom|@remix-run\/router|scheduler)\//],
+  ['vendor-supabase', /\/node_modules\/@supabase\//],
+  ['vendor-ui', /\/node_modules\/(framer-motion|motion-dom|motion-utils|lucide-react)\//],
+  ['admin', /\/src\/(pages|components)\/admin\//],
+  // DevPanel and DevModeRandomizer are used by learner pages
+  ['draft', /\/src\/(features\/draft\/|components\/dev\/(?!DevPanel|DevModeRandomizer))/],
+  ['lab-demo', /\/src\/features\/lab-demo\//],
+]
+
 // https://vite.dev/config/
 export default defineConfig({
   plugins: [react(), tailwindcss()],
@@ -24,10 +36,11 @@ export default defineConfig({
   build: {
     rollupOptions: {
       output: {
-        manualChunks: {
-          'vendor-react': ['react', 'react-dom', 'react-router-dom'],
-          'vendor-supabase': ['@supabase/supabase-js'],
-          'vendor-ui': ['framer-motion', 'lucide-react'],
+        manualChunks(id) {
+          const file = id.split(path.sep).join('/')
+          for (const [chunk, pattern] of CHUNK_GROUPS) {
+            if (pattern.test(file)) return chunk
+          }
         }
       }
     }